@@ -1,9 +1,8 @@
 import pickle
 import os
 import sys
-from collections import Counter
 import json
-from copy import deepcopy
+import pandas as pd
 
 # get an absolute path to the directory that contains parent files
 project_dir = os.path.dirname(os.path.join(os.getcwd(), __file__))
@@ -62,27 +61,16 @@ def cluster_operations(clusters_names):
         'overrun_builtin_density_cpu',
     ]
 
-    clusters_stats = {}
     # cumulative stats
-    for cluster_name, cluster in clusters.items():
-        sum_dict = {k: 0 for k in keys}
-        total_num_pods = 0
-        for namespace, pods in cluster.items():
-            num_pods = len(pods)
-            sum_dict = Counter(sum_dict)
-            for _, contents in pods.items():
-                contents_filtered = dict(zip(
-                    keys, [contents[k] for k in keys]))
-                contents_filtered = Counter(contents_filtered)
-                sum_dict += contents_filtered
-            total_num_pods += num_pods
-        sum_dict = dict(sum_dict)
-        # update missing keys
-        missing_keys = list(set(keys) - set(sum_dict.keys()))
-        missing_enteries = {k: 0 for k in missing_keys}
-        sum_dict.update(missing_enteries)
-        sum_dict['total_num_pods'] = total_num_pods
-        clusters_stats[cluster_name] = deepcopy(sum_dict)
+    # one row per pod and one column per stat of all the clusters
+    pods = pd.concat({
+        cluster_name: pd.DataFrame.from_records([
+            [contents[k] for k in keys]
+            for namespace_pods in cluster.values()
+            for contents in namespace_pods.values()], columns=keys)
+        for cluster_name, cluster in clusters.items()})
+    stats = pods.groupby(level=0, sort=False).sum()
+    stats['total_num_pods'] = pods.groupby(level=0, sort=False).size()
 
     # Fix units
     # input:
@@ -96,28 +84,12 @@ def cluster_operations(clusters_names):
     memory_ratio = 1000
     cpu_ratio = 1000
     time_ratio = 3600
-    for cluster_name, cluster in clusters_stats.items():
-        cluster['request_memory'] /= memory_ratio
-        cluster['request_cpu'] /= cpu_ratio
-        cluster['avg_usage_memory'] /= memory_ratio
-        cluster['avg_usage_cpu'] /= cpu_ratio
-        cluster['usage_density_memory'] /= (memory_ratio * time_ratio)
-        cluster['usage_density_cpu'] /= (cpu_ratio * time_ratio)
-        cluster['request_density_memory'] /= (memory_ratio * time_ratio)
-        cluster['request_density_cpu'] /= (cpu_ratio * time_ratio)
-        cluster['slack_usage_density_memory'] /= (memory_ratio * time_ratio)
-        cluster['slack_usage_density_cpu'] /= (cpu_ratio * time_ratio)
-        cluster['slack_max_density_memory'] /= (memory_ratio * time_ratio)
-        cluster['slack_max_density_cpu'] /= (cpu_ratio * time_ratio)
-        cluster['slack_builtin_density_memory'] /= (memory_ratio * time_ratio)
-        cluster['slack_builtin_density_cpu'] /= (cpu_ratio * time_ratio)
-        cluster['overrun_usage_density_memory'] /= (memory_ratio * time_ratio)
-        cluster['overrun_usage_density_cpu'] /= (cpu_ratio * time_ratio)
-        cluster['overrun_max_density_memory'] /= (memory_ratio * time_ratio)
-        cluster['overrun_max_density_cpu'] /= (cpu_ratio * time_ratio)
-        cluster['overrun_builtin_density_memory'] /= (
-            memory_ratio * time_ratio)
-        cluster['overrun_builtin_density_cpu'] /= (cpu_ratio * time_ratio)
+    for key in keys:
+        ratio = memory_ratio if key.endswith('memory') else cpu_ratio
+        if 'density' in key:
+            ratio *= time_ratio
+        stats[key] /= ratio
+    clusters_stats = stats.to_dict('index')
 
     # Resource Usage - Engine - stat 1
     # dataframe
@@ -132,7 +104,7 @@ def cluster_operations(clusters_names):
             round(cluster['avg_usage_memory'] / cluster['total_num_pods'], 2)
         stat_11_entery['avg_usage_cpu'] =\
             round(cluster['avg_usage_cpu'] / cluster['total_num_pods'], 2)
-        stat_11[cluster_name] = deepcopy(stat_11_entery)
+        stat_11[cluster_name] = stat_11_entery
 
     stat_12 = {}
     request_density_memory_total = 0
@@ -147,7 +119,7 @@ def cluster_operations(clusters_names):
         stat_12_entery['fraction_cpu'] =\
             round(cluster['usage_density_cpu'] / cluster[
                 'request_density_cpu'], 2)
-        stat_12[cluster_name] = deepcopy(stat_12_entery)
+        stat_12[cluster_name] = stat_12_entery
         request_density_memory_total += cluster['request_density_memory']
         request_density_cpu_total += cluster['request_density_cpu']
 
@@ -184,7 +156,7 @@ def cluster_operations(clusters_names):
         stat_4_entery['fraction_cpu'] =\
             round(cluster['slack_usage_density_cpu'] / cluster[
                 'request_density_cpu'], 2)
-        stat_4[cluster_name] = deepcopy(stat_4_entery)
+        stat_4[cluster_name] = stat_4_entery
         request_density_memory_total += cluster['request_density_memory']
         request_density_cpu_total += cluster['request_density_cpu']
 
@@ -221,7 +193,7 @@ def cluster_operations(clusters_names):
         stat_5_entery['fraction_cpu'] =\
             round(cluster['overrun_usage_density_cpu'] / cluster[
                 'request_density_cpu'], 2)
-        stat_5[cluster_name] = deepcopy(stat_5_entery)
+        stat_5[cluster_name] = stat_5_entery
         request_density_memory_total += cluster['request_density_memory']
         request_density_cpu_total += cluster['request_density_cpu']
 
@@ -258,7 +230,7 @@ def cluster_operations(clusters_names):
         stat_6_entery['fraction_cpu'] =\
             round(cluster['slack_max_density_cpu'] / cluster[
                 'request_density_cpu'], 2)
-        stat_6[cluster_name] = deepcopy(stat_6_entery)
+        stat_6[cluster_name] = stat_6_entery
         request_density_memory_total += cluster['request_density_memory']
         request_density_cpu_total += cluster['request_density_cpu']
 
@@ -295,7 +267,7 @@ def cluster_operations(clusters_names):
         stat_7_entery['fraction_cpu'] =\
             round(cluster['overrun_max_density_cpu'] / cluster[
                 'request_density_cpu'], 2)
-        stat_7[cluster_name] = deepcopy(stat_7_entery)
+        stat_7[cluster_name] = stat_7_entery
         request_density_memory_total += cluster['request_density_memory']
         request_density_cpu_total += cluster['request_density_cpu']
 
@@ -332,7 +304,7 @@ def cluster_operations(clusters_names):
         stat_8_entery['fraction_cpu'] =\
             round(cluster['slack_builtin_density_cpu'] / cluster[
                 'request_density_cpu'], 2)
-        stat_8[cluster_name] = deepcopy(stat_8_entery)
+        stat_8[cluster_name] = stat_8_entery
         request_density_memory_total += cluster['request_density_memory']
         request_density_cpu_total += cluster['request_density_cpu']
 
@@ -369,7 +341,7 @@ def cluster_operations(clusters_names):
         stat_9_entery['fraction_cpu'] =\
             round(cluster['overrun_builtin_density_cpu'] / cluster[
                 'request_density_cpu'], 2)
-        stat_9[cluster_name] = deepcopy(stat_9_entery)
+        stat_9[cluster_name] = stat_9_entery
         request_density_memory_total += cluster['request_density_memory']
         request_density_cpu_total += cluster['request_density_cpu']
 
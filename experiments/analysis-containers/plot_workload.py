@@ -1,9 +1,8 @@
 import os
 import sys
-import pickle
 import numpy as np
-import json
 from smart_vpa.recommender_initial import Builtin
+from smart_vpa.workload import WorkloadStore
 from smart_vpa.util import (
     logger,
     plot_workload
@@ -24,36 +23,15 @@ pod = "optfolio-8mzzw-796513259"
 
 
 # -------------- load the workload --------------
-config: dict = {}
-workload: np.array = np.array([])
-time: np.array = np.array([])
-pod_path = os.path.join(
-    WORKLOADS_PATH, 'arabesque', cluster, namespace, pod)
-
-# load container config
-# container initial requests and limits
-container_file_path = os.path.join(pod_path, "container.json")
-try:
-    with open(container_file_path) as cf:
-        config = json.loads(cf.read())
-except FileNotFoundError:
-    print(f"pod {pod} does not have a container")
-
-# load the workoad
-workload_file_path = os.path.join(pod_path, 'workload.pickle')
-try:
-    with open(workload_file_path, 'rb') as in_pickle:
-        workload = pickle.load(in_pickle)
-except FileNotFoundError:
+store = WorkloadStore(os.path.join(
+    WORKLOADS_PATH, 'arabesque-store', cluster))
+pod_indices = store.find(namespace=namespace, container_name=pod)
+if not pod_indices:
     raise Exception(f"pod {pod} does not exists")
-
-# load the time array of the workload
-time_file_path = os.path.join(pod_path, 'time.pickle')
-try:
-    with open(time_file_path, 'rb') as in_pickle:
-        time = pickle.load(in_pickle)
-except FileNotFoundError:
-    raise Exception(f"pod {pod} does not have time array")
+# container initial requests and limits and its workload
+config = store.container(pod_indices[0])
+workload = config['workload']
+time = config['time']
 
 fig = plot_workload(
     timestamps=time,
@@ -0,0 +1,101 @@
+import os
+import sys
+import click
+import timeit
+import logging
+
+import numpy as np
+import pandas as pd
+
+# get an absolute path to the directory that contains parent files
+project_dir = os.path.dirname(os.path.join(os.getcwd(), __file__))
+sys.path.append(os.path.normpath(os.path.join(
+    project_dir, '..', '..', 'metrics-gathering-gcp')))
+
+from gcp_monitoring_query import MonitoringQuery, CONTAINER_METRICS # noqa
+
+logging.disable(logging.INFO)
+
+# ------------- monitoring results benchmark --------------
+# timings of the transformation of the results of
+# MonitoringQuery.get_metrics on a synthetic frame (the google cloud
+# client is needed for the import only, no query is sent), the
+# previous groupby(...).apply(max) pipeline is kept here as the
+# reference for the docs
+
+SEED = 100
+NUM_CONTAINERS = 100
+
+
+def make_result_df(rows: int) -> pd.DataFrame:
+    """rows samples of the container metrics in the format of
+    get_metrics, the samples of a minute are a few seconds apart
+    and some are missing"""
+    samples = rows // NUM_CONTAINERS
+    names = np.repeat(
+        [f"k8s_container_pod-{i}_container" for i in range(NUM_CONTAINERS)],
+        samples)
+    seconds = np.tile(np.arange(samples) * 60, NUM_CONTAINERS)
+    dates = pd.Timestamp('2021-06-10') + pd.to_timedelta(
+        seconds + np.random.randint(-20, 20, size=len(seconds)), unit='s')
+    values = np.random.lognormal(
+        mean=0, sigma=1, size=(len(seconds), len(CONTAINER_METRICS)))
+    values[np.random.rand(*values.shape) < 0.3] = np.nan
+    return pd.DataFrame(
+        values, columns=CONTAINER_METRICS,
+        index=pd.MultiIndex.from_arrays(
+            [names, dates], names=['name', 'date']))
+
+
+def previous_to_docs(df: pd.DataFrame, project_id: str,
+                     namespace: str) -> list:
+    """to_docs before the integer minute keys, apply(max) was the
+    max of each column of the groups"""
+    _df = pd.DataFrame.copy(df)
+    _df.reset_index(inplace=True)
+    _df.date = pd.to_datetime(_df.date).dt.round("min")
+    _df.date = pd.to_datetime(_df.date).dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+    _df.set_index(["name", "date"], inplace=True)
+    _df.sort_index(inplace=True)
+    _df = _df.groupby(["name", "date"]).apply(
+        lambda group: group.max()).reset_index()
+    _df = _df.replace({np.nan: None})
+    _df["project_id"] = project_id
+    _df["namespace"] = namespace
+    return _df.to_dict(orient="records")
+
+
+@click.command()
+@click.option('--rows', required=True, type=int, default=10 ** 6)
+@click.option('--repeat', required=True, type=int, default=3)
+@click.option('--previous/--no-previous', default=True)
+def main(rows: int, repeat: int, previous: bool):
+    """best time of the transformations of a frame of rows samples"""
+    np.random.seed(SEED)
+    df = make_result_df(rows)
+    mq = MonitoringQuery(project_id='project', client=object())
+    mq.namespace = 'default'
+
+    timings = {
+        'to_docs': lambda: mq.to_docs(df),
+        'to_containers': lambda: mq.to_containers(df)
+    }
+    if previous:
+        docs = mq.to_docs(df)
+        previous_docs = previous_to_docs(df, mq.project_id, mq.namespace)
+        assert docs == previous_docs, 'to_docs differs from the previous'
+        timings['previous to_docs'] = lambda: previous_to_docs(
+            df, mq.project_id, mq.namespace)
+    containers = mq.to_containers(df)
+    assert len(containers) == NUM_CONTAINERS
+    assert all(container['workload'].shape == (2, len(container['time']))
+               for container in containers)
+
+    print(f"{len(df)} rows, {NUM_CONTAINERS} containers")
+    for name, run in timings.items():
+        best = min(timeit.repeat(run, number=1, repeat=repeat))
+        print(f"{name:<20} {best:>10.4f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+import os
+import sys
+import json
+import click
+import pickle
+import shutil
+import platform
+import tempfile
+import subprocess
+import timeit
+import logging
+from datetime import datetime
+from typing import Dict, Any, Callable, Tuple
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+from smart_vpa.util import Histogram
+from smart_vpa.envs import SimEnv
+from smart_vpa.recommender import Builtin, BuiltinCore
+from smart_vpa.workload import (
+    SyntheticWorkloadGenerator,
+    WorkloadStore,
+    write_store
+)
+
+# get an absolute path to the directory that contains parent files
+project_dir = os.path.dirname(os.path.join(os.getcwd(), __file__))
+sys.path.append(os.path.normpath(os.path.join(project_dir, '..', '..')))
+
+from experiments.utils.constants import RESULTS_PATH # noqa
+from experiments.utils.path_finder import load_container # noqa
+
+logging.disable(logging.INFO)
+
+# ------------- benchmark suite --------------
+# timings of the hot paths of the recommenders, histograms, simulator,
+# workload generation and workload loaders on synthetic traces, every
+# benchmark is a setup function that gets the size of the trace and
+# returns the function to time and the number of operations it does,
+# results are recorded to json per commit for finding regressions
+
+TIME_INTERVAL = 60
+SEED = 100
+NUM_CONTAINERS = 100
+
+HISTOGRAM_OPTIONS = {
+    'cpu': {'first_bucket_size': 0.01, 'max_value': 1000},
+    'memory': {'first_bucket_size': 1e7, 'max_value': 1e12}
+}
+
+
+def make_workload(timesteps: int) -> Tuple[np.array, np.array]:
+    """memory (Megabytes) and cpu (Millicores) usage and the time"""
+    workload = np.stack((
+        np.random.lognormal(mean=7, sigma=0.5, size=timesteps),
+        np.random.lognormal(mean=5, sigma=0.5, size=timesteps))
+        ).astype(int)
+    time = np.arange(timesteps) * TIME_INTERVAL
+    return workload, time
+
+
+def make_container(timesteps: int) -> Dict[str, Any]:
+    workload, time = make_workload(timesteps)
+    return {
+        'container_name': 'pod',
+        'requests': {'memory': 1000.0, 'cpu': 200.0},
+        'limits': {'memory': 4000.0, 'cpu': 1000.0},
+        'workload': workload,
+        'time': time,
+        'seed': SEED,
+        'round-robin': True
+    }
+
+
+def histogram_add_sample(timesteps: int) -> Tuple[Callable, int]:
+    values = np.random.lognormal(mean=21, sigma=1, size=timesteps)
+    timestamps = np.arange(timesteps) * TIME_INTERVAL
+
+    def run():
+        histogram = Histogram(**HISTOGRAM_OPTIONS['memory'])
+        for value, timestamp in zip(values, timestamps):
+            histogram.add_sample(
+                value=value, weight=1.0, timestamp=timestamp)
+    return run, timesteps
+
+
+def histogram_add_samples(timesteps: int) -> Tuple[Callable, int]:
+    values = np.random.lognormal(mean=21, sigma=1, size=timesteps)
+    timestamps = np.arange(timesteps) * TIME_INTERVAL
+
+    def run():
+        histogram = Histogram(**HISTOGRAM_OPTIONS['memory'])
+        histogram.add_samples(
+            values=values, weights=1.0, timestamps=timestamps)
+    return run, timesteps
+
+
+def histogram_percentile(timesteps: int) -> Tuple[Callable, int]:
+    histogram = Histogram(**HISTOGRAM_OPTIONS['memory'])
+    histogram.add_samples(
+        values=np.random.lognormal(mean=21, sigma=1, size=timesteps),
+        weights=1.0, timestamps=np.arange(timesteps) * TIME_INTERVAL)
+    percentiles = np.random.rand(timesteps)
+
+    def run():
+        for percentile in percentiles:
+            histogram.percentile(percentile)
+    return run, timesteps
+
+
+def builtin_update_recommender(timesteps: int) -> Tuple[Callable, int]:
+    workload, time = make_workload(timesteps)
+    observations = np.concatenate((workload, workload)).T
+    env = SimEnv(make_container(2))
+    config = {
+        'histogram': HISTOGRAM_OPTIONS,
+        'action_space': env.action_space,
+        'margin': True,
+        'confidence': False,
+        'min_resource': False
+    }
+
+    def run():
+        recommender = Builtin(config)
+        recommender.reset()
+        for observation, timestamp in zip(observations, time):
+            recommender.update(observation=observation, timestamp=timestamp)
+            recommender.recommender()
+    return run, timesteps
+
+
+def builtin_recommendations(timesteps: int) -> Tuple[Callable, int]:
+    workload, time = make_workload(timesteps)
+    env = SimEnv(make_container(2))
+
+    def run():
+        recommender = BuiltinCore(
+            cpu_first_bucket_size=HISTOGRAM_OPTIONS['cpu'][
+                'first_bucket_size'],
+            cpu_max_value=HISTOGRAM_OPTIONS['cpu']['max_value'],
+            memory_first_bucket_size=HISTOGRAM_OPTIONS['memory'][
+                'first_bucket_size'],
+            memory_max_value=HISTOGRAM_OPTIONS['memory']['max_value'],
+            margin=True, confidence=False, min_resource=False,
+            action_space=env.action_space)
+        recommender.recommendations(
+            memory_usage=workload[0], cpu_usage=workload[1], timestamps=time)
+    return run, timesteps
+
+
+def sim_env_step(timesteps: int) -> Tuple[Callable, int]:
+    container = make_container(timesteps)
+    usage = container['workload'].T
+    scale = np.random.uniform(0.7, 1.3, size=(timesteps, 1))
+    actions = np.concatenate((
+        usage * scale * 0.8, usage * scale, usage * scale * 1.2),
+        axis=1).astype(int)
+    env = SimEnv(container)
+
+    def run():
+        env.reset()
+        for action in actions[:-1]:
+            env.step(action)
+    return run, timesteps - 1
+
+
+def sim_env_fast_forward(timesteps: int) -> Tuple[Callable, int]:
+    container = make_container(timesteps)
+    container['round-robin'] = False
+    action = np.array([500, 80, 1100, 150, 2500, 300])
+    env = SimEnv(container)
+
+    def run():
+        env.reset()
+        while env.global_timestep < timesteps - 1:
+            env.fast_forward(action)
+    return run, timesteps - 1
+
+
+def workload_generation(timesteps: int) -> Tuple[Callable, int]:
+    container = make_container(2)
+    config = {
+        'max_usage': {'memory': 4000, 'cpu': 1000},
+        'num_peaks': 10
+    }
+
+    def run():
+        generator = SyntheticWorkloadGenerator(
+            workload_type='sinusoidal', time_interval=TIME_INTERVAL,
+            seed=SEED, timesteps=timesteps, container=container,
+            config=config)
+        _, fig, _ = generator.make_workload()
+        plt.close(fig)
+    return run, timesteps
+
+
+def _write_containers(timesteps: int) -> str:
+    """NUM_CONTAINERS container folders and a workload store of them"""
+    path = tempfile.mkdtemp()
+    containers = []
+    for i in range(NUM_CONTAINERS):
+        container = make_container(timesteps)
+        container_path = os.path.join(path, 'folders', str(i))
+        os.makedirs(container_path)
+        with open(os.path.join(container_path, 'container.json'), 'x') as f:
+            json.dump({key: container[key] for key in [
+                'container_name', 'requests', 'limits']}, f)
+        with open(os.path.join(container_path, 'workload.pickle'), 'wb') as f:
+            pickle.dump(container['workload'], f)
+        with open(os.path.join(container_path, 'time.pickle'), 'wb') as f:
+            pickle.dump(container['time'], f)
+        containers.append(container)
+    write_store(os.path.join(path, 'store'), containers)
+    return path
+
+
+def pickle_loader(timesteps: int) -> Tuple[Callable, int]:
+    path = _write_containers(timesteps)
+    folders = [os.path.join(path, 'folders', str(i))
+               for i in range(NUM_CONTAINERS)]
+
+    def run():
+        for folder in folders:
+            load_container(folder)
+    run.cleanup = lambda: shutil.rmtree(path)
+    return run, NUM_CONTAINERS
+
+
+def store_loader(timesteps: int) -> Tuple[Callable, int]:
+    path = _write_containers(timesteps)
+
+    def run():
+        store = WorkloadStore(os.path.join(path, 'store'))
+        for i in range(len(store)):
+            container = store.container(i)
+            np.asarray(container['workload']).sum()
+    run.cleanup = lambda: shutil.rmtree(path)
+    return run, NUM_CONTAINERS
+
+
+BENCHMARKS = {
+    'histogram_add_sample': histogram_add_sample,
+    'histogram_add_samples': histogram_add_samples,
+    'histogram_percentile': histogram_percentile,
+    'builtin_update_recommender': builtin_update_recommender,
+    'builtin_recommendations': builtin_recommendations,
+    'sim_env_step': sim_env_step,
+    'sim_env_fast_forward': sim_env_fast_forward,
+    'workload_generation': workload_generation,
+    'pickle_loader': pickle_loader,
+    'store_loader': store_loader
+}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'], cwd=project_dir,
+            stderr=subprocess.DEVNULL).decode().strip()
+    except (subprocess.CalledProcessError, OSError):
+        return 'unknown'
+
+
+def run_benchmark(name: str, timesteps: int,
+                  repeat: int) -> Dict[str, Any]:
+    """best and median time of repeat runs of a benchmark"""
+    np.random.seed(SEED)
+    run, operations = BENCHMARKS[name](timesteps)
+    try:
+        # one untimed run for the caches and imports
+        run()
+        times = timeit.repeat(run, number=1, repeat=repeat)
+    finally:
+        if hasattr(run, 'cleanup'):
+            run.cleanup()
+    return {
+        'operations': operations,
+        'best': min(times),
+        'median': float(np.median(times)),
+        'best_per_operation': min(times) / operations
+    }
+
+
+@click.command()
+@click.option('--timesteps', required=True, type=int, default=24 * 60)
+@click.option('--repeat', required=True, type=int, default=3)
+@click.option('--benchmark', required=False, multiple=True,
+              type=click.Choice(list(BENCHMARKS.keys())))
+@click.option('--output', required=False, type=str, default=None)
+@click.option('--compare', required=False, type=str, default=None)
+def main(timesteps: int, repeat: int, benchmark: tuple, output: str,
+         compare: str):
+    """run the benchmarks and save the results to a json file, with
+    --compare the results of a previous run are shown side by side
+    """
+    commit = git_commit()
+    results = {
+        'commit': commit,
+        'date': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'timesteps': timesteps,
+        'repeat': repeat,
+        'benchmarks': {}
+    }
+    previous = {}
+    if compare is not None:
+        with open(compare, 'r') as in_file:
+            previous = json.load(in_file)['benchmarks']
+    for name in benchmark or BENCHMARKS.keys():
+        result = run_benchmark(name, timesteps, repeat)
+        results['benchmarks'][name] = result
+        line = (f"{name:<28} {result['best']:>10.4f} s"
+                f" {result['best_per_operation'] * 1e6:>12.2f} us/op")
+        if name in previous:
+            line += (f"   x{previous[name]['best'] / result['best']:.2f}"
+                     " speedup")
+        print(line)
+
+    if output is None:
+        output = os.path.join(
+            RESULTS_PATH, 'benchmarks', f"{commit[:8]}-{timesteps}.json")
+    output_dir = os.path.dirname(output)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    with open(output, 'w') as out_file:
+        json.dump(results, out_file, indent=4)
+    print(f"results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
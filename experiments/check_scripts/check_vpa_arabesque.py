@@ -2,8 +2,6 @@ import os
 import sys
 import click
 import json
-import pickle
-import numpy as np
 
 import gym
 
@@ -16,6 +14,7 @@ from smart_vpa.recommender import (
     LSTM
 )
 from smart_vpa.util import logger
+from smart_vpa.workload import WorkloadStore
 
 # get an absolute path to the directory that contains parent files
 project_dir = os.path.dirname(os.path.join(os.getcwd(), __file__))
@@ -27,10 +26,22 @@ from experiments.utils.constants import ( # noqa
 )
 
 
-def check_env(env, recommender):
+def check_env(env, recommender, fast_forward=False):
     done = False
     _ = env.reset()
     _ = recommender.reset()
+    if fast_forward and recommender.static_action:
+        # one step per recreation with the same recommendation
+        action = recommender.recommender()
+        while not done:
+            observation, reward, done, info = env.fast_forward(action)
+            logger.info({
+                "steps": int(info['steps']),
+                "slack": info['slack'].tolist(),
+                "overrun": info['overrun'].tolist()
+            })
+            env.render()
+        return
     while not done:
         timestamp = env.wall_time
         observation = env.observation
@@ -59,6 +70,7 @@ def check_env(env, recommender):
               default="armod-v0-75j76-2071243245")
 @click.option('--round-robin', required=True, type=bool, default=True)
 @click.option('--seed', required=True, type=int, default=100)
+@click.option('--fast-forward', required=True, type=bool, default=False)
 def main(
     type_env: str,
     type_recommender: str,
@@ -66,41 +78,21 @@ def main(
     namespace: str,
     pod: str,
     round_robin: bool,
-    seed: int
+    seed: int,
+    fast_forward: bool
         ):
     """
     """
     # -------------- load container config and workload --------------
-    config: dict = {}
-    workload: np.array = np.array([])
-    time: np.array = np.array([])
-    pod_path = os.path.join(
-        WORKLOADS_PATH, 'arabesque', cluster, namespace, pod)
-
-    # load container config
-    # container initial requests and limits
-    container_file_path = os.path.join(pod_path, "container.json")
-    try:
-        with open(container_file_path) as cf:
-            config = json.loads(cf.read())
-    except FileNotFoundError:
-        print(f"pod {pod} does not have a container")
-
-    # load the workoad
-    workload_file_path = os.path.join(pod_path, 'workload.pickle')
-    try:
-        with open(workload_file_path, 'rb') as in_pickle:
-            workload = pickle.load(in_pickle)
-    except FileNotFoundError:
+    store = WorkloadStore(os.path.join(
+        WORKLOADS_PATH, 'arabesque-store', cluster))
+    pod_indices = store.find(namespace=namespace, container_name=pod)
+    if not pod_indices:
         raise Exception(f"pod {pod} does not exists")
-
-    # load the time array of the workload
-    time_file_path = os.path.join(pod_path, 'time.pickle')
-    try:
-        with open(time_file_path, 'rb') as in_pickle:
-            time = pickle.load(in_pickle)
-    except FileNotFoundError:
-        raise Exception(f"pod {pod} does not have time array")
+    # container initial requests and limits and its workload
+    config = store.container(pod_indices[0])
+    workload = config['workload']
+    time = config['time']
 
     # -------------- make the environment --------------
     # update the passed config to the environment
@@ -149,7 +141,8 @@ def main(
     # -------------- run the environment --------------
     check_env(
         env=env,
-        recommender=recommender)
+        recommender=recommender,
+        fast_forward=fast_forward)
 
 
 if __name__ == "__main__":
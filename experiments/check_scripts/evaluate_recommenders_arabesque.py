@@ -0,0 +1,63 @@
+import os
+import sys
+import click
+import json
+
+from smart_vpa.replay import evaluate_cluster, RECOMMENDERS
+
+# get an absolute path to the directory that contains parent files
+project_dir = os.path.dirname(os.path.join(os.getcwd(), __file__))
+sys.path.append(os.path.normpath(os.path.join(project_dir, '..', '..')))
+
+from experiments.utils.constants import ( # noqa
+    CONFIGS_PATH,
+    WORKLOADS_PATH,
+    RESULTS_PATH
+)
+
+
+@click.command()
+@click.option('--type-recommender', required=True, multiple=True,
+              type=click.Choice(list(RECOMMENDERS)),
+              default=['builtin'])
+@click.option('--cluster', required=True, type=str, default="engine-top-ten")
+@click.option('--seed', required=True, type=int, default=100)
+@click.option('--num-workers', required=False, type=int, default=None)
+def main(
+    type_recommender: tuple,
+    cluster: str,
+    seed: int,
+    num_workers: int
+        ):
+    """evaluate the recommenders on all the containers of a cluster
+    without rendering and save one table of the results
+    """
+    # -------------- load the recommender configs --------------
+    recommenders = {}
+    for recommender in type_recommender:
+        container_file_path = os.path.join(
+            CONFIGS_PATH, 'recommender', f"{recommender}.json")
+        try:
+            with open(container_file_path) as cf:
+                recommenders[recommender] = json.loads(cf.read())
+        except FileNotFoundError:
+            print(f"recommender {recommender} does not exist")
+
+    # -------------- evaluate the cluster --------------
+    results = evaluate_cluster(
+        path=os.path.join(WORKLOADS_PATH, 'arabesque-store', cluster),
+        recommenders=recommenders,
+        seed=seed,
+        num_workers=num_workers)
+
+    results_path = os.path.join(RESULTS_PATH, 'evaluation')
+    if not os.path.exists(results_path):
+        os.makedirs(results_path)
+    results.to_csv(os.path.join(results_path, f"{cluster}.csv"), index=False)
+    print(results.groupby('recommender')[[
+        'slack_memory', 'slack_cpu', 'overrun_memory', 'overrun_cpu',
+        'recreations', 'wall_time']].sum())
+
+
+if __name__ == "__main__":
+    main()
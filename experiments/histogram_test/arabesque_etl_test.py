@@ -0,0 +1,141 @@
+import os
+import sys
+import copy
+import time
+import shutil
+import tempfile
+
+import numpy as np
+
+from smart_vpa.workload import WorkloadStore, merge_stores
+
+# get an absolute path to the directory that contains parent files
+project_dir = os.path.dirname(os.path.join(os.getcwd(), __file__))
+sys.path.append(os.path.normpath(os.path.join(
+    project_dir, '..', 'workload-generation-arabesque')))
+
+from arabesque_etl import ( # noqa
+    map_namespaces,
+    write_namespace,
+    convert_pods
+)
+
+# ------------- arabesque etl test --------------
+# a synthetic etl output is converted once pod by pod the way
+# gen_workload_each_container.py used to do it and once by namespace
+# in a pool of processes to store parts that are merged, the stores
+# must have the same containers in the same order
+
+num_namespaces = 20
+pods_per_namespace = 50
+max_timesteps = 24 * 60
+seed = 100
+
+
+def make_pod(timesteps: int):
+    column = (timesteps, 1)
+    workload = (
+        np.random.lognormal(mean=20, sigma=1, size=column),
+        np.random.lognormal(mean=19, sigma=1, size=column),
+        np.random.normal(loc=0.2, scale=0.1, size=column))
+    workload[0][np.random.rand(*column) < 0.05] = np.nan
+    return {'main': {
+        'timestamp': np.arange(timesteps) * 60,
+        'workload': workload,
+        'request': (np.full(column, 2e9), np.full(column, 0.5)),
+        'limit': (np.full(column, 4e9), np.full(column, np.nan))
+    }}
+
+
+def previous_conversion(dataset):
+    """the loop of gen_workload_each_container.py before the pool"""
+    containers = []
+    for namespace, pods in dataset.items():
+        for pod_name, container in pods.items():
+            container = container['main']
+            timestamps = container['timestamp']
+            workload_mem = np.nan_to_num(container['workload'][0]) +\
+                np.nan_to_num(container['workload'][1])
+            workload_mem = workload_mem / 1e6
+            workload_mem = workload_mem.astype(int)
+            workload_mem = np.squeeze(workload_mem)
+            workload_cpu = container['workload'][2]
+            workload_cpu[np.where(workload_cpu < 0)[0]] = 0
+            workload_cpu *= 1000
+            workload_cpu = workload_cpu.astype(int)
+            workload_cpu = np.squeeze(workload_cpu)
+            workload = np.stack((workload_mem, workload_cpu))
+            request_memory = np.nan_to_num(container['request'][0])
+            request_memory /= 1e6
+            request_memory = request_memory.astype(int).max()
+            limit_memory = np.nan_to_num(container['limit'][0])
+            limit_memory /= 1e6
+            limit_memory = limit_memory.astype(int).max()
+            request_cpu = np.nan_to_num(container['request'][1]).max()
+            request_cpu *= 1000
+            limit_cpu = np.nan_to_num(container['limit'][1]).max()
+            limit_cpu *= 1000
+            containers.append({
+                'namespace': namespace,
+                'container_name': pod_name,
+                'requests': {
+                    'memory': float(request_memory), 'cpu': request_cpu},
+                'limits': {
+                    'memory': float(limit_memory), 'cpu': limit_cpu},
+                'workload': workload,
+                'time': timestamps
+            })
+    return containers
+
+
+if __name__ == "__main__":
+    np.random.seed(seed)
+    dataset = {
+        f'namespace-{n}': {
+            f'pod-{p}': make_pod(np.random.randint(2, max_timesteps))
+            for p in range(pods_per_namespace)}
+        for n in range(num_namespaces)}
+
+    start = time.perf_counter()
+    containers = previous_conversion(copy.deepcopy(dataset))
+    previous_time = time.perf_counter() - start
+
+    path = tempfile.mkdtemp()
+    try:
+        start = time.perf_counter()
+        parts = list(map_namespaces(
+            copy.deepcopy(dataset), write_namespace, max_workers=4,
+            parts_path=os.path.join(path, 'parts')))
+        merge_stores(parts, os.path.join(path, 'store'))
+        pool_time = time.perf_counter() - start
+        assert parts == [os.path.join(path, 'parts', namespace)
+                         for namespace in dataset]
+
+        store = WorkloadStore(os.path.join(path, 'store'))
+        assert len(store) == len(containers)
+        for i, container in enumerate(containers):
+            store_container = store.container(i)
+            for key in ['namespace', 'container_name', 'requests', 'limits']:
+                assert store_container[key] == container[key]
+            for key in ['workload', 'time']:
+                assert np.array_equal(store_container[key], container[key])
+        del store
+    finally:
+        shutil.rmtree(path)
+
+    # the single pickle has the same conversion by namespace and pod
+    namespaces = list(dataset.keys())
+    cluster = dict(zip(namespaces, map_namespaces(
+        copy.deepcopy(dataset), convert_pods, max_workers=4)))
+    i = 0
+    for namespace, pods in cluster.items():
+        for pod_name, pod in pods.items():
+            assert containers[i]['container_name'] == pod_name
+            assert np.array_equal(pod['workload'], containers[i]['workload'])
+            assert pod['requests'] == containers[i]['requests']
+            i += 1
+    assert i == len(containers)
+
+    print(f"{len(containers)} pods of {num_namespaces} namespaces")
+    print(f"pod by pod:           {previous_time:.3f} seconds")
+    print(f"pool of 4 processes:  {pool_time:.3f} seconds")
@@ -0,0 +1,56 @@
+import numpy as np
+
+from smart_vpa.util import Histogram
+
+# ------------- bin boundaries test --------------
+# the closed form bin boundaries of make_bin_boundaries must match the
+# running sum the histograms used to build them with for the cpu and
+# memory options of the repo (and a linear histogram), and histograms
+# with the same options must share one read-only array
+
+
+def running_sum_boundaries(max_value, first_bucket_size, ratio):
+    """the bins of gen_bin_boundaries before they were cached"""
+    bins = [0, first_bucket_size]
+    next_bucket = first_bucket_size
+    while next_bucket <= max_value:
+        bucket_length = bins[-1] - bins[-2]
+        bucket_length *= ratio
+        next_bucket += bucket_length
+        bins.append(next_bucket)
+    return np.array(bins)
+
+
+options = {
+    'cpu': {'first_bucket_size': 0.01, 'max_value': 1000},
+    'memory': {'first_bucket_size': 1e7, 'max_value': 1e12},
+    'linear': {'first_bucket_size': 1, 'max_value': 10, 'ratio': 1}
+}
+
+for name, option in options.items():
+    histogram = Histogram(**option)
+    expected = running_sum_boundaries(
+        option['max_value'], option['first_bucket_size'],
+        option.get('ratio', 1.05))
+    assert histogram.num_buckets == len(expected)
+    assert np.allclose(histogram.bin_boundaries, expected,
+                       rtol=1e-9, atol=0)
+    # the last bucket starts after max_value
+    assert histogram.bin_boundaries[-2] <= option['max_value']
+    assert histogram.bin_boundaries[-1] > option['max_value']
+
+    # ------------- shared between histograms --------------
+    other = Histogram(**option)
+    assert other.bin_boundaries is histogram.bin_boundaries
+    assert not histogram.bin_boundaries.flags.writeable
+    try:
+        histogram.bin_boundaries[0] = 1
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('the shared bin boundaries are writeable')
+    # other options get their own boundaries
+    other = Histogram(**dict(option, max_value=option['max_value'] * 2))
+    assert not np.shares_memory(other.bin_boundaries,
+                                histogram.bin_boundaries)
+    print(f"{name}: {histogram.num_buckets} buckets")
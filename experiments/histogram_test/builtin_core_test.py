@@ -0,0 +1,111 @@
+import time
+import logging
+import itertools
+
+import numpy as np
+
+from smart_vpa.envs import SimEnv
+from smart_vpa.recommender import Builtin, BuiltinCore
+from smart_vpa.recommender_initial import Builtin as BuiltinInitial
+
+logging.disable(logging.INFO)
+
+# ------------- builtin core test --------------
+# BuiltinCore.recommendations must give the same (timesteps, 6)
+# trajectory as adding the samples one by one through the per step
+# adapters of the simulator (recommender.Builtin) and of the analysis
+# scripts (recommender_initial.Builtin) for every estimation option
+
+timesteps = 7 * 24 * 60
+time_interval = 60
+seed = 100
+
+np.random.seed(seed)
+workload = np.stack((
+    np.random.lognormal(mean=7, sigma=0.3, size=timesteps),
+    np.random.lognormal(mean=5, sigma=0.3, size=timesteps))).astype(int)
+workload[:, timesteps // 2:] *= 2
+timestamps = np.arange(timesteps) * time_interval
+env = SimEnv({
+    'container_name': 'pod',
+    'requests': {'memory': 1000.0, 'cpu': 200.0},
+    'limits': {'memory': 4000.0, 'cpu': 1000.0},
+    'workload': workload[:, :2],
+    'time': timestamps[:2],
+    'seed': seed,
+    'round-robin': True
+})
+histogram_config = {
+    'cpu': {'first_bucket_size': 0.01, 'max_value': 1000},
+    'memory': {'first_bucket_size': 1e7, 'max_value': 1e12}
+}
+core_config = {
+    'cpu_first_bucket_size': 0.01,
+    'cpu_max_value': 1000,
+    'memory_first_bucket_size': 1e7,
+    'memory_max_value': 1e12
+}
+
+for margin, confidence, min_resource in itertools.product(
+        [True, False], repeat=3):
+    options = {
+        'margin': margin,
+        'confidence': confidence,
+        'min_resource': min_resource
+    }
+
+    # ------------- simulator adapter --------------
+    recommender = Builtin(dict(
+        options, histogram=histogram_config,
+        action_space=env.action_space))
+    recommender.reset()
+    start = time.perf_counter()
+    steps = np.zeros((timesteps, 6), dtype=int)
+    for i in range(timesteps):
+        recommender.update(
+            observation=workload[:, i], timestamp=timestamps[i])
+        steps[i] = recommender.recommender()
+    step_time = time.perf_counter() - start
+    core = BuiltinCore(
+        **core_config, **options, action_space=env.action_space)
+    start = time.perf_counter()
+    trajectory = core.recommendations(
+        memory_usage=workload[0], cpu_usage=workload[1],
+        timestamps=timestamps)
+    trajectory_time = time.perf_counter() - start
+    assert trajectory.shape == (timesteps, 6)
+    assert np.array_equal(steps, trajectory)
+    assert np.all(trajectory >= env.action_space.low)
+    assert np.all(trajectory <= env.action_space.high)
+    assert core.total_sample_count == recommender.total_sample_count
+    assert core.first_sample_start_time ==\
+        recommender.first_sample_start_time
+    assert core.last_sample_start_time ==\
+        recommender.last_sample_start_time
+    assert np.array_equal(core.recommendation(), recommender.recommender())
+
+    # ------------- analysis scripts adapter --------------
+    recommender = BuiltinInitial(**core_config, **options)
+    recommender.reset()
+    steps = np.zeros((timesteps // 10, 6), dtype=int)
+    for i in range(timesteps // 10):
+        recommender.update(
+            memory_usage=workload[0, i], cpu_usage=workload[1, i],
+            timestamp=timestamps[i])
+        steps[i] = recommender.recommender()
+    core = BuiltinCore(**core_config, **options)
+    # a trajectory continues from the samples already added
+    core.add_samples(
+        memory_usage=workload[0, :10], cpu_usage=workload[1, :10],
+        timestamps=timestamps[:10])
+    trajectory = core.recommendations(
+        memory_usage=workload[0, 10:timesteps // 10],
+        cpu_usage=workload[1, 10:timesteps // 10],
+        timestamps=timestamps[10:timesteps // 10])
+    assert np.array_equal(steps[10:], trajectory)
+
+    print(f"margin={margin} confidence={confidence}"
+          f" min_resource={min_resource}: {timesteps} steps")
+    print(f"    update and recommender per step: {step_time:.2f} seconds")
+    print(f"    recommendations:                 {trajectory_time:.2f}"
+          " seconds")
@@ -0,0 +1,97 @@
+import sys
+import time
+import logging
+import resource
+
+import numpy as np
+
+from smart_vpa.envs import SimEnv
+from smart_vpa.recommender import Builtin
+
+logging.disable(logging.INFO)
+
+# ------------- builtin memory benchmark --------------
+# replay a year long trace through Builtin and record the resident
+# memory at the end of every month, the recommender only keeps the
+# first and last sample times and the number of samples so the memory
+# has to stay flat after the first month (the histograms are full)
+
+timesteps = 365 * 24 * 60
+time_interval = 60
+month = 30 * 24 * 60
+seed = 100
+
+
+def rss_megabytes() -> float:
+    """current resident memory, peak resident memory where
+    /proc is not available
+    """
+    try:
+        with open('/proc/self/statm', 'r') as statm:
+            pages = int(statm.read().split()[1])
+        return pages * resource.getpagesize() / 1e6
+    except OSError:
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # bytes on macOS and kilobytes on linux
+        return maxrss / 1e6 if sys.platform == 'darwin' else maxrss / 1e3
+
+
+np.random.seed(seed)
+workload = np.stack((
+    np.random.lognormal(mean=7, sigma=0.3, size=timesteps),
+    np.random.lognormal(mean=5, sigma=0.3, size=timesteps))).astype(int)
+observations = np.concatenate((workload, workload)).T
+timestamps = np.arange(timesteps) * time_interval
+env = SimEnv({
+    'container_name': 'pod',
+    'requests': {'memory': 1000.0, 'cpu': 200.0},
+    'limits': {'memory': 4000.0, 'cpu': 1000.0},
+    'workload': workload[:, :2],
+    'time': timestamps[:2],
+    'seed': seed,
+    'round-robin': True
+})
+config = {
+    'histogram': {
+        'cpu': {'first_bucket_size': 0.01, 'max_value': 1000},
+        'memory': {'first_bucket_size': 1e7, 'max_value': 1e12}
+    },
+    'action_space': env.action_space,
+    'margin': True,
+    'confidence': True,
+    'min_resource': False
+}
+recommender = Builtin(config)
+recommender.reset()
+
+rss = []
+start = time.perf_counter()
+for i in range(timesteps):
+    recommender.update(observation=observations[i], timestamp=timestamps[i])
+    # hourly recommendations
+    if i % 60 == 0:
+        recommender.recommender()
+    if (i + 1) % month == 0:
+        rss.append(rss_megabytes())
+replay_time = time.perf_counter() - start
+
+assert recommender.first_sample_start_time == timestamps[0]
+assert recommender.last_sample_start_time == timestamps[-1]
+assert recommender.total_sample_count == timesteps
+assert rss[-1] - rss[0] < 2, "memory grows with the trace length"
+
+# the state survives a checkpoint
+restored = Builtin(config)
+restored.load_from_checkpoint(recommender.save_to_checkpoint())
+for key in ['first_sample_start_time', 'last_sample_start_time',
+            'total_sample_count']:
+    assert getattr(restored, key) == getattr(recommender, key)
+assert np.allclose(restored.recommender(), recommender.recommender(),
+                   rtol=0.01)
+
+list_size = sys.getsizeof([None] * timesteps) +\
+    timesteps * sys.getsizeof(timestamps[0])
+print(f"{timesteps} timesteps replayed in {replay_time:.2f} seconds")
+print("resident memory at the end of each month (MB): " +
+      " ".join(f"{value:.1f}" for value in rss))
+print(f"a list of the timestamps would take {list_size / 1e6:.1f} MB")
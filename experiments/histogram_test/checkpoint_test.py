@@ -0,0 +1,115 @@
+import time
+
+import numpy as np
+
+from smart_vpa.util import (
+    Histogram,
+    checkpoint_to_bytes,
+    checkpoint_from_bytes
+)
+
+# ------------- merge, scale and checkpoint tests --------------
+#  based-on:
+# https://github.com/kubernetes/autoscaler/blob/master/
+# vertical-pod-autoscaler/pkg/recommender/
+# util/histogram_test.go and util/decaying_histogram_test.go
+
+first_bucket_size = 1.0
+max_value = 10.0
+ratio = 1.0
+epsilon = 1e-15
+half_life = 3600
+reference_timestamp = 1234569600
+start_timestamp = 1234567890
+
+
+def make_histogram(**kwargs):
+    return Histogram(
+        max_value=max_value,
+        first_bucket_size=first_bucket_size,
+        ratio=ratio,
+        epsilon=epsilon,
+        half_life=half_life,
+        **kwargs
+    )
+
+
+# ------------- empty histogram --------------
+histogram = make_histogram(time_decay=False)
+assert histogram.is_empty()
+assert histogram.percentile(0.5) == 0.0
+histogram.add_sample(value=1, weight=1e-20)
+assert histogram.is_empty()
+histogram.add_sample(value=1, weight=1)
+assert not histogram.is_empty()
+
+# ------------- scale --------------
+histogram = make_histogram(time_decay=False)
+histogram.add_sample(value=1, weight=1)
+histogram.add_sample(value=2, weight=1e-16)
+histogram.add_sample(value=3, weight=1)
+histogram.scale(0.5)
+assert histogram.total_weight == 1.0 + 0.5e-16
+assert histogram.min_bucket == 1 and histogram.max_bucket == 3
+histogram.scale(1e-15)
+assert histogram.is_empty()
+
+# ------------- merge --------------
+# merging two histograms is the same as adding all the samples to one
+merged = make_histogram(time_decay=False)
+other = make_histogram(time_decay=False)
+expected = make_histogram(time_decay=False)
+for value, weight in [(1, 1), (2, 2)]:
+    merged.add_sample(value=value, weight=weight)
+    expected.add_sample(value=value, weight=weight)
+for value, weight in [(2, 3), (4, 4)]:
+    other.add_sample(value=value, weight=weight)
+    expected.add_sample(value=value, weight=weight)
+merged.merge(other)
+assert merged.equals(expected)
+assert merged.total_weight == expected.total_weight
+assert merged.percentile(0.5) == expected.percentile(0.5)
+
+# decaying histograms are aligned to the younger reference timestamp
+older = make_histogram(reference_timestamp=reference_timestamp)
+younger = make_histogram(reference_timestamp=reference_timestamp+3600*20)
+older.add_sample(value=2, weight=1000, timestamp=start_timestamp)
+younger.add_sample(value=1, weight=1, timestamp=start_timestamp+3600*20)
+older.merge(younger)
+assert older.reference_time == younger.reference_time
+assert 2 == older.percentile(0.999)
+assert 3 == older.percentile(1.0)
+
+# ------------- checkpoint --------------
+histogram = make_histogram(reference_timestamp=reference_timestamp)
+for i in range(1, 5):
+    histogram.add_sample(value=i, weight=i, timestamp=start_timestamp)
+checkpoint = histogram.save_to_checkpoint()
+assert checkpoint['buckets'].tolist() == [1, 2, 3, 4]
+assert checkpoint['bucket_weights'].tolist() == [2500, 5000, 7500, 10000]
+restored = make_histogram()
+restored.load_from_checkpoint(checkpoint_from_bytes(
+    checkpoint_to_bytes(checkpoint)))
+assert restored.equals(histogram)
+assert restored.total_sample_count == histogram.total_sample_count
+for percentile in [0.0, 0.05, 0.25, 0.5, 0.75, 0.95, 1.0]:
+    assert restored.percentile(percentile) == histogram.percentile(percentile)
+
+# ------------- restoring many histograms --------------
+num_histograms = 10000
+np.random.seed(100)
+histogram = Histogram(max_value=1000, first_bucket_size=0.01)
+histogram.add_samples(
+    values=np.random.lognormal(mean=-1, sigma=1, size=30*24*60),
+    weights=1.0,
+    timestamps=np.arange(30*24*60)*60)
+data = checkpoint_to_bytes(histogram.save_to_checkpoint())
+start = time.perf_counter()
+for _ in range(num_histograms):
+    restored = Histogram(max_value=1000, first_bucket_size=0.01)
+    restored.load_from_checkpoint(checkpoint_from_bytes(data))
+restore_time = time.perf_counter() - start
+assert restored.min_bucket == histogram.min_bucket
+assert restored.max_bucket == histogram.max_bucket
+print(f"checkpoint size: {len(data)} bytes")
+print(f"restored {num_histograms} histograms in {restore_time:.3f} seconds")
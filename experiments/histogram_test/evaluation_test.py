@@ -0,0 +1,131 @@
+import time
+import shutil
+import logging
+import tempfile
+
+import numpy as np
+
+from smart_vpa.envs import SimEnv
+from smart_vpa.loss_functions import Reward
+from smart_vpa.recommender import Threshold, Random, Builtin
+from smart_vpa.replay import evaluate_cluster
+from smart_vpa.workload import WorkloadStore, write_store
+
+logging.disable(logging.INFO)
+
+# ------------- offline evaluation test --------------
+# evaluate_cluster over a synthetic workload store must give the same
+# slack, overrun and recreations per container as stepping SimEnv with
+# each recommender like check_vpa_arabesque without rendering
+
+num_namespaces = 2
+pods_per_namespace = 12
+max_timesteps = 24 * 60
+seed = 100
+
+recommenders = {
+    'threshold': {
+        'target': {'memory': 700, 'cpu': 150},
+        'upper_bound': {'memory': 1500, 'cpu': 450},
+        'lower_bound': {'memory': 300, 'cpu': 40}
+    },
+    'random': {},
+    'builtin': {
+        'histogram': {
+            'cpu': {'first_bucket_size': 0.01, 'max_value': 1000},
+            'memory': {'first_bucket_size': 1e7, 'max_value': 1e12}
+        },
+        'margin': True,
+        'confidence': False,
+        'min_resource': False
+    }
+}
+recommender_classes = {
+    'threshold': Threshold,
+    'random': Random,
+    'builtin': Builtin
+}
+
+np.random.seed(seed)
+containers = []
+for n in range(num_namespaces):
+    for p in range(pods_per_namespace):
+        timesteps = np.random.randint(2, max_timesteps)
+        containers.append({
+            'namespace': f'namespace-{n}',
+            'container_name': f'pod-{p}',
+            'requests': {'memory': 1000.0, 'cpu': 200.0},
+            'limits': {'memory': 4000.0, 'cpu': 1000.0},
+            'workload': np.stack((
+                np.random.lognormal(mean=6.5, sigma=0.3, size=timesteps),
+                np.random.lognormal(mean=5, sigma=0.4, size=timesteps))
+                ).astype(int),
+            'time': np.arange(timesteps) * 60
+        })
+
+
+def check_container(container, type_recommender):
+    """one pass over the workload of the container with steps"""
+    config = dict(container, seed=seed)
+    config['round-robin'] = False
+    env = SimEnv(config)
+    recommender = recommender_classes[type_recommender](config=dict(
+        recommenders[type_recommender], action_space=env.action_space))
+    recommender.reset()
+    observation = env.reset()
+    steps = env.total_timesteps - 1
+    usage = np.zeros((2, steps))
+    requests = np.zeros((2, steps))
+    recreated = np.zeros(steps, dtype=bool)
+    for i in range(steps):
+        usage[:, i] = env.resource_usage_current
+        requests[:, i] = env.requests
+        recommender.update(observation=observation, timestamp=env.wall_time)
+        action = recommender.recommender()
+        observation, _, _, _ = env.step(action)
+        recreated[i] = env.recreation_flag
+        env.recreation_flag = False
+    return Reward().compute(usage, requests, recreated)
+
+
+path = tempfile.mkdtemp()
+try:
+    write_store(path, containers)
+    start = time.perf_counter()
+    results = evaluate_cluster(
+        path=path, recommenders=recommenders, seed=seed, shard_size=4)
+    pool_time = time.perf_counter() - start
+
+    assert len(results) == len(recommenders) * len(containers)
+    store = WorkloadStore(path)
+    start = time.perf_counter()
+    for _, result in results.iterrows():
+        index = store.find(
+            namespace=result['namespace'], container_name=result['pod'])[0]
+        score = check_container(store.container(index), result['recommender'])
+        assert np.array_equal(
+            [result['slack_memory'], result['slack_cpu']], score['slack'])
+        assert np.array_equal(
+            [result['overrun_memory'], result['overrun_cpu']],
+            score['overrun'])
+        assert result['recreations'] == score['recreations']
+        assert np.isclose(result['total_reward'], score['total_reward'])
+        assert result['steps'] == len(score['rewards'])
+    serial_time = time.perf_counter() - start
+    del store
+
+    # unimplemented recommenders fail before any shard is submitted
+    try:
+        evaluate_cluster(path=path, recommenders={'rl': {}})
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('rl recommender should not be evaluated')
+finally:
+    shutil.rmtree(path)
+
+print(results.groupby('recommender')[[
+    'slack_memory', 'overrun_memory', 'recreations', 'wall_time']].sum())
+print(f"{len(containers)} containers, {len(recommenders)} recommenders")
+print(f"stepping one by one: {serial_time:.2f} seconds")
+print(f"evaluate_cluster:    {pool_time:.2f} seconds")
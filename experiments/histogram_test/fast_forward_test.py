@@ -0,0 +1,104 @@
+import time
+import logging
+
+import numpy as np
+
+from smart_vpa.envs import SimEnv
+
+logging.disable(logging.INFO)
+
+# ------------- sim env fast forward test --------------
+# fast_forward with a threshold recommendation must end up in the same
+# state as stepping with the same action and sum the same slack and
+# overrun, then the time of evaluating the threshold recommendation
+# on month-long workloads with both
+
+num_containers = 4
+timesteps = 30 * 24 * 60
+seed = 100
+
+np.random.seed(seed)
+containers = []
+for i in range(num_containers):
+    containers.append({
+        'container_name': f'pod-{i}',
+        'requests': {'memory': 1000.0, 'cpu': 200.0},
+        'limits': {'memory': 4000.0, 'cpu': 1000.0},
+        'workload': np.stack((
+            np.random.lognormal(mean=6.5, sigma=0.3, size=timesteps),
+            np.random.lognormal(mean=5, sigma=0.4, size=timesteps))),
+        'time': np.arange(timesteps) * 60,
+        'seed': seed,
+        'round-robin': True
+    })
+# one sample container, done right at its first step
+containers.insert(2, dict(
+    containers[0], container_name='pod-short',
+    workload=containers[0]['workload'][:, :1], time=np.arange(1)))
+config = {key: [container[key] for container in containers]
+          for key in containers[0]}
+# steps of an episode over all the containers
+episode_steps = sum(
+    max(container['workload'].shape[1] - 1, 1) for container in containers)
+
+# threshold recommendation
+#  ram_lower_bound cpu_lower_bound ram_target cpu_target
+#  ram_upper_bound cpu_upper_bound
+action = np.array([300, 40, 700, 150, 1500, 450])
+
+# ------------- same state as stepping --------------
+step_env = SimEnv(config)
+fast_env = SimEnv(config)
+step_env.reset()
+fast_env.reset()
+calls = 0
+total_steps = 0
+while total_steps < episode_steps:
+    observation, reward, done, info = fast_env.fast_forward(action)
+    step_reward = 0
+    slack = np.zeros(2)
+    overrun = np.zeros(2)
+    for _ in range(info['steps']):
+        requests = step_env.requests.copy()
+        usage = step_env.resource_usage_current
+        step_observation, r, step_done, _ = step_env.step(action)
+        step_reward += r
+        slack += np.maximum(requests - usage, 0)
+        overrun += np.maximum(usage - requests, 0)
+    assert np.array_equal(observation, step_observation)
+    assert reward == step_reward and done == step_done
+    assert np.array_equal(info['slack'], slack)
+    assert np.array_equal(info['overrun'], overrun)
+    for attribute in ['timestep', 'global_timestep', 'current_container',
+                      'recreation_flag']:
+        assert getattr(fast_env, attribute) == getattr(step_env, attribute)
+    for attribute in ['requests', 'limits', 'prev_observation']:
+        assert np.array_equal(getattr(fast_env, attribute),
+                              getattr(step_env, attribute))
+    calls += 1
+    total_steps += info['steps']
+assert total_steps == episode_steps
+assert fast_env.current_container == 0
+assert calls < episode_steps / 10
+
+# ------------- evaluation time --------------
+env = SimEnv(config)
+env.reset()
+start = time.perf_counter()
+for _ in range(episode_steps):
+    env.step(action)
+step_time = time.perf_counter() - start
+
+env = SimEnv(config)
+env.reset()
+start = time.perf_counter()
+total_steps = 0
+while total_steps < episode_steps:
+    _, _, _, info = env.fast_forward(action)
+    total_steps += info['steps']
+fast_time = time.perf_counter() - start
+
+print(f"{len(containers)} containers, {episode_steps} steps,"
+      f" {calls} fast forwards")
+print(f"step:         {step_time:.2f} seconds")
+print(f"fast_forward: {fast_time:.3f} seconds")
@@ -0,0 +1,139 @@
+import os
+import json
+import time
+import shutil
+import tempfile
+
+import numpy as np
+
+from smart_vpa.recommender_initial import Builtin
+from smart_vpa.replay import FleetReplay, load_progress
+from smart_vpa.workload import write_store
+
+# ------------- fleet replay test --------------
+# a synthetic arabesque cluster is replayed once the way
+# analysis_all_containers_arabsque.py used to do it (update and
+# recommender on every timestep) and once with FleetReplay, the
+# summaries must be the same and an interrupted replay must continue
+# from where it stopped
+
+recommender_config = {
+    'cpu_first_bucket_size': 0.01,
+    'cpu_max_value': 1000,
+    'memory_first_bucket_size': 1e7,
+    'memory_max_value': 1e12,
+    'margin': True,
+    'confidence': False,
+    'min_resource': False,
+    'time_decay': True
+}
+
+num_namespaces = 3
+pods_per_namespace = 8
+time_interval = 60
+seed = 100
+
+np.random.seed(seed)
+cluster = {}
+for n in range(num_namespaces):
+    cluster[f'namespace-{n}'] = {}
+    for p in range(pods_per_namespace):
+        timesteps = np.random.randint(1, 3 * 24 * 60)
+        timestamps = np.arange(timesteps) * time_interval
+        workload = np.stack((
+            np.random.lognormal(mean=7, sigma=1, size=timesteps),
+            np.random.lognormal(mean=6, sigma=1, size=timesteps)
+        )).astype(int)
+        cluster[f'namespace-{n}'][f'pod-{p}'] = {
+            'workload': workload,
+            'time': timestamps,
+            'requests': {'memory': 2000.0, 'cpu': 500.0},
+            'limits': {'memory': 4000.0, 'cpu': 1000.0}
+        }
+
+
+def per_timestep_summary(workload, time, request_memory, request_cpu):
+    """statistics of a pod as computed by the per timestep script"""
+    recommender = Builtin(**recommender_config)
+    for i in range(workload.shape[1]):
+        recommender.update(memory_usage=workload[0, i],
+                           cpu_usage=workload[1, i],
+                           timestamp=time[i])
+        recommendation = recommender.recommender()
+    final_memory = recommendation[[0, 2, 4]]
+    final_cpu = recommendation[[1, 3, 5]]
+    max_memory = int(np.max(workload[0]) * 1.15)
+    max_cpu = int(np.max(workload[1]) * 1.15)
+    summary = {
+        'avg_usage_memory': int(np.average(workload[0])),
+        'avg_usage_cpu': int(np.average(workload[1])),
+        'usage_density_memory': np.trapz(workload[0], time),
+        'request_density_cpu': np.trapz(
+            np.ones(time.shape)*request_cpu, time),
+        'request_max_usage_memory': max_memory,
+        'request_builtin_final_memory': final_memory.tolist(),
+        'request_builtin_final_cpu': final_cpu.tolist(),
+    }
+    for name, memory, cpu in [('usage', request_memory, request_cpu),
+                              ('max', max_memory, max_cpu),
+                              ('builtin', final_memory[1], final_cpu[1])]:
+        slack_memory = memory - workload[0]
+        slack_memory[slack_memory < 0] = 0
+        overrun_cpu = workload[1] - cpu
+        overrun_cpu[overrun_cpu < 0] = 0
+        summary[f'slack_{name}_density_memory'] = np.trapz(
+            slack_memory, time)
+        summary[f'overrun_{name}_density_cpu'] = np.trapz(overrun_cpu, time)
+    return summary
+
+
+start = time.perf_counter()
+expected = {}
+for namespace, pods in cluster.items():
+    for pod_name, contents in pods.items():
+        expected[(namespace, pod_name)] = per_timestep_summary(
+            contents['workload'], contents['time'],
+            contents['requests']['memory'], contents['requests']['cpu'])
+loop_time = time.perf_counter() - start
+
+path = tempfile.mkdtemp()
+try:
+    write_store(os.path.join(path, 'cluster'), [
+        dict(contents, namespace=namespace, container_name=pod_name)
+        for namespace, pods in cluster.items()
+        for pod_name, contents in pods.items()])
+    output_path = os.path.join(path, 'replay')
+
+    # ------------- interrupted replay --------------
+    replay = FleetReplay(
+        path=os.path.join(path, 'cluster'), output_path=output_path,
+        recommender_config=recommender_config, num_workers=2, shard_size=4)
+    run = replay.run()
+    first = [next(run) for _ in range(5)]
+    run.close()
+    done = load_progress(output_path)
+    assert len(done) >= len(first)
+    # half written line of a killed run
+    with open(os.path.join(output_path, 'progress.jsonl'), 'a') as f:
+        f.write(json.dumps(done[-1])[:20])
+
+    # ------------- resumed replay --------------
+    start = time.perf_counter()
+    resumed = list(replay.run())
+    replay_time = time.perf_counter() - start
+    assert len(resumed) == len(expected) - len(done)
+    summaries = load_progress(output_path)
+    assert len(summaries) == len(expected)
+    assert summaries == replay.results()
+    for summary in summaries:
+        reference = expected[(summary['namespace'], summary['pod'])]
+        for key, value in reference.items():
+            assert np.isclose(summary[key], value, rtol=1e-12).all(), \
+                (summary['pod'], key, summary[key], value)
+finally:
+    shutil.rmtree(path)
+
+print(f"{len(expected)} pods")
+print(f"per timestep script: {loop_time:.2f} seconds")
+print(f"FleetReplay:         {replay_time:.2f} seconds"
+      f" ({len(resumed)} pods)")
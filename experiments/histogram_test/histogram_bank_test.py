@@ -0,0 +1,108 @@
+import time
+
+import numpy as np
+
+from smart_vpa.util import Histogram, HistogramBank
+from smart_vpa.envs.sim_env import RecommenderSpace
+from smart_vpa.recommender import Builtin, BuiltinFleet
+
+# ------------- histogram bank test --------------
+# every row of the bank must be the same as a Histogram fed with
+# that container's samples, and BuiltinFleet must recommend the same
+# as one Builtin per container
+
+cpu_first_bucket_size = 0.01
+cpu_max_value = 1000
+
+memory_first_bucket_size = 1e7
+memory_max_value = 1e12
+
+num_containers = 50
+timesteps = 2 * 24 * 60
+time_interval = 60
+seed = 100
+
+np.random.seed(seed)
+timestamps = np.arange(timesteps) * time_interval
+# memory in megabytes and cpu in millicores
+workloads = np.stack([
+    np.random.lognormal(mean=7, sigma=1, size=(num_containers, timesteps)),
+    np.random.lognormal(mean=6, sigma=1, size=(num_containers, timesteps))
+    ], axis=1)
+
+# ------------- bank rows and histograms --------------
+# a short half life to also go through the reference timestamp shifts
+half_life = 600
+bank = HistogramBank(
+    num_histograms=num_containers,
+    max_value=cpu_max_value,
+    first_bucket_size=cpu_first_bucket_size,
+    half_life=half_life)
+# samples of all the containers interleaved in time order
+container_ids = np.tile(np.arange(num_containers), timesteps)
+bank.add_samples(
+    container_ids=container_ids,
+    values=workloads[:, 1, :].T.ravel() / 1000,
+    timestamps=np.repeat(timestamps, num_containers))
+results = bank.percentiles([0.0, 0.5, 0.9, 0.95, 1.0])
+for container in range(num_containers):
+    histogram = Histogram(
+        max_value=cpu_max_value,
+        first_bucket_size=cpu_first_bucket_size,
+        half_life=half_life)
+    histogram.add_samples(
+        values=workloads[container, 1] / 1000,
+        weights=1.0,
+        timestamps=timestamps)
+    assert histogram.equals(bank.histogram(container))
+    assert histogram.total_weight == bank.total_weight[container]
+    assert histogram.percentiles(
+        [0.0, 0.5, 0.9, 0.95, 1.0]).tolist() == results[container].tolist()
+
+# ------------- fleet and per container recommenders --------------
+action_space = RecommenderSpace(
+    low=np.zeros(6), high=np.array([800000, 100000] * 3),
+    shape=(6,), dtype=np.float32)
+config = {
+    "histogram": {
+        "cpu": {
+            "first_bucket_size": cpu_first_bucket_size,
+            "max_value": cpu_max_value
+        },
+        "memory": {
+            "first_bucket_size": memory_first_bucket_size,
+            "max_value": memory_max_value
+        }
+    },
+    "action_space": action_space,
+    "margin": True,
+    "confidence": False,
+    "min_resource": False,
+    "num_containers": num_containers
+}
+
+fleet = BuiltinFleet(config)
+start = time.perf_counter()
+fleet_recommendations = []
+for i in range(timesteps):
+    fleet.update(observation=workloads[:, :, i], timestamp=timestamps[i])
+    fleet_recommendations.append(fleet.recommender())
+fleet_time = time.perf_counter() - start
+
+recommenders = [Builtin(config) for _ in range(num_containers)]
+start = time.perf_counter()
+recommendations = []
+for i in range(timesteps):
+    step_recommendations = []
+    for container, recommender in enumerate(recommenders):
+        recommender.update(
+            observation=workloads[container, :, i], timestamp=timestamps[i])
+        step_recommendations.append(recommender.recommender())
+    recommendations.append(step_recommendations)
+builtin_time = time.perf_counter() - start
+
+assert np.array_equal(np.array(fleet_recommendations),
+                      np.array(recommendations))
+print(f"{num_containers} containers, {timesteps} timesteps")
+print(f"Builtin per container: {builtin_time:.2f} seconds")
+print(f"BuiltinFleet:          {fleet_time:.2f} seconds")
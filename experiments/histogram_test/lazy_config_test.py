@@ -0,0 +1,156 @@
+import os
+import sys
+import json
+import time
+import pickle
+import shutil
+import logging
+import tempfile
+
+import numpy as np
+
+from smart_vpa.envs import SimEnv, VectorSimEnv
+from smart_vpa.workload import WorkloadStore, write_store
+
+# get an absolute path to the directory that contains parent files
+project_dir = os.path.dirname(os.path.join(os.getcwd(), __file__))
+sys.path.append(os.path.normpath(os.path.join(project_dir, '..', '..')))
+
+from experiments.utils import path_finder # noqa
+
+logging.disable(logging.INFO)
+
+# ------------- lazy config test --------------
+# build_config of a workload store gives the indices of the containers
+# in the store instead of their workloads, the envs made from it must
+# step like the envs of the eager config (the workloads in the config)
+# while the config that is shipped to the rollout workers stays small
+
+num_namespaces = 4
+pods_per_namespace = 500
+max_timesteps = 24 * 60
+time_interval = 60
+seed = 100
+
+np.random.seed(seed)
+containers = []
+for n in range(num_namespaces):
+    for p in range(pods_per_namespace):
+        timesteps = np.random.randint(2, max_timesteps)
+        memory_request = float(np.random.randint(500, 3000))
+        cpu_request = float(np.random.randint(100, 1000))
+        containers.append({
+            'namespace': f'namespace-{n}',
+            'container_name': f'pod-{p}',
+            'requests': {'memory': memory_request, 'cpu': cpu_request},
+            'limits': {'memory': 2 * memory_request, 'cpu': 3 * cpu_request},
+            'workload': np.stack((
+                np.random.randint(200, 4000, size=timesteps),
+                np.random.randint(50, 1500, size=timesteps))),
+            'time': np.arange(timesteps) * time_interval
+        })
+
+path = tempfile.mkdtemp()
+try:
+    write_store(os.path.join(path, 'arabesque-store', 'cluster'), containers)
+    path_finder.WORKLOADS_PATH = path
+
+    start = time.perf_counter()
+    config = path_finder.build_config(
+        workload_id=0, seed=seed, round_robin=True,
+        workload_bunch=len(containers), workload_type='arabesque',
+        workload_full_path='cluster')
+    lazy_time = time.perf_counter() - start
+    assert 'workload' not in config
+    assert len(config['container_name']) == len(containers)
+
+    # the eager config of the same containers in the same order
+    store = WorkloadStore(os.path.join(path, 'arabesque-store', 'cluster'))
+    eager_config = {key: [] for key in ['container_name', 'requests',
+                                        'limits', 'workload', 'time']}
+    for index in config['store-index']:
+        container = store.container(index)
+        for key in eager_config:
+            eager_config[key].append(np.array(container[key]) if key in [
+                'workload', 'time'] else container[key])
+    eager_config['seed'] = config['seed']
+    eager_config['round-robin'] = config['round-robin']
+    lazy_size = len(pickle.dumps(config))
+    eager_size = len(pickle.dumps(eager_config))
+
+    # ------------- SimEnv over all the containers --------------
+    start = time.perf_counter()
+    env = SimEnv(config)
+    env_time = time.perf_counter() - start
+    eager_env = SimEnv(eager_config)
+    assert env.total_containers == eager_env.total_containers
+    assert np.array_equal(env.containers_requests,
+                          eager_env.containers_requests)
+    for workload, eager_workload in zip(
+            env.containers_workload, eager_env.containers_workload):
+        # views of the memory mapped store
+        assert isinstance(workload, np.memmap)
+        assert np.array_equal(workload, eager_workload)
+    env.reset()
+    eager_env.reset()
+    for _ in range(5 * max_timesteps):
+        action = env.action_space.sample()
+        observation, reward, done, _ = env.step(action)
+        eager_observation, eager_reward, eager_done, _ = eager_env.step(
+            action)
+        assert np.array_equal(observation, eager_observation)
+        assert env.container_name == eager_env.container_name
+
+    # ------------- one container SimEnv --------------
+    single_config = dict(store.containers[config['store-index'][7]])
+    single_config.update({
+        'seed': seed, 'round-robin': True,
+        'workload-store': config['workload-store'],
+        'store-index': config['store-index'][7]})
+    single_env = SimEnv(single_config)
+    assert single_env.container_name == config['container_name'][7]
+    assert np.array_equal(
+        single_env.workload, eager_config['workload'][7])
+
+    # ------------- VectorSimEnv of a namespace --------------
+    config = path_finder.build_config(
+        workload_id=0, seed=seed, round_robin=False, workload_bunch=64,
+        workload_type='arabesque', workload_full_path='cluster/namespace-1')
+    assert all(container_name in [f'pod-{p}' for p in range(
+        pods_per_namespace)] for container_name in config['container_name'])
+    vector_env = VectorSimEnv(config)
+    for i, index in enumerate(config['store-index']):
+        assert np.array_equal(
+            vector_env.workload[i, :, :vector_env.total_timesteps[i]],
+            store.workload(index))
+    del store, env, eager_env, single_env, vector_env
+
+    # ------------- workload_bunch of container folders --------------
+    # the eager build_config only loads the first workload_bunch
+    # container folders of a workload
+    workload_path = os.path.join(path, 'synthetic', '0')
+    for i, container in enumerate(containers[:6]):
+        container_path = os.path.join(workload_path, f'{i}')
+        os.makedirs(container_path)
+        with open(os.path.join(
+                container_path, 'container.json'), 'w') as out_file:
+            json.dump({key: container[key] for key in [
+                'container_name', 'requests', 'limits']}, out_file)
+        for name in ['workload', 'time']:
+            with open(os.path.join(
+                    container_path, f'{name}.pickle'), 'wb') as out_file:
+                pickle.dump(container[name], out_file)
+    open(os.path.join(workload_path, '.DS_Store'), 'w').close()
+    config = path_finder.build_config(
+        workload_id=0, seed=seed, round_robin=True, workload_bunch=4,
+        workload_type='synthetic')
+    assert config['container_name'] == [
+        container['container_name'] for container in containers[:4]]
+finally:
+    shutil.rmtree(path)
+
+print(f"{len(containers)} containers")
+print(f"lazy build_config:    {lazy_time:.3f} seconds")
+print(f"SimEnv of the config: {env_time:.3f} seconds")
+print(f"pickled config:       {lazy_size / 1e6:.2f} MB"
+      f" (eager {eager_size / 1e6:.2f} MB)")
@@ -0,0 +1,86 @@
+import numpy as np
+
+from smart_vpa.util import Histogram
+
+# ------------- long horizon decaying histogram test --------------
+# a year of one sample per minute with a one hour half life makes
+# decay factors of 2^8760 that overflow float64, the histogram must
+# keep renormalizing its reference timestamp and still give the same
+# percentiles as a float128 histogram with a fixed reference
+
+first_bucket_size = 0.01
+max_value = 1000
+half_life = 3600
+epsilon = 1e-300
+
+days = 365
+time_interval = 60
+samples_per_day = 24 * 3600 // time_interval
+seed = 100
+
+percentiles = [0.5, 0.9, 0.95, 0.99]
+
+np.random.seed(seed)
+timestamps = np.arange(days * samples_per_day) * time_interval
+# daily pattern with a slowly growing trend
+usage = np.random.lognormal(mean=-1, sigma=0.5, size=timestamps.size) *\
+    (2 + np.sin(2 * np.pi * timestamps / (24 * 3600))) *\
+    (1 + timestamps / timestamps[-1])
+assert np.isinf(np.exp2(timestamps[-1] / half_life))
+
+histogram = Histogram(
+    max_value=max_value,
+    first_bucket_size=first_bucket_size,
+    epsilon=epsilon,
+    half_life=half_life
+)
+
+# float128 reference without renormalization
+reference_weight = np.zeros(histogram.num_buckets, dtype=np.longdouble)
+buckets = histogram.find_buckets(usage)
+
+
+def reference_percentile(percentile):
+    """bucket walk of histogram.go on the float128 weights"""
+    non_empty = np.flatnonzero(reference_weight > 0)
+    min_bucket, max_bucket = non_empty[0], non_empty[-1]
+    threshold = np.longdouble(percentile) * reference_weight.sum()
+    partial_sum = np.cumsum(reference_weight[min_bucket:max_bucket])
+    bucket = min_bucket + np.searchsorted(partial_sum, threshold)
+    if bucket < histogram.num_buckets-1:
+        return histogram.get_bucket_start(bucket+1)
+    return histogram.get_bucket_start(bucket)
+
+
+for day in range(days):
+    day_samples = slice(day * samples_per_day, (day + 1) * samples_per_day)
+    histogram.add_samples(
+        values=usage[day_samples],
+        weights=1.0,
+        timestamps=timestamps[day_samples])
+    np.add.at(reference_weight, buckets[day_samples], np.exp2(
+        timestamps[day_samples].astype(np.longdouble) / half_life))
+
+    assert np.all(np.isfinite(histogram.bucket_weight))
+    assert histogram.bucket_weight.max() <= 2.0 ** 101 * samples_per_day
+    assert histogram.total_sample_count == (day + 1) * samples_per_day
+    for percentile in percentiles:
+        assert histogram.percentile(percentile) ==\
+            reference_percentile(percentile), (day, percentile)
+
+# ------------- add_sample and add_samples renormalize alike --------------
+short_half_life = 60
+loop = Histogram(max_value=max_value, first_bucket_size=first_bucket_size,
+                 half_life=short_half_life)
+batch = Histogram(max_value=max_value, first_bucket_size=first_bucket_size,
+                  half_life=short_half_life)
+for i in range(samples_per_day):
+    loop.add_sample(value=usage[i], weight=1.0, timestamp=timestamps[i])
+batch.add_samples(values=usage[:samples_per_day], weights=1.0,
+                  timestamps=timestamps[:samples_per_day])
+assert loop.reference_time == batch.reference_time
+assert loop.equals(batch)
+assert loop.total_weight == batch.total_weight
+
+print(f"replayed {days} days, reference timestamp"
+      f" {histogram.reference_time}")
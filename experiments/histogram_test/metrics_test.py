@@ -0,0 +1,71 @@
+import time
+
+import numpy as np
+
+from smart_vpa.metrics import segment_trapz, cluster_metrics
+
+# ------------- cluster metrics test --------------
+# slack, overrun and density statistics of a synthetic cluster in one
+# vectorized pass against np.trapz on every pod like the per pod
+# analysis script, pods with zero and one sample are included
+
+num_pods = 2000
+max_timesteps = 3 * 24 * 60
+time_interval = 60
+seed = 100
+
+np.random.seed(seed)
+lengths = np.random.randint(2, max_timesteps, size=num_pods)
+lengths[[0, 7, 8, -1]] = [0, 1, 0, 1]
+offsets = np.concatenate(([0], np.cumsum(lengths)))
+timestamps = np.concatenate([np.arange(n) * time_interval for n in lengths])
+usage = np.stack((
+    np.random.lognormal(mean=7, sigma=1, size=offsets[-1]),
+    np.random.lognormal(mean=6, sigma=1, size=offsets[-1])
+)).astype(int)
+requests = np.stack((
+    np.random.randint(500, 5000, size=num_pods),
+    np.random.randint(100, 1000, size=num_pods)
+)).astype(float)
+max_usage = np.stack([
+    usage[:, offsets[i]:offsets[i+1]].max(axis=1, initial=0) * 1.15
+    for i in range(num_pods)], axis=1).astype(int)
+
+# ------------- segment trapz --------------
+areas = segment_trapz(usage, timestamps, offsets)
+for i in range(num_pods):
+    pod = slice(offsets[i], offsets[i+1])
+    assert np.array_equal(areas[:, i], np.trapz(usage[:, pod], timestamps[pod]))
+
+# ------------- all the metrics --------------
+start = time.perf_counter()
+table = cluster_metrics(
+    usage=usage, time=timestamps, offsets=offsets, requests=requests,
+    predictions={'max': max_usage})
+vectorized_time = time.perf_counter() - start
+assert len(table) == num_pods
+
+start = time.perf_counter()
+for i in range(num_pods):
+    pod = slice(offsets[i], offsets[i+1])
+    for r, resource in enumerate(['memory', 'cpu']):
+        for name, request in [('usage', requests), ('max', max_usage)]:
+            slack = request[r, i] - usage[r, pod]
+            slack[slack < 0] = 0
+            overrun = usage[r, pod] - request[r, i]
+            overrun[overrun < 0] = 0
+            assert table[f'slack_{name}_density_{resource}'][i] ==\
+                np.trapz(slack, timestamps[pod])
+            assert table[f'overrun_{name}_density_{resource}'][i] ==\
+                np.trapz(overrun, timestamps[pod])
+        assert table[f'request_density_{resource}'][i] == np.trapz(
+            np.ones(lengths[i]) * requests[r, i], timestamps[pod])
+        if lengths[i]:
+            assert table[f'avg_usage_{resource}'][i] ==\
+                int(np.average(usage[r, pod]))
+        assert table[f'request_{resource}'][i] == requests[r, i]
+loop_time = time.perf_counter() - start
+
+print(f"{num_pods} pods, {offsets[-1]} samples")
+print(f"per pod np.trapz: {loop_time:.2f} seconds")
+print(f"cluster_metrics:  {vectorized_time:.2f} seconds")
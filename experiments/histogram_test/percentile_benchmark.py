@@ -0,0 +1,84 @@
+import time
+
+import numpy as np
+
+from smart_vpa.util import Histogram
+from smart_vpa.recommender_initial import Builtin
+
+# ------------- percentile benchmark --------------
+# per step cost of the builtin recommender on the default
+# 5% ratio bucket layout, the percentiles are also checked against
+# the bucket by bucket walk of histogram.go
+
+cpu_first_bucket_size = 0.01
+cpu_max_value = 1000
+
+memory_first_bucket_size = 1e7
+memory_max_value = 1e12
+
+timesteps = 7 * 24 * 60
+time_interval = 60
+seed = 100
+
+np.random.seed(seed)
+timestamps = np.arange(timesteps) * time_interval
+# memory in megabytes and cpu in millicores
+memory_usage = np.random.lognormal(mean=7, sigma=1, size=timesteps)
+cpu_usage = np.random.lognormal(mean=6, sigma=1, size=timesteps)
+
+
+def percentile_walk(histogram: Histogram, percentile: float) -> float:
+    """Percentile() of histogram.go"""
+    partial_sum = 0.0
+    threshold = percentile * histogram.total_weight
+    bucket = histogram.min_bucket
+    while bucket < histogram.max_bucket:
+        partial_sum += histogram.bucket_weight[bucket]
+        if partial_sum >= threshold:
+            break
+        bucket += 1
+    if bucket < histogram.num_buckets-1:
+        return histogram.get_bucket_start(bucket+1)
+    return histogram.get_bucket_start(bucket)
+
+
+# ------------- correctness --------------
+histogram = Histogram(
+    max_value=cpu_max_value,
+    first_bucket_size=cpu_first_bucket_size
+)
+for i in range(0, timesteps, 97):
+    histogram.add_sample(
+        value=cpu_usage[i]/1000, weight=1.0, timestamp=timestamps[i])
+    for percentile in [0.0, 0.5, 0.9, 0.95, 1.0]:
+        assert histogram.percentile(percentile) ==\
+            percentile_walk(histogram, percentile)
+assert np.isclose(histogram.total_weight, sum(histogram.bucket_weight))
+
+# ------------- per step recommender cost --------------
+recommender = Builtin(
+    cpu_first_bucket_size=cpu_first_bucket_size,
+    cpu_max_value=cpu_max_value,
+    memory_first_bucket_size=memory_first_bucket_size,
+    memory_max_value=memory_max_value,
+    margin=True,
+    confidence=False,
+    min_resource=False)
+recommender.reset()
+
+update_time = 0
+recommender_time = 0
+for i in range(timesteps):
+    start = time.perf_counter()
+    recommender.update(memory_usage=memory_usage[i],
+                       cpu_usage=cpu_usage[i],
+                       timestamp=timestamps[i])
+    update_time += time.perf_counter() - start
+    start = time.perf_counter()
+    recommender.recommender()
+    recommender_time += time.perf_counter() - start
+
+print(f"buckets: cpu {recommender.cpu_histogram.num_buckets}"
+      f" memory {recommender.memory_histogram.num_buckets}")
+print(f"update:      {update_time/timesteps*1e6:.1f} us per step")
+print(f"recommender: {recommender_time/timesteps*1e6:.1f} us per step")
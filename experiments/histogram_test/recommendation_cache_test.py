@@ -0,0 +1,145 @@
+import time
+import logging
+
+import numpy as np
+
+from smart_vpa.envs import SimEnv
+from smart_vpa.recommender import Builtin
+from smart_vpa.util import Histogram
+
+logging.disable(logging.INFO)
+
+# ------------- recommendation cache test --------------
+# the percentiles cached by Histogram (kept by add_sample while the
+# quantiles stay in their buckets) and the recommendations cached by
+# Builtin must be the same as recomputing them from scratch on every
+# timestep, on a stable trace, a drifting one, over the reference
+# timestamp shifts of the decaying histograms and on exact ties
+
+seed = 100
+percentiles = [0.5, 0.9, 0.95]
+np.random.seed(seed)
+
+
+def uncached_percentiles(histogram, percentiles):
+    histogram._weights_changed()
+    return histogram.percentiles(percentiles)
+
+
+# ------------- histogram percentiles --------------
+# exact ties with integer weights on a linear histogram
+ties = Histogram(max_value=10, first_bucket_size=1, ratio=1,
+                 time_decay=False)
+reference = Histogram(max_value=10, first_bucket_size=1, ratio=1,
+                      time_decay=False)
+for value in np.random.randint(0, 10, size=2000):
+    ties.add_sample(value=value, weight=1.0)
+    reference.add_sample(value=value, weight=1.0)
+    assert np.array_equal(
+        ties.percentiles(percentiles),
+        uncached_percentiles(reference, percentiles))
+
+# decaying histogram on an hourly trace crossing reference shifts
+hours = 24 * 250
+values = np.random.lognormal(mean=21, sigma=1, size=hours)
+values[hours // 2:] *= 3
+decaying = Histogram(max_value=1e12, first_bucket_size=1e7)
+reference = Histogram(max_value=1e12, first_bucket_size=1e7)
+hits = 0
+for value, timestamp in zip(values, np.arange(hours) * 3600):
+    decaying.add_sample(value=value, weight=1.0, timestamp=timestamp)
+    reference.add_sample(value=value, weight=1.0, timestamp=timestamp)
+    version = decaying.percentiles_version
+    assert np.array_equal(
+        decaying.percentiles(percentiles),
+        uncached_percentiles(reference, percentiles))
+    hits += version == decaying.percentiles_version
+assert reference.reference_time > 0
+assert 0 < hits < hours
+
+# a query of another list of percentiles replaces the cache
+version = decaying.percentiles_version
+decaying.percentiles([0.99])
+assert decaying.percentiles_version != version
+
+# a scalar query doesn't touch the cache of the last list
+expected = uncached_percentiles(reference, percentiles)
+assert np.array_equal(decaying.percentiles(percentiles), expected)
+version = decaying.percentiles_version
+cache = decaying._percentiles_cache
+scalar = decaying.percentiles(0.1)
+assert np.ndim(scalar) == 0
+assert decaying.percentile(0.99) == uncached_percentiles(
+    reference, [0.99])[0]
+assert decaying.percentiles_version == version
+assert decaying._percentiles_cache is cache
+assert cache['percentiles'] == percentiles
+for _ in range(2):
+    values = decaying.percentiles(percentiles)
+    assert values.shape == (len(percentiles),)
+    assert np.array_equal(values, expected)
+
+# ------------- builtin recommender --------------
+timesteps = 30 * 24 * 60
+time_interval = 60
+workload = np.stack((
+    np.random.lognormal(mean=7, sigma=0.2, size=timesteps),
+    np.random.lognormal(mean=5, sigma=0.2, size=timesteps))).astype(int)
+workload[:, timesteps // 2:] *= 2
+observations = np.concatenate((workload, workload)).T
+timestamps = np.arange(timesteps) * time_interval
+env = SimEnv({
+    'container_name': 'pod',
+    'requests': {'memory': 1000.0, 'cpu': 200.0},
+    'limits': {'memory': 4000.0, 'cpu': 1000.0},
+    'workload': workload[:, :2],
+    'time': timestamps[:2],
+    'seed': seed,
+    'round-robin': True
+})
+histogram_config = {
+    'cpu': {'first_bucket_size': 0.01, 'max_value': 1000},
+    'memory': {'first_bucket_size': 1e7, 'max_value': 1e12}
+}
+
+
+def run(config, steps, uncached=False):
+    recommender = Builtin(dict(config, action_space=env.action_space))
+    recommender.reset()
+    recommendations = np.zeros((steps, 6), dtype=int)
+    start = time.perf_counter()
+    for i in range(steps):
+        recommender.update(
+            observation=observations[i], timestamp=timestamps[i])
+        if uncached:
+            recommender.memory_histogram._weights_changed()
+            recommender.cpu_histogram._weights_changed()
+        recommendations[i] = recommender.recommender()
+    return recommendations, time.perf_counter() - start
+
+
+for margin, confidence, min_resource in [
+        (True, False, False), (False, False, True), (True, True, True)]:
+    config = {
+        'histogram': histogram_config,
+        'margin': margin,
+        'confidence': confidence,
+        'min_resource': min_resource
+    }
+    steps = timesteps if not confidence else timesteps // 10
+    cached, cached_time = run(config, steps)
+    recomputed, recomputed_time = run(config, steps, uncached=True)
+    assert np.array_equal(cached, recomputed)
+    print(f"margin={margin} confidence={confidence}"
+          f" min_resource={min_resource}: {steps} steps")
+    print(f"    recomputed every step: {recomputed_time:.2f} seconds")
+    print(f"    cached:                {cached_time:.2f} seconds")
+
+# reset forgets the cached recommendation
+recommender = Builtin(dict(config, action_space=env.action_space,
+                           confidence=False))
+recommender.update(observation=observations[0], timestamp=0)
+first = recommender.recommender()
+recommender.reset()
+recommender.update(observation=observations[-1] * 3, timestamp=0)
+assert not np.array_equal(first, recommender.recommender())
@@ -0,0 +1,74 @@
+import time
+
+import numpy as np
+
+from smart_vpa.util import Histogram
+
+# ------------- replay benchmark --------------
+# replays a synthetic month-long trace with one sample per minute
+# once with add_sample in a loop and once with add_samples
+# and checks that both end up in the same histogram
+
+cpu_first_bucket_size = 0.01
+cpu_max_value = 1000
+
+memory_first_bucket_size = 1e7
+memory_max_value = 1e12
+
+timesteps = 30 * 24 * 60
+time_interval = 60
+seed = 100
+
+np.random.seed(seed)
+timestamps = np.arange(timesteps) * time_interval
+# memory in bytes and cpu in cores
+memory_usage = np.random.lognormal(mean=21, sigma=1, size=timesteps)
+cpu_usage = np.random.lognormal(mean=-1, sigma=1, size=timesteps)
+
+
+def make_histograms():
+    memory_histogram = Histogram(
+        max_value=memory_max_value,
+        first_bucket_size=memory_first_bucket_size
+    )
+    cpu_histogram = Histogram(
+        max_value=cpu_max_value,
+        first_bucket_size=cpu_first_bucket_size
+    )
+    return memory_histogram, cpu_histogram
+
+
+# ------------- one sample at a time --------------
+memory_loop, cpu_loop = make_histograms()
+start = time.perf_counter()
+for i in range(timesteps):
+    memory_loop.add_sample(
+        value=memory_usage[i], weight=1.0, timestamp=timestamps[i])
+    cpu_loop.add_sample(
+        value=cpu_usage[i], weight=1.0, timestamp=timestamps[i])
+loop_time = time.perf_counter() - start
+
+# ------------- all the samples at once --------------
+memory_batch, cpu_batch = make_histograms()
+start = time.perf_counter()
+memory_batch.add_samples(
+    values=memory_usage, weights=1.0, timestamps=timestamps)
+cpu_batch.add_samples(
+    values=cpu_usage, weights=1.0, timestamps=timestamps)
+batch_time = time.perf_counter() - start
+
+for loop, batch in [(memory_loop, memory_batch), (cpu_loop, cpu_batch)]:
+    assert np.array_equal(loop.bucket_weight, batch.bucket_weight)
+    assert loop.min_bucket == batch.min_bucket
+    assert loop.max_bucket == batch.max_bucket
+    assert loop.total_sample_count == batch.total_sample_count
+
+# find_buckets on the bucket boundaries
+boundaries = np.array(cpu_loop.bin_boundaries)
+assert cpu_loop.find_buckets(boundaries).tolist() ==\
+    [cpu_loop.find_bucket(value) for value in boundaries]
+
+print(f"replayed {timesteps} timesteps")
+print(f"add_sample:  {loop_time:.3f} seconds")
+print(f"add_samples: {batch_time:.3f} seconds")
+print(f"speedup:     {loop_time/batch_time:.1f}x")
@@ -0,0 +1,121 @@
+import time
+import logging
+
+import numpy as np
+
+from smart_vpa.envs import SimEnv, VectorSimEnv
+from smart_vpa.loss_functions import Reward
+
+logging.disable(logging.INFO)
+
+# ------------- reward test --------------
+# the rewards of the steps of SimEnv with the running sums of
+# Reward.update must be the same as scoring the whole recommendation
+# trace at once with Reward.compute, also for fast_forward and for
+# the rows of VectorSimEnv
+
+timesteps = 30 * 24 * 60
+seed = 100
+weights = {'slack': [1.0, 2.0], 'overrun': [10.0, 20.0], 'recreation': 500.0}
+
+np.random.seed(seed)
+container = {
+    'container_name': 'pod',
+    'requests': {'memory': 1000.0, 'cpu': 200.0},
+    'limits': {'memory': 4000.0, 'cpu': 1000.0},
+    'workload': np.stack((
+        np.random.lognormal(mean=6.5, sigma=0.3, size=timesteps),
+        np.random.lognormal(mean=5, sigma=0.4, size=timesteps))),
+    'time': np.arange(timesteps) * 60,
+    'seed': seed,
+    'round-robin': True,
+    'formatted-info': False,
+    'reward': weights
+}
+steps = timesteps - 2
+
+# ------------- update, update_batch and compute --------------
+usage = np.random.randint(0, 2000, size=(2, steps))
+requests = np.random.randint(0, 2000, size=(2, steps))
+recreated = np.random.rand(steps) < 0.01
+step_reward = Reward(weights)
+step_rewards = np.array([
+    step_reward.update(usage[:, i], requests[:, i], recreated[i])
+    for i in range(steps)])
+batch_reward = Reward(weights)
+batch_rewards = batch_reward.update_batch(usage, requests, recreated)
+score = Reward(weights).compute(usage, requests, recreated)
+assert np.array_equal(step_rewards, score['rewards'])
+assert np.array_equal(batch_rewards, score['rewards'])
+for reward in [step_reward, batch_reward]:
+    assert np.array_equal(reward.slack, score['slack'])
+    assert np.array_equal(reward.overrun, score['overrun'])
+    assert reward.recreations == score['recreations']
+    assert reward.steps == steps
+    assert np.isclose(reward.total_reward, score['total_reward'])
+
+# ------------- sim env steps --------------
+env = SimEnv(container)
+observation = env.reset()
+trace_usage = np.zeros((2, steps))
+trace_requests = np.zeros((2, steps))
+trace_recreated = np.zeros(steps, dtype=bool)
+env_rewards = np.zeros(steps)
+start = time.perf_counter()
+for i in range(steps):
+    trace_usage[:, i] = env.resource_usage_current
+    trace_requests[:, i] = env.requests
+    target = observation[0:2] * np.random.uniform(0.7, 1.3)
+    action = np.concatenate((
+        target * 0.8, target, target * 1.2)).astype(int)
+    observation, env_rewards[i], _, _ = env.step(action)
+    trace_recreated[i] = env.recreation_flag
+    env.recreation_flag = False
+step_time = time.perf_counter() - start
+assert trace_recreated.any() and not trace_recreated.all()
+
+start = time.perf_counter()
+score = Reward(weights).compute(trace_usage, trace_requests, trace_recreated)
+compute_time = time.perf_counter() - start
+assert np.array_equal(env_rewards, score['rewards'])
+assert np.array_equal(env.reward.slack, score['slack'])
+assert np.array_equal(env.reward.overrun, score['overrun'])
+assert env.reward.recreations == score['recreations']
+
+# ------------- fast forward --------------
+action = np.array([300, 40, 700, 150, 1500, 450])
+step_env = SimEnv(container)
+fast_env = SimEnv(container)
+step_env.reset()
+fast_env.reset()
+total_steps = 0
+while total_steps < steps:
+    _, reward, _, info = fast_env.fast_forward(action)
+    step_reward = sum(step_env.step(action)[1] for _ in range(info['steps']))
+    assert np.isclose(reward, step_reward)
+    total_steps += info['steps']
+assert np.array_equal(fast_env.reward.slack, step_env.reward.slack)
+assert np.array_equal(fast_env.reward.overrun, step_env.reward.overrun)
+assert fast_env.reward.recreations == step_env.reward.recreations
+assert np.isclose(fast_env.reward.total_reward, step_env.reward.total_reward)
+
+# ------------- vector sim env --------------
+containers = [dict(
+    container, container_name=f'pod-{i}',
+    workload=container['workload'][:, i * 1000:(i + 1) * 1000],
+    time=container['time'][:1000]) for i in range(8)]
+envs = [SimEnv(c) for c in containers]
+vector_env = VectorSimEnv({key: [c[key] for c in containers]
+                           for key in containers[0]})
+observations = vector_env.vector_reset()
+for _ in range(500):
+    targets = observations[:, 0:2] * np.random.uniform(0.7, 1.3, (8, 1))
+    actions = np.concatenate((
+        targets * 0.8, targets, targets * 1.2), axis=1).astype(int)
+    observations, rewards, _, _ = vector_env.vector_step(actions)
+    for i, env in enumerate(envs):
+        assert rewards[i] == env.step(actions[i])[1]
+
+print(f"{steps} steps")
+print(f"SimEnv steps with rewards: {step_time:.2f} seconds")
+print(f"Reward.compute of the trace: {compute_time:.4f} seconds")
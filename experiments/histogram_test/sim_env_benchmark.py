@@ -0,0 +1,70 @@
+import os
+import sys
+import time
+import logging
+
+import numpy as np
+
+from smart_vpa.envs import SimEnv
+from smart_vpa.workload import WorkloadStore
+
+# get an absolute path to the directory that contains parent files
+project_dir = os.path.dirname(os.path.join(os.getcwd(), __file__))
+sys.path.append(os.path.normpath(os.path.join(project_dir, '..', '..')))
+
+from experiments.utils.constants import WORKLOADS_PATH # noqa
+
+logging.disable(logging.INFO)
+
+# ------------- sim env benchmark --------------
+# steps per second of SimEnv on the containers of the arabesque
+# engine-top-ten cluster, synthetic containers of the same size are
+# used if the workload store of the cluster is not there
+
+cluster = 'engine-top-ten'
+num_containers = 10
+timesteps = 7 * 24 * 60
+time_interval = 60
+seed = 100
+
+np.random.seed(seed)
+store_path = os.path.join(WORKLOADS_PATH, 'arabesque-store', cluster)
+if os.path.exists(store_path):
+    store = WorkloadStore(store_path)
+    containers = [store.container(i) for i in range(len(store))]
+else:
+    containers = [{
+        'container_name': f'pod-{i}',
+        'requests': {'memory': 2000.0, 'cpu': 500.0},
+        'limits': {'memory': 4000.0, 'cpu': 1000.0},
+        'workload': np.stack((
+            np.random.randint(200, 4000, size=timesteps),
+            np.random.randint(50, 1500, size=timesteps))),
+        'time': np.arange(timesteps) * time_interval
+    } for i in range(num_containers)]
+
+for formatted_info in [True, False]:
+    total_steps = 0
+    total_time = 0
+    for container in containers:
+        config = dict(container, seed=seed)
+        config['round-robin'] = False
+        config['formatted-info'] = formatted_info
+        env = SimEnv(config)
+        steps = config['workload'].shape[1] - 1
+        # recommendations around the usage with recreations
+        # every few steps
+        usage = np.asarray(config['workload'][:, :steps].T)
+        scale = np.random.uniform(0.5, 1.5, size=(steps, 1))
+        actions = np.concatenate((
+            usage * scale * 0.5, usage * scale, usage * scale * 2),
+            axis=1).astype(int)
+        env.reset()
+        start = time.perf_counter()
+        for action in actions:
+            env.step(action)
+        total_time += time.perf_counter() - start
+        total_steps += steps
+    print(f"{len(containers)} containers, {total_steps} steps,"
+          f" formatted info: {formatted_info}")
+    print(f"SimEnv: {total_steps / total_time:.0f} steps/second")
@@ -0,0 +1,119 @@
+import time
+import logging
+
+import numpy as np
+
+from smart_vpa.envs import SimEnv
+
+logging.disable(logging.INFO)
+
+# ------------- sim env container switching test --------------
+# one SimEnv over many short containers (build_config format) must
+# step every container like a SimEnv of that container alone, then
+# the steps per second of one episode over all the containers against
+# making a SimEnv per container
+
+num_containers = 500
+min_timesteps = 2
+max_timesteps = 60
+seed = 100
+
+np.random.seed(seed)
+containers = []
+for i in range(num_containers):
+    timesteps = np.random.randint(min_timesteps, max_timesteps)
+    memory_request = float(np.random.randint(500, 3000))
+    cpu_request = float(np.random.randint(100, 1000))
+    containers.append({
+        'container_name': f'pod-{i}',
+        'requests': {'memory': memory_request, 'cpu': cpu_request},
+        'limits': {'memory': 2 * memory_request, 'cpu': 3 * cpu_request},
+        'workload': np.stack((
+            np.random.randint(200, 4000, size=timesteps),
+            np.random.randint(50, 1500, size=timesteps))),
+        'time': np.arange(timesteps) * 60,
+        'seed': seed,
+        'round-robin': True
+    })
+config = {key: [container[key] for container in containers]
+          for key in containers[0]}
+actions = [
+    np.concatenate((
+        workload.T * 0.5, workload.T * 1.2, workload.T * 2),
+        axis=1).astype(int)[:-1]
+    for workload in config['workload']]
+
+# ------------- same steps as one container envs --------------
+env = SimEnv(config)
+assert env.total_containers == num_containers
+env.reset()
+for i, container in enumerate(containers):
+    assert env.current_container == i
+    assert env.container_name == container['container_name']
+    single_env = SimEnv(container)
+    assert single_env.total_containers == 1
+    single_env.reset()
+    for action in actions[i]:
+        observation, _, _, _ = env.step(action)
+        single_observation, _, _, _ = single_env.step(action)
+        assert np.array_equal(observation, single_observation)
+# round robin back to the first container
+assert env.current_container == 0
+assert np.array_equal(env.requests, env.containers_requests[0])
+
+# ------------- reset in the middle of an episode --------------
+# the previous observation is the first timestep with the requests
+# from before the reset, the observation has the initial requests
+container = max(containers, key=lambda container: len(container['time']))
+single_env = SimEnv(container)
+single_env.reset()
+workload = container['workload']
+for step in range(20):
+    single_env.step(np.concatenate((
+        workload[:, step] * 0.5, workload[:, step] * 1.2,
+        workload[:, step] * 2)).astype(int))
+requests = single_env.requests.copy()
+assert not np.array_equal(requests, single_env.initial_requests)
+observation = single_env.reset()
+assert np.array_equal(single_env.prev_observation,
+                      np.concatenate((workload[:, 0], requests)))
+assert np.array_equal(observation, np.concatenate((
+    workload[:, 0], single_env.initial_requests)))
+assert np.array_equal(single_env.observation, observation)
+
+# ------------- list valued options of one container --------------
+# e.g. 'round-robin': [True] as an entry per container
+for round_robin in [[True], [False]]:
+    single_env = SimEnv(dict(container, **{'round-robin': round_robin}))
+    assert single_env.total_containers == 1
+    assert single_env.round_robin == round_robin[0]
+
+# ------------- validation of all the containers --------------
+bad_container = dict(containers[0])
+bad_container['limits'] = {'memory': 1.0, 'cpu': 1.0}
+try:
+    SimEnv({key: [container[key] for container in containers + [
+        bad_container]] for key in containers[0]})
+    raise AssertionError("limits below the requests must be rejected")
+except AssertionError as e:
+    assert 'must be smaller' in str(e)
+
+# ------------- steps per second --------------
+start = time.perf_counter()
+env = SimEnv(config)
+for container_actions in actions:
+    for action in container_actions:
+        env.step(action)
+switching_time = time.perf_counter() - start
+
+start = time.perf_counter()
+for container, container_actions in zip(containers, actions):
+    single_env = SimEnv(container)
+    for action in container_actions:
+        single_env.step(action)
+single_time = time.perf_counter() - start
+
+total_steps = sum(len(container_actions) for container_actions in actions)
+print(f"{num_containers} containers, {total_steps} steps")
+print(f"SimEnv per container: {total_steps / single_time:.0f} steps/second")
+print(f"one SimEnv:           {total_steps / switching_time:.0f} steps/second")
@@ -0,0 +1,104 @@
+import time
+import logging
+
+import numpy as np
+
+from smart_vpa.envs import SimEnv, VectorSimEnv
+
+logging.disable(logging.INFO)
+
+# ------------- vector sim env test --------------
+# every row of VectorSimEnv must follow the same observations,
+# requests, limits and recreations as a SimEnv of that container alone
+# under the same recommendations, then the steps per second of both
+
+num_containers = 64
+min_timesteps = 500
+max_timesteps = 2000
+seed = 100
+
+np.random.seed(seed)
+containers = []
+for i in range(num_containers):
+    timesteps = np.random.randint(min_timesteps, max_timesteps)
+    memory_request = float(np.random.randint(500, 3000))
+    cpu_request = float(np.random.randint(100, 1000))
+    containers.append({
+        'container_name': f'pod-{i}',
+        'requests': {'memory': memory_request, 'cpu': cpu_request},
+        'limits': {'memory': 2 * memory_request, 'cpu': 3 * cpu_request},
+        'workload': np.stack((
+            np.random.randint(200, 4000, size=timesteps),
+            np.random.randint(50, 1500, size=timesteps))),
+        'time': np.arange(timesteps) * 60,
+        'seed': seed,
+        'round-robin': bool(i % 2)
+    })
+config = {key: [container[key] for container in containers]
+          for key in containers[0]}
+
+
+def recommendations(usage: np.array) -> np.array:
+    """lower bound, target and upper bound around the usage"""
+    lower_bound = (usage * np.random.uniform(0.3, 1.0, usage.shape)).astype(int)
+    target = (usage * np.random.uniform(1.0, 1.5, usage.shape)).astype(int)
+    upper_bound = target * 2
+    return np.concatenate((lower_bound, target, upper_bound), axis=-1)
+
+
+envs = [SimEnv(container) for container in containers]
+vector_env = VectorSimEnv(config)
+observations = vector_env.vector_reset()
+for i, env in enumerate(envs):
+    assert np.array_equal(observations[i], env.reset())
+
+# stop before the end of the shortest workload, SimEnv switches
+# containers there
+num_steps = min_timesteps - 2
+for _ in range(num_steps):
+    actions = recommendations(observations[:, 0:2])
+    observations, rewards, dones, infos = vector_env.vector_step(actions)
+    assert not any(dones)
+    for i, env in enumerate(envs):
+        observation, reward, _, _ = env.step(actions[i])
+        assert np.array_equal(observations[i], observation)
+        assert rewards[i] == reward
+        assert infos[i]['recreated'] == env.recreation_flag
+        assert np.array_equal(vector_env.requests[i], env.requests)
+        assert np.array_equal(vector_env.limits[i], env.limits)
+        env.recreation_flag = False
+    assert np.array_equal(vector_env.wall_time, [
+        env.wall_time for env in envs])
+
+# ------------- end of the workloads --------------
+# not round robin containers are done at their last timestep and
+# round robin ones start over
+vector_env.vector_reset()
+for _ in range(max_timesteps):
+    _, _, dones, _ = vector_env.vector_step(
+        recommendations(vector_env.resource_usage_current))
+    for i in np.flatnonzero(dones):
+        assert not vector_env.round_robin[i]
+        assert vector_env.timestep[i] == vector_env.total_timesteps[i] - 1
+        vector_env.reset_at(i)
+assert np.all(vector_env.timestep < vector_env.total_timesteps)
+
+# ------------- steps per second --------------
+actions = recommendations(vector_env.vector_reset()[:, 0:2])
+start = time.perf_counter()
+for _ in range(num_steps):
+    vector_env.vector_step(actions)
+vector_time = time.perf_counter() - start
+
+for env in envs:
+    env.reset()
+start = time.perf_counter()
+for _ in range(num_steps):
+    for i, env in enumerate(envs):
+        env.step(actions[i])
+loop_time = time.perf_counter() - start
+
+total_steps = num_steps * num_containers
+print(f"{num_containers} containers, {num_steps} steps")
+print(f"SimEnv loop:  {total_steps / loop_time:.0f} steps/second")
+print(f"VectorSimEnv: {total_steps / vector_time:.0f} steps/second")
@@ -0,0 +1,114 @@
+import os
+import json
+import time
+import pickle
+import shutil
+import tempfile
+
+import numpy as np
+
+from smart_vpa.workload import WorkloadStore, write_store, merge_stores
+
+# ------------- workload store test --------------
+# the containers of a synthetic cluster are written once as
+# container.json/workload.pickle/time.pickle folders and once as a
+# workload store, loading every container back must give the same
+# configs and the store views must not copy the workloads
+
+num_namespaces = 4
+pods_per_namespace = 500
+max_timesteps = 24 * 60
+time_interval = 60
+seed = 100
+
+np.random.seed(seed)
+containers = []
+for n in range(num_namespaces):
+    for p in range(pods_per_namespace):
+        timesteps = np.random.randint(1, max_timesteps)
+        containers.append({
+            'namespace': f'namespace-{n}',
+            'container_name': f'pod-{p}',
+            'requests': {'memory': 2000.0, 'cpu': float(p)},
+            'limits': {'memory': 4000.0, 'cpu': 2.0 * p},
+            'workload': np.random.randint(0, 5000, size=(2, timesteps)),
+            'time': np.arange(timesteps) * time_interval
+        })
+
+path = tempfile.mkdtemp()
+try:
+    # ------------- one folder per container --------------
+    for container in containers:
+        pod_path = os.path.join(
+            path, 'folders', container['namespace'],
+            container['container_name'])
+        os.makedirs(pod_path)
+        with open(os.path.join(pod_path, 'container.json'), 'x') as f:
+            json.dump({key: container[key] for key in [
+                'container_name', 'requests', 'limits']}, f)
+        with open(os.path.join(pod_path, 'workload.pickle'), 'wb') as f:
+            pickle.dump(container['workload'], f)
+        with open(os.path.join(pod_path, 'time.pickle'), 'wb') as f:
+            pickle.dump(container['time'], f)
+    write_store(os.path.join(path, 'store'), containers)
+
+    start = time.perf_counter()
+    folder_configs = []
+    for container in containers:
+        pod_path = os.path.join(
+            path, 'folders', container['namespace'],
+            container['container_name'])
+        with open(os.path.join(pod_path, 'container.json')) as f:
+            config = json.loads(f.read())
+        with open(os.path.join(pod_path, 'workload.pickle'), 'rb') as f:
+            config['workload'] = pickle.load(f)
+        with open(os.path.join(pod_path, 'time.pickle'), 'rb') as f:
+            config['time'] = pickle.load(f)
+        folder_configs.append(config)
+    folders_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    store = WorkloadStore(os.path.join(path, 'store'))
+    store_configs = [store.container(i) for i in range(len(store))]
+    store_time = time.perf_counter() - start
+
+    assert len(store) == len(containers)
+    for container, folder_config, store_config in zip(
+            containers, folder_configs, store_configs):
+        assert store_config['namespace'] == container['namespace']
+        for key in ['container_name', 'requests', 'limits']:
+            assert store_config[key] == folder_config[key]
+        for key in ['workload', 'time']:
+            assert store_config[key].dtype == folder_config[key].dtype
+            assert np.array_equal(store_config[key], folder_config[key])
+        # zero copy views of the memory mapped files
+        assert np.shares_memory(store_config['workload'], store.usage)
+        assert np.shares_memory(store_config['time'], store.timestamps)
+
+    indices = store.find(namespace='namespace-2', container_name='pod-7')
+    assert indices == [2 * pods_per_namespace + 7]
+    assert len(store.find(namespace='namespace-1')) == pods_per_namespace
+    assert len(store.find(container_name='pod-3')) == num_namespaces
+    del store, store_configs
+
+    # ------------- empty stores --------------
+    # e.g. a namespace without pods or merging no partitions
+    write_store(os.path.join(path, 'empty'), [])
+    merge_stores([], os.path.join(path, 'merged-empty'))
+    merge_stores([os.path.join(path, 'empty'), os.path.join(path, 'store')],
+                 os.path.join(path, 'merged'))
+    for empty_path in ['empty', 'merged-empty']:
+        empty = WorkloadStore(os.path.join(path, empty_path))
+        assert len(empty) == 0
+        assert empty.usage.shape == (2, 0)
+        del empty
+    merged = WorkloadStore(os.path.join(path, 'merged'))
+    assert len(merged) == len(containers)
+    assert np.array_equal(merged.workload(3), containers[3]['workload'])
+    del merged
+finally:
+    shutil.rmtree(path)
+
+print(f"{len(containers)} containers")
+print(f"container folders: {folders_time:.3f} seconds")
+print(f"workload store:    {store_time:.3f} seconds")
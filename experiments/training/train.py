@@ -148,7 +148,7 @@ def learner(*, config_file_path: str, config: Dict[str, Any],
 @click.option('--config-file', type=str, default='A2C')
 @click.option('--series', required=True, type=int, default=71)
 @click.option('--type-env', required=True,
-              type=click.Choice(['sim', 'kube']),
+              type=click.Choice(['sim', 'kube', 'vector_sim']),
               default='sim')
 @click.option('--workload-id', required=True, type=int, default=1)
 @click.option('--workload-type', required=True,
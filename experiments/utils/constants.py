@@ -1,7 +1,8 @@
 import os
 from smart_vpa.envs import (
     SimEnv,
-    KubeEnv
+    KubeEnv,
+    VectorSimEnv
 )
 # from smart_scheduler.envs import (
 #     SimEdgeEnv,
@@ -35,5 +36,6 @@ FINAL_STATS_PATH = os.path.join(
 
 ENVS = {
     'sim': SimEnv,
-    'kube': KubeEnv
+    'kube': KubeEnv,
+    'vector_sim': VectorSimEnv
 }
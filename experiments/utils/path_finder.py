@@ -8,6 +8,8 @@ import pickle
 import sys
 import numpy as np
 from typing import List, Union, Any, Dict
+from smart_vpa.workload import WorkloadStore
+from smart_vpa.workload.store import STORE_PATH_KEY, STORE_INDEX_KEY
 
 # get an absolute path to the directory that contains parent files
 project_dir = os.path.dirname(os.path.join(os.getcwd(), __file__))
@@ -32,6 +34,46 @@ def transform(
 
 
 
+def load_container(container_path: str) -> Dict[str, Any]:
+    """load the container.json, workload.pickle and time.pickle
+    of a container folder
+    """
+    config: dict = {}
+    workload: np.array = np.array([])
+    time: np.array = np.array([])
+    # load container config
+    # container initial requests and limits
+    container_file_path = os.path.join(
+        container_path, "container.json")
+    try:
+        with open(container_file_path) as cf:
+            config = json.loads(cf.read())
+    except FileNotFoundError:
+        print(f"workload {container_path} does not have a container")
+
+    # load the workoad
+    workload_file_path = os.path.join(container_path, 'workload.pickle')
+    try:
+        with open(workload_file_path, 'rb') as in_pickle:
+            workload = pickle.load(in_pickle)
+    except FileNotFoundError:
+        raise Exception(f"workload {container_path} does not exists")
+
+    # load the time array of the workload
+    time_file_path = os.path.join(container_path, 'time.pickle')
+    try:
+        with open(time_file_path, 'rb') as in_pickle:
+            time = pickle.load(in_pickle)
+    except FileNotFoundError:
+        raise Exception(
+            f"workload {container_path} does not have time array")
+
+    config.update({
+        'workload': workload,
+        'time': time})
+    return config
+
+
 def build_config(
     workload_id: int,
     seed: int,
@@ -41,62 +83,74 @@ def build_config(
     workload_full_path=""
     ) -> List[Dict[str, Any]]:
 
-    if workload_type=='synthetic':
-        workload_path = os.path.join(
-            WORKLOADS_PATH, workload_type, str(workload_id))
-    elif workload_type=='arabesque':
-        workload_path = os.path.join(
-            WORKLOADS_PATH, workload_type, workload_full_path)
+    if workload_type=='arabesque':
+        return build_config_from_store(
+            seed=seed,
+            round_robin=round_robin,
+            workload_bunch=workload_bunch,
+            workload_full_path=workload_full_path)
+
+    workload_path = os.path.join(
+        WORKLOADS_PATH, workload_type, str(workload_id))
 
     workloads_path = sorted(os.listdir(workload_path))
     workloads_path.remove('.DS_Store')
     workloads_path_selected = workloads_path[0:workload_bunch]
     workloads_path_selected = list(
         map(
-            lambda a: os.path.join(workload_path, a), workloads_path))
+            lambda a: os.path.join(workload_path, a),
+            workloads_path_selected))
 
     # workloads = []
     # times = []
     configs = []
     for workload_path in workloads_path_selected:
-        config: dict = {}
-        workload: np.array = np.array([])
-        time: np.array = np.array([])
-        # load container config
+        config = load_container(workload_path)
+        config.update({
+            'seed': seed,
+            'round-robin': round_robin})
+        configs.append(config)
+    
+    trans_config = transform(configs)
+
+    return trans_config
+
+
+def build_config_from_store(
+    seed: int,
+    round_robin: bool,
+    workload_bunch: int,
+    workload_full_path: str
+    ) -> Dict[str, List]:
+    """same as build_config for the containers of a workload store
+    workload_full_path: <cluster> or <cluster>/<namespace>
+
+    the config is lazy, it has the requests and limits of the
+    containers and their indices in the store but not their workloads,
+    the envs memory map the store and read the workloads when they
+    are used so the config stays small when it is copied to the
+    rollout workers
+    """
+    cluster, _, namespace = workload_full_path.partition('/')
+    store_path = os.path.join(WORKLOADS_PATH, 'arabesque-store', cluster)
+    store = WorkloadStore(store_path)
+    container_indices = sorted(
+        store.find(namespace=namespace or None),
+        key=lambda i: store.containers[i]['container_name'])
+    if not container_indices:
+        raise Exception(f"workload {workload_full_path} does not exists")
+
+    configs = []
+    for container_index in container_indices[0:workload_bunch]:
         # container initial requests and limits
-        container_file_path = os.path.join(
-            workload_path, "container.json")
-        try:
-            with open(container_file_path) as cf:
-                config = json.loads(cf.read())
-        except FileNotFoundError:
-            print(f"workload {workload_id} does not have a container")
-
-        # load the workoad
-        workload_file_path = os.path.join(workload_path, 'workload.pickle')
-        try:
-            with open(workload_file_path, 'rb') as in_pickle:
-                workload = pickle.load(in_pickle)
-        except FileNotFoundError:
-            raise Exception(f"workload {workload_id} does not exists")
-
-        # load the time array of the workload
-        time_file_path = os.path.join(workload_path, 'time.pickle')
-        try:
-            with open(time_file_path, 'rb') as in_pickle:
-                time = pickle.load(in_pickle)
-        except FileNotFoundError:
-            raise Exception(f"workload {workload_id} does not have time array")
-
-        # workloads.append(workload)
-        # times.append(time)
+        config = dict(store.containers[container_index])
         config.update({
-            'workload': workload,
             'seed': seed,
             'round-robin': round_robin,
-            'time': time})
+            STORE_INDEX_KEY: container_index})
         configs.append(config)
-    
+
     trans_config = transform(configs)
+    trans_config[STORE_PATH_KEY] = store_path
 
     return trans_config
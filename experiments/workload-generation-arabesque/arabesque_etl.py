@@ -0,0 +1,198 @@
+"""conversion of the containers of the arabesque etl outputs to the
+   format of the simulators and predictors, shared by the
+   gen_workload_* scripts
+
+   the namespaces are converted in a pool of processes, at most
+   2 * max_workers namespaces are handed out at a time and each one
+   is dropped from the dataset as soon as it is, so the converted
+   namespaces are never all kept in memory
+"""
+
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Callable, Iterator
+
+import numpy as np
+from matplotlib import pyplot as plt
+from smart_vpa.util import plot_workload
+from smart_vpa.workload import write_store
+
+# format of the datasets
+# dataset = {
+#     'namespace_name': {
+#         'pod_name': {
+#             'container_name': {
+#                 'timestamp': (num_timestamp,),
+#                 'workload': (evictable memory, non-evictable memory,
+#                              cpu) each np.array (num_timestamp, 1),
+#                 'limit': (memory, cpu) each np.array (num_timestamp, 1),
+#                 'request': (memory, cpu) each np.array
+#                            (num_timestamp, 1)
+#                 }
+#             }
+#         }
+#     }
+# the converted containers are written in the format of
+# smart_vpa.workload.store
+
+
+# input units
+# Memory in bytes
+# cpu in cores
+
+
+# output units
+# Memory in Megabytes
+# cpu in Millicores
+
+
+def convert_pod(container: Dict[str, Any]) -> Dict[str, Any]:
+    """workload, time, requests and limits of the container of a pod
+    """
+    # each pod contains a container main - based-on Argos
+    container = container['main']
+    # --------- get the timestamp ---------
+    # we have shifted all the time to zero
+    timestamps = container['timestamp']
+    # --------- get the workload - memory ---------
+    # sum up the evictable and non-evictable memory
+    # set nans to zero
+    # convert units from bytes to megabytes
+    workload_mem = np.nan_to_num(container['workload'][0]) +\
+        np.nan_to_num(container['workload'][1])
+    workload_mem = workload_mem / 1e6
+    workload_mem = workload_mem.astype(int)
+    workload_mem = np.squeeze(workload_mem)
+    # --------- get the workload - cpu ---------
+    # set negatives to zero
+    # convert units from cores to millicores
+    workload_cpu = container['workload'][2]
+    workload_cpu[np.where(workload_cpu < 0)[0]] = 0
+    workload_cpu *= 1000
+    workload_cpu = workload_cpu.astype(int)
+    workload_cpu = np.squeeze(workload_cpu)
+    # --------- stack mem and cpu workloads ---------
+    workload = np.stack((workload_mem, workload_cpu))
+    # --------- fetch requests and limit memory ---------
+    request_memory = np.nan_to_num(container['request'][0])
+    request_memory /= 1e6
+    request_memory = request_memory.astype(int)
+    request_memory = request_memory.max()
+    limit_memory = np.nan_to_num(container['limit'][0])
+    limit_memory /= 1e6
+    limit_memory = limit_memory.astype(int)
+    limit_memory = limit_memory.max()
+    # --------- fetch requests and limit cpu ---------
+    request_cpu = np.nan_to_num(container['request'][1]).max()
+    request_cpu *= 1000
+    limit_cpu = np.nan_to_num(container['limit'][1]).max()
+    limit_cpu *= 1000
+    # --------- info ---------
+    return {
+        'requests': {
+            'memory': float(request_memory),
+            'cpu': float(request_cpu)
+        },
+        'limits': {
+            'memory': float(limit_memory),
+            'cpu': float(limit_cpu)
+        },
+        'workload': workload,
+        'time': timestamps
+    }
+
+
+def convert_namespace(namespace: str,
+                      pods: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """the converted containers of the pods of a namespace in the
+    format of write_store"""
+    return [
+        dict(convert_pod(container),
+             namespace=namespace, container_name=pod_name)
+        for pod_name, container in pods.items()]
+
+
+def convert_pods(namespace: str, pods: Dict[str, Any]) -> Dict[str, Any]:
+    """the converted containers of the pods of a namespace by pod
+    name"""
+    return {pod_name: convert_pod(container)
+            for pod_name, container in pods.items()}
+
+
+def save_figures(containers: List[Dict[str, Any]], figures_path: str):
+    """one figure of the workload, requests and limits per container
+    in figures_path/namespace/pod_name.png"""
+    # no display in the worker processes
+    plt.switch_backend('Agg')
+    for container in containers:
+        namespace_figures_path = os.path.join(
+            figures_path, container['namespace'])
+        if not os.path.exists(namespace_figures_path):
+            os.makedirs(namespace_figures_path)
+        fig = plot_workload(
+            timestamps=container['time'],
+            workload=container['workload'],
+            request_cpu=container['requests']['cpu'],
+            limit_cpu=container['limits']['cpu'],
+            request_memory=container['requests']['memory'],
+            limit_memory=container['limits']['memory'])
+        fig.savefig(os.path.join(
+            namespace_figures_path, f"{container['container_name']}.png"))
+        plt.close(fig)
+
+
+def write_namespace(namespace: str, pods: Dict[str, Any], parts_path: str,
+                    figures_path: str = None) -> str:
+    """convert the pods of a namespace to a workload store in
+    parts_path/namespace and optionally save their figures, returns
+    the path of the store"""
+    containers = convert_namespace(namespace, pods)
+    path = os.path.join(parts_path, namespace)
+    write_store(path, containers)
+    if figures_path is not None:
+        save_figures(containers, figures_path)
+    return path
+
+
+def map_namespaces(dataset: Dict[str, Any], function: Callable,
+                   max_workers: int = None, **kwargs) -> Iterator[Any]:
+    """function(namespace, pods, **kwargs) of every namespace
+    of the dataset in a pool of processes, the results are yielded in
+    the order of the namespaces and the throughput is reported as they
+    finish, the namespaces are removed from the dataset
+
+    Args:
+        dataset (Dict[str, Any]): etl output of a cluster
+        function (Callable): module level function (it is pickled)
+        max_workers (int): number of processes, default number of cpus
+    """
+    max_workers = max_workers or os.cpu_count()
+    total_namespace_count = len(dataset)
+    total_pod_count = 0
+    done_namespace_count = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        window = deque()
+        while dataset or window:
+            # keep a bounded number of namespaces in flight
+            while dataset and len(window) < 2 * max_workers:
+                namespace = next(iter(dataset))
+                pods = dataset.pop(namespace)
+                window.append((namespace, len(pods), executor.submit(
+                    function, namespace, pods, **kwargs)))
+                del pods
+            namespace, pod_count, future = window.popleft()
+            result = future.result()
+            total_pod_count += pod_count
+            elapsed = time.perf_counter() - start
+            done_namespace_count += 1
+            print(f"namespace {namespace} ({done_namespace_count} out of"
+                  f" {total_namespace_count}) with {pod_count} pods,"
+                  f" {total_pod_count / elapsed:.1f} pods/s")
+            yield result
+    elapsed = time.perf_counter() - start
+    print(f"{total_pod_count} pods of {total_namespace_count} namespaces"
+          f" in {elapsed:.1f} seconds,"
+          f" {total_pod_count / max(elapsed, 1e-9):.1f} pods/s")
@@ -1 +1,2 @@
 from .gcp_monitoring_query import MonitoringQuery # noqa
+from .gcp_exporter import MetricsExporter # noqa
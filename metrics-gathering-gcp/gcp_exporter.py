@@ -0,0 +1,172 @@
+"""
+    Incremental export of the container metrics of GCP to workload
+    stores, one store per namespace and day in the format of the
+    simulators and predictors (same as the arabesque workload stores).
+
+
+    An example is provided below
+    >>> mq = MonitoringQuery(project_id='project_name')
+    >>> exporter = MetricsExporter(mq, path='data/workloads/gcp-store')
+    >>> exporter.export(namespace='default', days_back=30, max_workers=16)
+    running it again the next day only fetches the new day, the
+    partitions of a namespace can be merged into one store with
+    >>> exporter.merge(namespace='default', path='merged-store')
+"""
+import os
+import json
+import shutil
+import datetime
+import logging
+import pandas as pd
+
+from typing import List, Dict, Any
+from dateutil import parser
+from smart_vpa.workload import write_store, merge_stores
+
+from .gcp_monitoring_query import MonitoringQuery, CONTAINER_METRICS
+
+# last exported timestamp of each (namespace, metric)
+STATE_FILE = "export_state.json"
+DAY_FORMAT = "%Y-%m-%d"
+
+# ================================================================
+#           Exporter
+# ================================================================
+
+
+class MetricsExporter:
+    def __init__(
+        self, query: MonitoringQuery, path: str, logger: object = None
+    ):
+        """
+        The metrics of each namespace are fetched one day at a time
+        and written to path/namespace/YYYY-MM-DD as a workload store,
+        only complete days (UTC) are exported so the partitions never
+        change once written. The state file keeps the last exported
+        timestamp per (namespace, metric) and is updated after each
+        partition, an interrupted export continues from the last
+        written day.
+
+        output units
+            Memory in Megabytes
+            cpu in Millicores
+            time in seconds since the epoch
+        """
+        self.query = query
+        self.path = path
+        self.logger = (
+            logger if logger is not None else logging.getLogger("__Exporter__")
+        )
+
+    def load_state(self) -> Dict[str, Dict[str, str]]:
+        state_path = os.path.join(self.path, STATE_FILE)
+        if not os.path.exists(state_path):
+            return {}
+        with open(state_path, "r") as in_file:
+            return json.load(in_file)
+
+    def _save_state(self, state: Dict[str, Dict[str, str]]):
+        # replace the state file at once so it is never partly written
+        state_path = os.path.join(self.path, STATE_FILE)
+        with open(state_path + ".tmp", "w") as out_file:
+            json.dump(state, out_file, indent=4)
+        os.replace(state_path + ".tmp", state_path)
+
+    def export(
+        self,
+        namespace: str = "default",
+        days_back: int = 30,
+        date_to: str = None,
+        metrics: List[str] = CONTAINER_METRICS,
+        **kwargs,
+    ) -> List[str]:
+        """
+        Export the complete days after the last exported timestamp of
+        the metrics (or the last days_back days on the first export) up
+        to date_to (default now), kwargs are passed to
+        MonitoringQuery.get_metrics (e.g. max_workers).
+
+        Returns the folders of the written partitions.
+        """
+        if not os.path.exists(self.path):
+            os.makedirs(self.path)
+        date_to = (
+            parser.parse(date_to) if date_to is not None
+            else datetime.datetime.utcnow()
+        )
+        # only complete days
+        last_day = pd.Timestamp(date_to).floor("D")
+        first_day = last_day - pd.Timedelta(days=days_back)
+        state = self.load_state()
+        exported = state.get(namespace, {})
+        # a metric that is new to the namespace starts from days_back
+        start = min(
+            pd.Timestamp(parser.parse(exported[metric])).floor("D")
+            if metric in exported else first_day
+            for metric in metrics
+        )
+        partitions = []
+        days = pd.date_range(
+            start, last_day - pd.Timedelta(days=1), freq="D")
+        for day in days:
+            day_end = day + pd.Timedelta(days=1)
+            df = self.query.get_metrics(
+                metrics=metrics,
+                date_from=day.isoformat(),
+                date_to=day_end.isoformat(),
+                resource_labels=["pod_name", "container_name"],
+                namespace=namespace,
+                **kwargs,
+            )
+            containers = self.query.to_containers(df)
+            if containers:
+                partitions.append(
+                    self._write_partition(namespace, day, containers))
+            else:
+                self.logger.info(
+                    f"No samples of {namespace} on {day:{DAY_FORMAT}}")
+            exported.update({
+                metric: day_end.strftime("%Y-%m-%dT%H:%M:%S")
+                for metric in metrics
+            })
+            state[namespace] = exported
+            self._save_state(state)
+        return partitions
+
+    def partitions(self, namespace: str) -> List[str]:
+        """ Folders of the exported days of a namespace in order """
+        namespace_path = os.path.join(self.path, namespace)
+        if not os.path.exists(namespace_path):
+            return []
+        return [
+            os.path.join(namespace_path, day)
+            for day in sorted(os.listdir(namespace_path))
+            if not day.endswith(".tmp")
+        ]
+
+    def merge(self, namespace: str, path: str):
+        """ Merge the exported days of a namespace into one store """
+        merge_stores(self.partitions(namespace), path)
+
+    def _write_partition(
+        self,
+        namespace: str,
+        day: pd.Timestamp,
+        containers: List[Dict[str, Any]],
+    ) -> str:
+        """Write the store of a day to a temporary folder first and
+        move it in place, a rerun of the day replaces it."""
+        partition_path = os.path.join(
+            self.path, namespace, f"{day:{DAY_FORMAT}}")
+        tmp_path = partition_path + ".tmp"
+        if os.path.exists(tmp_path):
+            shutil.rmtree(tmp_path)
+        write_store(tmp_path, containers)
+        if os.path.exists(partition_path):
+            shutil.rmtree(partition_path)
+        os.replace(tmp_path, partition_path)
+        self.logger.info(
+            f"Exported {len(containers)} containers of {namespace}"
+            f" on {day:{DAY_FORMAT}}"
+        )
+        return partition_path
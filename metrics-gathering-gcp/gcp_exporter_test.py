@@ -0,0 +1,133 @@
+import os
+import json
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from smart_vpa.workload import WorkloadStore
+from gcp_monitoring_query_test import (
+    StubClient,
+    StubQuery,
+    load_package,
+    make_query
+)
+
+# ------------- gcp exporter test --------------
+# MetricsExporter.export against the stub of the monitoring query and
+# client of gcp_monitoring_query_test, the first export writes one
+# partition per complete day of days_back and the state file, a rerun
+# on the same day fetches nothing, the next day fetches one partition,
+# a metric new to the namespace starts again from days_back and the
+# partitions merge into one store
+
+# value of each metric of the stub (bytes, fraction of the requested
+# cores and cores)
+metric_values = {
+    'kubernetes.io/container/memory/used_bytes': 2e8,
+    'kubernetes.io/container/cpu/request_utilization': 0.5,
+    'kubernetes.io/container/cpu/request_cores': 0.25,
+    'kubernetes.io/container/cpu/limit_cores': 1.0,
+    'kubernetes.io/container/memory/request_bytes': 5e8,
+    'kubernetes.io/container/memory/limit_bytes': 1e9
+}
+
+
+class ContainerQuery(StubQuery):
+    """samples of a container in the units of the monitoring api"""
+
+    def value(self, date, pod):
+        return metric_values.get(self.metric_type, 1.0) * (pod + 1)
+
+
+queries_per_day = 8
+namespace = 'default'
+options = {'namespace': namespace, 'days_back': 2, 'freq': '3h',
+           'max_workers': 4}
+
+if __name__ == "__main__":
+    package = load_package()
+    module = package.gcp_exporter
+    metrics = module.CONTAINER_METRICS
+    path = tempfile.mkdtemp()
+    try:
+        # ------------- first export --------------
+        # a query fails twice and is retried
+        failed = ('kubernetes.io/container/cpu/request_utilization',
+                  pd.Timestamp('2021-06-11T03:00:00Z'))
+        client = StubClient(failures={failed: 2})
+        mq = make_query(package, 'exporter', client,
+                        query_class=ContainerQuery)
+        exporter = package.MetricsExporter(mq, path=path)
+        # only the complete days before date_to
+        partitions = exporter.export(date_to='2021-06-12T10:30:00',
+                                     **options)
+        assert client.total_calls == 2 * len(metrics) * queries_per_day + 2
+        assert [os.path.basename(partition) for partition in partitions] \
+            == ['2021-06-10', '2021-06-11']
+        assert exporter.partitions(namespace) == partitions
+        assert exporter.load_state() == {namespace: {
+            metric: '2021-06-12T00:00:00' for metric in metrics}}
+        with open(os.path.join(path, module.STATE_FILE), 'r') as in_file:
+            assert json.load(in_file) == exporter.load_state()
+        for partition in partitions:
+            store = WorkloadStore(partition)
+            day = pd.Timestamp(os.path.basename(partition), tz='UTC')
+            assert len(store) == 3
+            for i in range(len(store)):
+                container = store.container(i)
+                pod = int(container['container_name'].split('_')[0][4:])
+                # a sample per minute of the day
+                assert np.array_equal(
+                    container['time'],
+                    day.value // 10**9 + np.arange(24 * 60) * 60)
+                assert np.all(container['workload'][0] == 200 * (pod + 1))
+                assert np.all(container['workload'][1] ==
+                              int(0.5 * 0.25 * 1000 * (pod + 1) ** 2))
+                assert container['requests'] == {
+                    'memory': 500.0 * (pod + 1), 'cpu': 250.0 * (pod + 1)}
+                assert container['limits'] == {
+                    'memory': 1000.0 * (pod + 1),
+                    'cpu': 1000.0 * (pod + 1)}
+
+        # ------------- same day rerun --------------
+        client.calls.clear()
+        assert exporter.export(date_to='2021-06-12T23:59:00',
+                               **options) == []
+        assert client.total_calls == 0
+
+        # ------------- next day --------------
+        partitions = exporter.export(date_to='2021-06-13T01:00:00',
+                                     **options)
+        assert [os.path.basename(partition) for partition in partitions] \
+            == ['2021-06-12']
+        assert client.total_calls == len(metrics) * queries_per_day
+        assert len(exporter.partitions(namespace)) == 3
+
+        # ------------- new metric --------------
+        client.calls.clear()
+        new_metrics = metrics + ['container:uptime']
+        partitions = exporter.export(date_to='2021-06-13T01:00:00',
+                                     metrics=new_metrics, **options)
+        # the days_back days before 2021-06-13 are fetched again
+        assert [os.path.basename(partition) for partition in partitions] \
+            == ['2021-06-11', '2021-06-12']
+        assert client.total_calls == \
+            2 * len(new_metrics) * queries_per_day
+        assert exporter.load_state()[namespace] == {
+            metric: '2021-06-13T00:00:00' for metric in new_metrics}
+        assert len(exporter.partitions(namespace)) == 3
+
+        # ------------- merge --------------
+        merged_path = os.path.join(path, 'merged')
+        exporter.merge(namespace=namespace, path=merged_path)
+        merged = WorkloadStore(merged_path)
+        assert len(merged) == 3
+        for i in range(len(merged)):
+            time = merged.time(i)
+            assert len(time) == 3 * 24 * 60
+            assert np.all(np.diff(time) == 60)
+    finally:
+        shutil.rmtree(path)
+    print("exported 3 days of 3 containers, merged into one store")
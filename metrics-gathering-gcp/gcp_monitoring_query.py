@@ -19,16 +19,74 @@
     resource_labels = ['pod_name','container_name']
     df = mq.get_metric(metrics=metrics,)
 
+    the (metric, 3-hour range) queries can be run by a pool of threads
+    >>> df = mq.get_metrics(metrics=metrics, days_back=30, max_workers=16)
 """
+import time
+import random
 import datetime
+import threading
 import numpy as np
 import logging
 import pandas as pd
 
-from typing import List
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Iterator, Tuple, Dict, Any
 from dateutil import parser
+from google.api_core import exceptions
 from google.cloud.monitoring_v3 import MetricServiceClient, query
 
+# read requests quota of the monitoring api is 6000 per minute per project
+MAX_REQUESTS_PER_SECOND = 100
+# errors of a query that are worth another try
+RETRYABLE_ERRORS = (
+    exceptions.TooManyRequests,
+    exceptions.ResourceExhausted,
+    exceptions.ServiceUnavailable,
+    exceptions.DeadlineExceeded,
+    exceptions.InternalServerError,
+)
+# metrics of to_containers, usage then requests and limits
+CONTAINER_METRICS = [
+    "container:mem_used_bytes",
+    "container:cpu_usage",
+    "container:cores",
+    "container:limit_cores",
+    "container:mem_request",
+    "container:mem_limit",
+]
+
+
+class RateLimiter:
+    """Spaces out the calls of all the threads that share it to at
+    most rate calls per second."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._next_call = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_call - now
+            self._next_call = max(now, self._next_call) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+# one limiter per project, the quota is per project
+_RATE_LIMITERS = {}
+_RATE_LIMITERS_LOCK = threading.Lock()
+
+
+def get_rate_limiter(project_id: str, rate: float) -> RateLimiter:
+    with _RATE_LIMITERS_LOCK:
+        if project_id not in _RATE_LIMITERS:
+            _RATE_LIMITERS[project_id] = RateLimiter(rate)
+        return _RATE_LIMITERS[project_id]
+
 # ================================================================
 #           Wrapper
 # ================================================================
@@ -45,6 +103,7 @@ class MonitoringQuery:
         "container": {
             "cores": "kubernetes.io/container/cpu/request_cores",
             "cpu_usage": "kubernetes.io/container/cpu/request_utilization",
+            "limit_cores": "kubernetes.io/container/cpu/limit_cores",
             "mem_limit": "kubernetes.io/container/memory/limit_bytes",
             "mem_limit_usage":
             "kubernetes.io/container/memory/limit_utilization",
@@ -75,13 +134,32 @@ class MonitoringQuery:
         },
     }
 
-    def __init__(self, project_id: str, logger: object = None):
+    def __init__(
+        self,
+        project_id: str,
+        logger: object = None,
+        client: object = None,
+        requests_per_second: float = MAX_REQUESTS_PER_SECOND,
+        max_retries: int = 5,
+        backoff: float = 1.0,
+    ):
+        """
+        client is a MetricServiceClient by default, a stub of it can
+        be given for testing. The queries of all the MonitoringQuery
+        of a project are limited to requests_per_second together, a
+        query failing with a retryable error is tried again up to
+        max_retries times, waiting backoff * 2^attempt seconds (with
+        jitter) in between.
+        """
         self.project_id = project_id
-        self.client = MetricServiceClient()
+        self.client = client if client is not None else MetricServiceClient()
         self.logger = (
             logger if logger is not None else logging.getLogger("__Resource__")
         )
         self.namespace = None
+        self.rate_limiter = get_rate_limiter(project_id, requests_per_second)
+        self.max_retries = max_retries
+        self.backoff = backoff
 
     @property
     def resource_type(self):
@@ -113,10 +191,17 @@ class MonitoringQuery:
         align_type: str = "ALIGN_MAX",
         align_period: int = 1,
         freq: str = "3H",
+        max_workers: int = 1,
+        concat_chunk: int = 64,
     ):
         """
         # see e.g. https://stackoverflow.com/questions/63279239/ ...
         #          clarification-riegarding-difference-between-align-mean-and-align-sum-in-google-cl
+
+        One query per (metric, freq range), run one by one or with
+        max_workers threads. The results are merged in the order of the
+        queries, concat_chunk of them at a time with their empty rows
+        dropped, so the whole set of unstacked results is never kept.
         """
         self.namespace = namespace
         if not isinstance(metrics, list):
@@ -140,27 +225,85 @@ class MonitoringQuery:
             (parser.parse(_ranges[i]), parser.parse(_ranges[i + 1]))
             for i in range(len(_ranges) - 1)
         ]
-        queries = [
-            self._get_query(
-                x, namespace, y[0], y[1], align_type, align_period, days_back
+        # each query with the metric it is labeled with
+        jobs = [
+            (
+                self._get_query(
+                    x, namespace, y[0], y[1], align_type, align_period,
+                    days_back
+                ),
+                metric,
             )
-            for x in _metrics
+            for metric, x in zip(metrics, _metrics)
             for y in ranges
         ]
         # add labels to the query and exec
-        # note this will be slow, in order to speed up recomend to chunk it
-        # and throw it in with any concurrent tricks you prefer
-        # for now i just limit
-        dfs = [
-            self._get_result(x, y, resource_labels)
-            for x, y in zip(queries, *[metrics * len(ranges)])
-        ]
+        dfs = self._get_results(jobs, resource_labels, max_workers)
         # process results
-        merged = pd.concat(dfs)
+        chunks = []
+        chunk = []
+        for df in dfs:
+            chunk.append(df)
+            if len(chunk) == concat_chunk:
+                chunks.append(
+                    pd.concat(chunk).dropna(axis="rows", thresh=1))
+                chunk = []
+        if chunk:
+            chunks.append(pd.concat(chunk).dropna(axis="rows", thresh=1))
+        merged = pd.concat(chunks)
         # dropna
         merged = merged.dropna(axis="rows", thresh=1)
         return merged
 
+    def _get_results(
+        self,
+        jobs: List[Tuple[object, str]],
+        labels: List[str],
+        max_workers: int,
+    ) -> Iterator[pd.DataFrame]:
+        """Execute the (query, resource) jobs and yield their results
+        in the same order, with max_workers > 1 a bounded window of
+        queries is kept in flight in a pool of threads.
+        """
+        if max_workers <= 1:
+            for query_obj, resource in jobs:
+                yield self._get_result_with_retries(
+                    query_obj, resource, labels)
+            return
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            window = deque()
+            for query_obj, resource in jobs:
+                window.append(
+                    executor.submit(
+                        self._get_result_with_retries,
+                        query_obj, resource, labels
+                    )
+                )
+                if len(window) >= 2 * max_workers:
+                    yield window.popleft().result()
+            while window:
+                yield window.popleft().result()
+
+    def _get_result_with_retries(
+        self, query_obj: object, resource, labels: List[str]
+    ):
+        """_get_result within the rate limit of the project, retried
+        with exponential backoff on the retryable errors.
+        """
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.wait()
+            try:
+                return self._get_result(query_obj, resource, labels)
+            except RETRYABLE_ERRORS as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self.backoff * 2 ** attempt * (1 + random.random())
+                self.logger.warning(
+                    f"Query of {resource} failed ({e}),"
+                    f" retrying in {delay:.1f} seconds"
+                )
+                time.sleep(delay)
+
     def _get_result(self, query_obj: object, resource, labels: List[str]):
         """Execute a query and Returns the result.
 
@@ -207,30 +350,105 @@ class MonitoringQuery:
         q = q.align(align_type, minutes=align_period)
         return q
 
+    @staticmethod
+    def _aggregate_by_minute(df: pd.DataFrame) -> pd.DataFrame:
+        """Max of the samples of each name and minute of the result of
+        get_metrics, the index is (name, minute) sorted with the minutes
+        since the epoch as integers."""
+        dates = pd.DatetimeIndex(df.index.get_level_values("date"))
+        # only until minute
+        minutes = dates.round("min").to_numpy(
+            dtype="datetime64[m]").astype(np.int64)
+        _df = df.reset_index(drop=True)
+        _df = _df.groupby(
+            [np.asarray(df.index.get_level_values("name")), minutes],
+            sort=True
+        ).max()
+        _df.index.names = ["name", "minute"]
+        return _df
+
     def _process_result_df(self, df):
         """ Process resulting df by quantising using e.g. date """
         self.logger.info("Transform df to docs")
-        _df = pd.DataFrame.copy(df)
-        self.logger.info(f"Dropped NaN, Remain shape: {_df.shape}")
-        # only until minute
-        _df.reset_index(inplace=True)
-        _df.date = pd.to_datetime(_df.date).dt.round("min")
-        _df.date = pd.to_datetime(_df.date).dt.strftime("%Y-%m-%dT%H:%M:%SZ")
-        _df.set_index(["name", "date"], inplace=True)
-        _df.sort_index(inplace=True)
-        _df = _df.groupby(["name", "date"]).apply(max).reset_index()
+        _df = self._aggregate_by_minute(df).reset_index()
+        # format each distinct minute once
+        codes, minutes = pd.factorize(_df.pop("minute"))
+        dates = pd.to_datetime(minutes, unit="m").strftime(
+            "%Y-%m-%dT%H:%M:%SZ")
+        _df.insert(1, "date", np.asarray(dates)[codes])
         self.logger.info("Cleaning up ...")
-        _df = _df.replace({np.nan: None})
-        _df.rename(columns={"date": "timestamp"})
+        for column in _df.columns[2:]:
+            values = _df[column].to_numpy(dtype=object)
+            values[_df[column].isna().to_numpy()] = None
+            _df[column] = values
         return _df
 
     def to_docs(self, result_df):
         """ Format result df """
-        _df = pd.DataFrame.copy(result_df)
-        _df = self._process_result_df(_df)
+        _df = self._process_result_df(result_df)
         _df["project_id"] = self.project_id
         _df["namespace"] = self.namespace
-        return _df.to_dict(orient="records")
+        columns = list(_df.columns)
+        return [
+            dict(zip(columns, row))
+            for row in zip(*(_df[column].tolist() for column in columns))
+        ]
+
+    def to_containers(self, result_df) -> List[Dict[str, Any]]:
+        """Convert the result of get_metrics with the container metrics
+        mem_used_bytes, cpu_usage and cores (optionally limit_cores,
+        mem_request and mem_limit for the requests and limits) to
+        containers in the format of the simulators, the samples are
+        aligned to the minute.
+
+        output units
+            Memory in Megabytes
+            cpu in Millicores
+            time in seconds since the epoch
+        """
+        if result_df.empty:
+            return []
+        _df = self._aggregate_by_minute(result_df)
+        _df = _df.reindex(columns=CONTAINER_METRICS)
+        codes = _df.index.codes[0]
+        names = _df.index.levels[0]
+        time = _df.index.get_level_values("minute").to_numpy() * 60
+        values = _df.to_numpy(dtype=float)
+        # convert units from bytes to megabytes
+        memory = np.nan_to_num(values[:, 0]) / 1e6
+        # the usage is the fraction of the requested cores that is
+        # in use, convert units from cores to millicores
+        cpu = np.nan_to_num(values[:, 1] * values[:, 2]) * 1000
+        cpu[cpu < 0] = 0
+        workload = np.stack((memory, cpu)).astype(int)
+        # the rows of each container are contiguous
+        starts = np.flatnonzero(np.r_[True, np.diff(codes) != 0])
+        ends = np.r_[starts[1:], len(codes)]
+        # max of requests and limits (memory: megabytes, cpu: millicores)
+        resources = np.maximum.reduceat(
+            np.nan_to_num(values[:, 2:]), starts, axis=0
+        ) * [1000, 1000, 1 / 1e6, 1 / 1e6]
+        containers = []
+        for start, end, (
+            request_cpu, limit_cpu, request_memory, limit_memory
+        ) in zip(starts, ends, resources):
+            containers.append(
+                {
+                    "namespace": self.namespace,
+                    "container_name": names[codes[start]],
+                    "requests": {
+                        "memory": float(int(request_memory)),
+                        "cpu": float(request_cpu),
+                    },
+                    "limits": {
+                        "memory": float(int(limit_memory)),
+                        "cpu": float(limit_cpu),
+                    },
+                    "workload": workload[:, start:end],
+                    "time": time[start:end],
+                }
+            )
+        return containers
 
 # =================================================================================
 # Code for dealing with ElasticSearch which is unnecessary for now
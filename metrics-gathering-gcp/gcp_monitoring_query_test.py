@@ -0,0 +1,190 @@
+import os
+import sys
+import time
+import random
+import threading
+import importlib.util
+
+import pandas as pd
+from google.api_core import exceptions
+
+# get an absolute path to the directory of this package
+package_path = os.path.dirname(os.path.abspath(__file__))
+
+# ------------- gcp monitoring query test --------------
+# the queries of MonitoringQuery.get_metrics are run against a local
+# stub of the monitoring query and client (no request is sent), with
+# a pool of threads the results must come back in the order of the
+# queries, a query failing with a retryable error must be retried
+# until it succeeds and re-raised after max_retries, and the rate
+# limiter must space out the calls of all the threads
+
+
+def load_package():
+    """metrics-gathering-gcp as the metrics_gathering_gcp package"""
+    if 'metrics_gathering_gcp' in sys.modules:
+        return sys.modules['metrics_gathering_gcp']
+    spec = importlib.util.spec_from_file_location(
+        'metrics_gathering_gcp', os.path.join(package_path, '__init__.py'),
+        submodule_search_locations=[package_path])
+    package = importlib.util.module_from_spec(spec)
+    sys.modules['metrics_gathering_gcp'] = package
+    spec.loader.exec_module(package)
+    return package
+
+
+class StubClient:
+    """counts the queries of each (metric, start) and fails the first
+    failures[(metric, start)] of them with ServiceUnavailable"""
+
+    def __init__(self, failures=None):
+        self.failures = dict(failures or {})
+        self.calls = {}
+        self.lock = threading.Lock()
+
+    def call(self, key):
+        with self.lock:
+            self.calls[key] = self.calls.get(key, 0) + 1
+            if self.failures.get(key, 0) > 0:
+                self.failures[key] -= 1
+                raise exceptions.ServiceUnavailable('stub')
+
+    @property
+    def total_calls(self):
+        return sum(self.calls.values())
+
+
+def sample_value(metric: str, date: pd.Timestamp, pod: int) -> float:
+    """the value of a metric of a pod at a minute"""
+    return (sum(map(ord, metric)) + pod) * 1e6 + date.value // 60e9 % 1e6
+
+
+class StubQuery:
+    """the parts of monitoring_v3.query.Query used by MonitoringQuery,
+    one sample per minute for each of 3 pods"""
+
+    def __init__(self, client, project, days, metric_type):
+        self.client = client
+        self.metric_type = metric_type
+
+    def select_resources(self, **kwargs):
+        return self
+
+    def select_interval(self, end_time, start_time):
+        self.start_time = pd.Timestamp(start_time)
+        self.end_time = pd.Timestamp(end_time)
+        return self
+
+    def align(self, *args, **kwargs):
+        return self
+
+    def as_dataframe(self, labels):
+        # random latency so the queries finish out of order
+        time.sleep(random.uniform(0, 0.005))
+        self.client.call((self.metric_type, self.start_time))
+        dates = pd.date_range(
+            self.start_time, self.end_time - pd.Timedelta(minutes=1),
+            freq='min')
+        columns = pd.MultiIndex.from_tuples(
+            [(f'pod-{pod}', 'main') for pod in range(3)])
+        values = [[self.value(date, pod) for pod in range(3)]
+                  for date in dates]
+        return pd.DataFrame(values, index=dates, columns=columns)
+
+    def value(self, date, pod):
+        return sample_value(self.metric_type, date, pod)
+
+
+def make_query(package, project_id, client, query_class=StubQuery,
+               **kwargs):
+    """MonitoringQuery of the stub client and queries"""
+    module = package.gcp_monitoring_query
+    module.query = type('query', (), {'Query': query_class})
+    return module.MonitoringQuery(
+        project_id, client=client, requests_per_second=1000,
+        backoff=0.001, **kwargs)
+
+
+metrics = ['container:mem_used_bytes', 'container:cpu_usage',
+           'container:cores']
+query_options = {
+    'metrics': metrics,
+    'date_from': '2021-06-10T00:00:00',
+    'date_to': '2021-06-11T00:00:00',
+    'resource_labels': ['pod_name', 'container_name'],
+    'freq': '3h'
+}
+
+if __name__ == "__main__":
+    package = load_package()
+    module = package.gcp_monitoring_query
+
+    # ------------- in order results with a pool of threads --------------
+    client = StubClient()
+    mq = make_query(package, 'in-order', client)
+    serial = mq.get_metrics(**query_options)
+    num_queries = client.total_calls
+    assert num_queries == len(metrics) * 8
+    mq = make_query(package, 'in-order', StubClient())
+    jobs = [(StubQuery(mq.client, 'project', 1, mq.get_metric_mapping(
+        metric)).select_interval(end, start), metric)
+        for metric in metrics
+        for start, end in zip(
+            pd.date_range('2021-06-10', periods=8, freq='3h', tz='UTC'),
+            pd.date_range('2021-06-10 03:00', periods=8, freq='3h',
+                          tz='UTC'))]
+    results = list(mq._get_results(jobs, ['pod_name', 'container_name'],
+                                   max_workers=8))
+    assert len(results) == len(jobs)
+    for (job, metric), result in zip(jobs, results):
+        # labeled with the metric of its own query and its interval
+        assert list(result.columns) == [metric]
+        dates = result.index.get_level_values('date')
+        assert dates.min() == job.start_time
+        assert dates.max() == job.end_time - pd.Timedelta(minutes=1)
+        for (name, date), value in result[metric].items():
+            pod = int(name.split('_')[0].split('-')[1])
+            assert value == sample_value(job.metric_type, date, pod)
+    threaded = mq.get_metrics(max_workers=8, concat_chunk=5,
+                              **query_options)
+    pd.testing.assert_frame_equal(serial, threaded)
+
+    # ------------- retry then succeed --------------
+    failed = (module.MonitoringQuery.RESOURCE_MAPPING['container'][
+        'cpu_usage'], pd.Timestamp('2021-06-10T06:00:00Z'))
+    client = StubClient(failures={failed: 2})
+    mq = make_query(package, 'retries', client, max_retries=5)
+    retried = mq.get_metrics(max_workers=4, **query_options)
+    pd.testing.assert_frame_equal(serial, retried)
+    assert client.calls[failed] == 3
+    assert client.total_calls == num_queries + 2
+
+    # ------------- re-raised after max_retries --------------
+    client = StubClient(failures={failed: 100})
+    mq = make_query(package, 'raises', client, max_retries=2)
+    try:
+        mq.get_metrics(max_workers=4, **query_options)
+    except exceptions.ServiceUnavailable:
+        pass
+    else:
+        raise AssertionError('the failing query should be re-raised')
+    assert client.calls[failed] == 3
+
+    # ------------- rate limiter --------------
+    rate = 200
+    limiter = module.get_rate_limiter('rate-limit', rate)
+    assert module.get_rate_limiter('rate-limit', rate) is limiter
+    calls_per_thread = 25
+    start = time.perf_counter()
+    threads = [threading.Thread(target=lambda: [
+        limiter.wait() for _ in range(calls_per_thread)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    assert elapsed >= (4 * calls_per_thread - 1) / rate
+
+    print(f"{num_queries} queries, {len(serial)} rows")
+    print(f"rate limited to {rate}/s: {4 * calls_per_thread} calls"
+          f" in {elapsed:.2f} seconds")
@@ -1,2 +1,3 @@
 from .kube_env import KubeEnv # noqa
 from .sim_env import SimEnv # noqa
+from .vector_sim_env import VectorSimEnv # noqa
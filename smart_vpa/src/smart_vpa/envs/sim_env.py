@@ -4,6 +4,7 @@ from typing import (
     Dict,
     Any
 )
+import time
 import pprint
 import yaml
 
@@ -16,10 +17,18 @@ from colorama import (
 )
 
 from smart_vpa.util import logger
+from smart_vpa.loss_functions import Reward
 from smart_vpa.util.constants import LIMIT_RANGE
+from smart_vpa.workload import load_workloads
 
 pp = pprint.PrettyPrinter()
 
+# seconds between two logs of the container switches
+LOG_INTERVAL = 10
+
+# first window of the workload checked for a recreation in fast_forward
+FAST_FORWARD_WINDOW = 64
+
 
 class RecommenderSpace(Box):
     """The space class that is for generating values that are
@@ -56,12 +65,70 @@ class RecommenderSpace(Box):
         return False
 
 
+def make_spaces(limit_range_min: np.array, limit_range_max: np.array):
+    """Make the observation and action space of a container
+    observation space:
+
+     ram_usage cpu_usage ram_request cpu_request
+    [         |         |           |           ]
+
+    action space:
+
+     ram_lower_bound   cpu_lower_bound
+    [                |                |
+
+     ram_target   cpu_target
+    |           |            |
+
+     ram_higher_bound   cpu_higher_bound
+    |                 |                 ]
+
+    Units:
+
+    cpu units: milicores
+    memory units: megabytes
+    """
+    MIN = 0
+    MAX = 100000
+
+    # observation space
+    obs_lower_bound = np.concatenate((
+        np.array([MIN, MIN]),
+        limit_range_min))
+    obs_upper_bound = np.concatenate((
+        np.array([MAX, MAX]),
+        limit_range_max))
+    observation_space = Box(
+        low=obs_lower_bound, high=obs_upper_bound,
+        shape=(4,), dtype=np.float32)
+
+    # action space
+    act_lower_bound = np.array(
+        limit_range_min.tolist() * 3
+        )
+    act_upper_bound = np.array(
+        limit_range_max.tolist() * 3
+        )
+
+    # action_space = Box(
+    #     low=act_lower_bound, high=act_upper_bound,
+    #     shape=(6,), dtype=np.float32)
+    action_space = RecommenderSpace(
+        low=act_lower_bound, high=act_upper_bound,
+        shape=(6,), dtype=np.float32)
+    return observation_space, action_space
+
+
 class SimEnv(gym.Env):
     def __init__(self, config: Dict[str, Any]):
         """reads the initial configuration from the config file
 
         Args:
             config (Dict[str, Any]): [description]
+            optional 'formatted-info' (bool) to turn off the formatted
+            observation in the info of the steps. Defaults to True.
+            optional 'reward' (Dict) weights of the Reward of the steps,
+            without it the reward of every step is one.
         selfs:
             requests:
                 ram cpu
@@ -75,39 +142,9 @@ class SimEnv(gym.Env):
         super().__init__()
         # self._check_config(config)
         self.config = config
-        self.current_container = 0
-        self.total_containers = len(config['container_name'])
-        self.setup_next_container()
-
         # set up the seeds for reproducable resutls
-
-    def setup_next_container(self):
-        self.seed(self.config['seed'])
-        # np.random.seed(self.seed)
-        # self.np_random = seeding.np_random(self.seed)
-
-        # time variable (for computing clock time in simulation
-        # and reading metrics in the emulations)
-        self.time = self.config['time']
-
-        # container name
-        self.container_name: str = self.config['container_name']
-
-        # initail resource requests
-        self.initial_requests = np.zeros(2)
-        self.initial_requests[0] = self.config[
-            'requests']['memory']
-        self.initial_requests[1] = self.config[
-            'requests']['cpu']
-        self.requests = self.initial_requests.copy()
-
-        # initial resource limits
-        self.initial_limits = np.zeros(2)
-        self.initial_limits[0] = self.config[
-            'limits']['memory']
-        self.initial_limits[1] = self.config[
-            'limits']['cpu']
-        self.limits = self.initial_limits.copy()
+        self.seed(int(np.ravel(config['seed'])[0]))
+        self._pack_containers(config)
 
         # limit ranges
         self.limit_range_min = np.zeros(2)
@@ -122,35 +159,129 @@ class SimEnv(gym.Env):
         self.max_limit_request_ratio[1] = LIMIT_RANGE[
             'max_limit_request_ratio']['cpu']
 
-        # whether we want to end at the end of the workload
-        # or start over from the begining
-        self.round_robin: bool = self.config['round-robin']
+        # whether the step info has the formatted observation
+        self.formatted_info: bool = self._config_option(
+            'formatted-info', True)
 
-        # ratio of the request to limit
-        # (constant and stays the same during the experimetns)
-        self.limit_request_ratio =\
-            self.initial_limits/self.initial_requests
+        # reward of the slack, overrun and recreations of the steps
+        reward_weights = self._config_option('reward', None)
+        self.reward = None if reward_weights is None else Reward(
+            reward_weights)
 
         # initiate the observation and action space
         self.observation_space, self.action_space =\
             self._setup_space()
 
-        # kubernetes value checks
+        # kubernetes value checks of all the containers
         self._kubernetes_checks()
 
+        # the observation of the current timestep is computed once
+        # per step into this buffer
+        self._observation = np.zeros(4)
+        self._last_log_time = None
+        self.current_container = 0
+        self.setup_next_container()
+
+    def _config_option(self, key: str, default: Any) -> Any:
+        """an optional config entry of the env, the entry of the first
+        container is used for configs with one entry per container
+        """
+        value = self.config.get(key, default)
+        if isinstance(value, list):
+            value = value[0]
+        return value
+
+    def _pack_containers(self, config: Dict[str, Any]):
+        """pack the configs of the containers into arrays once so
+        switching containers is only an index change, config is either
+        one container or one list entry per container (build_config),
+        the workloads of a lazy config are views of its workload store
+        """
+        if isinstance(config['container_name'], str):
+            config = {key: [value] for key, value in config.items()}
+        self.container_names: List[str] = list(config['container_name'])
+        self.total_containers = len(self.container_names)
+
+        # initail resource requests and limits of the containers
+        #  ram cpu
+        # [   |   ]
+        #    ...
+        self.containers_requests = np.array([
+            [requests['memory'], requests['cpu']]
+            for requests in config['requests']], dtype=float)
+        self.containers_limits = np.array([
+            [limits['memory'], limits['cpu']]
+            for limits in config['limits']], dtype=float)
+
+        # ratio of the request to limit
+        # (constant and stays the same during the experimetns)
+        self.containers_limit_request_ratio =\
+            self.containers_limits/self.containers_requests
+
+        # whether we want to end at the end of the workload
+        # or start over from the begining
+        # (one entry for all of them or one per container, a single
+        # container config may have it as a list as well)
+        self.containers_round_robin = np.broadcast_to(
+            np.ravel(np.array(config['round-robin'], dtype=bool)),
+            (self.total_containers,))
+
+        # workloads and time arrays are kept as they are
+        # (e.g. views of a workload store) without copies
+        self.containers_workload: List[np.array]
+        self.containers_time: List[np.array]
+        self.containers_workload, self.containers_time =\
+            load_workloads(config)
+        for name, workload, timestamps in zip(
+                self.container_names, self.containers_workload,
+                self.containers_time):
+            assert workload.shape == (2, len(timestamps)), (
+                f"workload of container <{name}> must be of shape"
+                f" (2, {len(timestamps)}) got <{workload.shape}>")
+
+    def setup_next_container(self):
+        index = self.current_container
+
+        # time variable (for computing clock time in simulation
+        # and reading metrics in the emulations)
+        self.time = self.containers_time[index]
+
+        # container name
+        self.container_name: str = self.container_names[index]
+
+        # initail resource requests and limits
+        self.initial_requests = self.containers_requests[index]
+        self.initial_limits = self.containers_limits[index]
+        self.requests = self.initial_requests.copy()
+        self.limits = self.initial_limits.copy()
+        self.limit_request_ratio = self.containers_limit_request_ratio[index]
+        self.round_robin: bool = bool(self.containers_round_robin[index])
+
         # workload of resources usage
         # resource usage        timestep
         # ram (in megabayes) |    ...     |
         # cpu (in milicores) |    ...     |
-        self.workload: np.array = self.config['workload']
+        self.workload: np.array = self.containers_workload[index]
         self.total_timesteps = self.workload.shape[1]
         self.timestep = 0
         self.global_timestep = 0
-        self.prev_observation = self.observation.copy()
+        self._update_observation()
+        self.prev_observation = self._observation.copy()
         self.recreation_flag = False
         _ = self.reset()
+        self._log_container()
 
-        logger.info("container initialised!")
+    def _log_container(self):
+        """log the initial state of the container, at most once every
+        LOG_INTERVAL seconds when containers are switched quickly
+        """
+        now = time.monotonic()
+        if self._last_log_time is not None and\
+                now - self._last_log_time < LOG_INTERVAL:
+            return
+        self._last_log_time = now
+        logger.info(f"container {self.current_container + 1}"
+                    f"/{self.total_containers} initialised!")
         initial_observation = {
             'container_name': self.container_name,
             'requests': {
@@ -165,9 +296,6 @@ class SimEnv(gym.Env):
         logger.info(yaml.dump(initial_observation,
                               default_flow_style=False))
 
-
-
-
     def seed(self, seed):
         np.random.seed(seed)
         self.np_random, seed = seeding.np_random(seed)
@@ -182,10 +310,15 @@ class SimEnv(gym.Env):
         self.timestep = 0
         self.global_timestep = 0
         self.recreation_flag = False
-        self.prev_observation = self.observation.copy()
+        # the first timestep with the requests from before the reset
+        self._update_observation()
+        self.prev_observation[:] = self._observation
         self.requests = self.initial_requests.copy()
         self.limits = self.initial_limits.copy()
-        return self.observation
+        if self.reward is not None:
+            self.reward.reset()
+        self._update_observation()
+        return self._observation.copy()
 
     def step(self, action):
         """Run one timestep of the environment's dynamics. When end of
@@ -195,21 +328,107 @@ class SimEnv(gym.Env):
         """
         # assert self.action_space.contains(action),\
         #     f"action {action} out of action space {self.action_space}"
-        self.prev_observation = self.observation.copy()
+        self.prev_observation[:] = self._observation
         self.action = action
-        reward = self._calc_reward()
+        recreation_needed = self._recreation_needed
+        reward = self._calc_reward(recreation_needed)
         # recreate the pod if needed
         # (equivalent to taking a step in rl terminology)
-        if self._recreation_needed:
+        if recreation_needed:
             self.recreation_flag = True
             self._recreate()
-        self.global_timestep += 1
+        observation, done = self._advance(1)
+        return observation, reward, done, self.info
+
+    def fast_forward(self, action):
+        """Same as calling step with the same action until the pod is
+        recreated or the end of the workload is reached, for
+        recommenders with an action that does not change between the
+        recreations (e.g. Threshold). The recreation conditions are
+        checked over the rest of the workload at once so an episode
+        takes about one call per recreation.
+
+        Returns:
+            observation, reward and done of the last step and the info
+            with the number of 'steps' taken and the 'slack' and
+            'overrun' (ram, cpu) of the requests summed over the
+            timesteps of the steps
+        """
+        # steps until the last timestep of the workload
+        # where done can move to the next container
+        remaining = self.total_timesteps - 1 - self.timestep
+        if remaining < 1:
+            requests = np.array(self.requests, dtype=float)
+            usage = self._resource_usage_current[:, np.newaxis]
+            observation, reward, done, info = self.step(action)
+            steps = 1
+        else:
+            self.action = np.asarray(action)
+            steps, recreated = self._next_recreation(remaining)
+            usage = np.round(self.workload[
+                :, self.timestep:self.timestep + steps])
+            requests = np.array(self.requests, dtype=float)
+            reward = self._calc_rewards(usage, requests, recreated)
+            # skip to the timestep of the last step
+            self.global_timestep += steps - 1
+            self.timestep += steps - 1
+            self._update_observation()
+            self.prev_observation[:] = self._observation
+            if recreated:
+                self.recreation_flag = True
+                self._recreate()
+            observation, done = self._advance(1)
+            info = self.info
+        slack = requests[:, np.newaxis] - usage
+        info = dict(info, steps=steps,
+                    slack=np.maximum(slack, 0).sum(axis=1),
+                    overrun=np.maximum(-slack, 0).sum(axis=1))
+        return observation, reward, done, info
+
+    def _next_recreation(self, remaining: int):
+        """number of steps until and including the first one that
+        recreates the pod within the remaining steps, the workload is
+        checked in growing windows to not go over all of it for
+        close recreations
+
+        Returns:
+            steps and whether the last step recreates the pod
+        """
+        lower_bound = self.lower_bound[:, np.newaxis]
+        upper_bound = self.upper_bound[:, np.newaxis]
+        limits = np.asarray(self.limits)[:, np.newaxis]
+        start = 0
+        window = FAST_FORWARD_WINDOW
+        while start < remaining:
+            end = min(start + window, remaining)
+            usage = np.round(self.workload[
+                :, self.timestep + start:self.timestep + end])
+            recreation_needed = ~(
+                (lower_bound < usage).all(axis=0) &
+                (usage < upper_bound).all(axis=0) &
+                (usage < limits).all(axis=0))
+            recreations = np.flatnonzero(recreation_needed)
+            if recreations.size:
+                return start + recreations[0] + 1, True
+            start = end
+            window *= 2
+        return remaining, False
+
+    def _advance(self, steps: int):
+        """move the timestep forward and return the new observation
+        and done
+        """
+        self.global_timestep += steps
         if self.round_robin:
             self.timestep = self.global_timestep % self.total_timesteps
         else:
             self.timestep = self.global_timestep
-
-        return self.observation, reward, self.done, self.info
+        self._update_observation()
+        # done can move to the next container so the observation
+        # is taken before it
+        observation = self._observation.copy()
+        done = self.done
+        return observation, done
 
     def render(self, mode='human'):
         """Renders the environment.
@@ -237,56 +456,9 @@ class SimEnv(gym.Env):
 
     def _setup_space(self):
         """Make the observation and action space
-        observation space:
-
-         ram_usage cpu_usage ram_request cpu_request
-        [         |         |           |           ]
-
-        action space:
-
-         ram_lower_bound   cpu_lower_bound
-        [                |                |
-
-         ram_target   cpu_target
-        |           |            |
-
-         ram_higher_bound   cpu_higher_bound
-        |                 |                 ]
-
-        Units:
-
-        cpu units: milicores
-        memory units: megabytes
+        see make_spaces
         """
-        MIN = 0
-        MAX = 100000
-
-        # observation space
-        obs_lower_bound = np.concatenate((
-            np.array([MIN, MIN]),
-            self.limit_range_min))
-        obs_upper_bound = np.concatenate((
-            np.array([MAX, MAX]),
-            self.limit_range_max))
-        observation_space = Box(
-            low=obs_lower_bound, high=obs_upper_bound,
-            shape=(4,), dtype=np.float32)
-
-        # action space
-        act_lower_bound = np.array(
-            self.limit_range_min.tolist() * 3
-            )
-        act_upper_bound = np.array(
-            self.limit_range_max.tolist() * 3
-            )
-
-        # action_space = Box(
-        #     low=act_lower_bound, high=act_upper_bound,
-        #     shape=(6,), dtype=np.float32) 
-        action_space = RecommenderSpace(
-            low=act_lower_bound, high=act_upper_bound,
-            shape=(6,), dtype=np.float32)
-        return observation_space, action_space
+        return make_spaces(self.limit_range_min, self.limit_range_max)
 
     # def _check_config(self, config):
     #     """check if the config is in the correct format
@@ -324,12 +496,12 @@ class SimEnv(gym.Env):
     #                 f" got a <{type(value)}> instead")
 
     def _kubernetes_checks(self):
-        """Kubernetes value checks
+        """Kubernetes value checks of all the containers
         """
         # limits should not be greater than requests
-        assert np.alltrue(self.initial_requests <= self.initial_limits),\
-            (f"limits values <{self.initial_limits}> must be smaller than"
-             f" requests values <{self.initial_requests}>")
+        assert np.alltrue(self.containers_requests <= self.containers_limits),\
+            (f"limits values <{self.containers_limits}> must be smaller than"
+             f" requests values <{self.containers_requests}>")
 
         # check limit ranges logic
         assert np.alltrue(self.limit_range_min <= self.limit_range_max),\
@@ -340,39 +512,61 @@ class SimEnv(gym.Env):
              " must be greater than one")
 
         # check initial request and limits against the limit ranges
-        assert np.alltrue(self.initial_requests >= self.limit_range_min),\
-            (f"initial requests  <{self.initial_requests}> must be "
+        assert np.alltrue(self.containers_requests >= self.limit_range_min),\
+            (f"initial requests  <{self.containers_requests}> must be "
              f" greater than the min limit range <{self.limit_range_min}>")
-        assert np.alltrue(self.initial_requests <= self.limit_range_max),\
-            (f"initial requests <{self.initial_requests}> must be smaller"
+        assert np.alltrue(self.containers_requests <= self.limit_range_max),\
+            (f"initial requests <{self.containers_requests}> must be smaller"
              f" than the max limit range values {self.limit_range_max}")
 
         # check the limit to range ratio
         assert np.alltrue(
-            self.limit_request_ratio <= self.max_limit_request_ratio),\
+            self.containers_limit_request_ratio <= self.max_limit_request_ratio),\
             ("initial request to limit request ratio "
-             f"<{self.limit_request_ratio}>"
+             f"<{self.containers_limit_request_ratio}>"
              f"greater than max request to limit ratio "
              f"<{self.max_limit_request_ratio}>")
 
-    def _calc_reward(self):
-        """Calculate some rewards based-on the slack
-        and other metrics
+    def _calc_reward(self, recreated: bool):
+        """Calculate the reward of the step based-on the slack,
+        overrun and recreation of the current timestep
+        """
+        if self.reward is None:
+            return 1
+        return self.reward.update(
+            self._resource_usage_current, self.requests, recreated)
+
+    def _calc_rewards(self, usage: np.array, requests: np.array,
+                      recreated: bool):
+        """summed reward of the steps of fast_forward with the same
+        requests where only the last step can recreate the pod
         """
-        # TODO should come from the cost function
-        # and the histogram
-        reward = 1
-        return reward
+        steps = usage.shape[1]
+        if self.reward is None:
+            return steps
+        recreations = np.zeros(steps, dtype=bool)
+        recreations[-1] = recreated
+        return self.reward.update_batch(usage, requests, recreations).sum()
 
     def _recreate(self):
         """recreate the pod based-on new criteria
         recreation means changing the requests and the limits
         """
         # TODO check limit_range criteria with gym spaces functionalities
-        self.prev_observation = self.observation.copy()
+        self.prev_observation[:] = self._observation
         self.requests = self.target.copy()
         self.limits = (
             self.target.copy() * self.limit_request_ratio).astype(int)
+        self._observation[2:4] = self.requests
+
+    def _update_observation(self):
+        """compute the resource usage and the observation of the
+        current timestep
+        """
+        self._resource_usage_current = np.round(
+            self.workload[:, self.timestep])
+        self._observation[0:2] = self._resource_usage_current
+        self._observation[2:4] = self.requests
 
     @property
     def time_history(self):
@@ -392,12 +586,12 @@ class SimEnv(gym.Env):
 
     @property
     def observation(self):
-        self.resource_usage_current
-        obs = np.concatenate((
-            self.resource_usage_current,
-            self.requests)
-        )
-        return obs
+        """
+         ram_usage cpu_usage ram_request cpu_request
+        [         |         |           |           ]
+        a copy of the buffer of the current timestep
+        """
+        return self._observation.copy()
 
     @property
     def observation_formatted(self):
@@ -480,7 +674,7 @@ class SimEnv(gym.Env):
              ram cpu
             |       |
         """
-        return np.round(self.workload[:, self.timestep])
+        return self._resource_usage_current
 
     @property
     def wall_time(self):
@@ -517,11 +711,12 @@ class SimEnv(gym.Env):
     def _recreation_needed(self):
         """check the recreation conditions
         """
-        if not np.alltrue(self.lower_bound < self.resource_usage_current):
+        resource_usage_current = self._resource_usage_current
+        if not (self.lower_bound < resource_usage_current).all():
             return True
-        if not np.alltrue(self.resource_usage_current < self.upper_bound):
+        if not (resource_usage_current < self.upper_bound).all():
             return True
-        if not np.alltrue(self.resource_usage_current < self.limits):
+        if not (resource_usage_current < self.limits).all():
             return True
         return False
 
@@ -535,7 +730,7 @@ class SimEnv(gym.Env):
                 self.current_container += 1
                 self.setup_next_container()
             else:
-                if self.round_robin[self.current_container]: # TODO fix round-robin concept
+                if self.round_robin: # TODO fix round-robin concept
                     self.current_container = 0
                     self.setup_next_container()
         return done
@@ -544,4 +739,6 @@ class SimEnv(gym.Env):
     def info(self):
         """info dictionary for the step function
         """
+        if not self.formatted_info:
+            return {}
         return self.observation_formatted
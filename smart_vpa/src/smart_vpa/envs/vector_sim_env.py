@@ -0,0 +1,278 @@
+import numpy as np
+from typing import (
+    List,
+    Dict
+)
+
+from gym.utils import seeding
+
+from smart_vpa.util import logger
+from smart_vpa.util.constants import LIMIT_RANGE
+from smart_vpa.loss_functions import Reward
+from smart_vpa.workload import load_workloads
+from .sim_env import make_spaces
+
+# rllib is only needed for training, without it VectorSimEnv
+# still works as a standalone batch simulator
+try:
+    from ray.rllib.env.vector_env import VectorEnv
+except ImportError:
+    VectorEnv = object
+
+
+class VectorSimEnv(VectorEnv):
+    def __init__(self, config: Dict[str, List]):
+        """SimEnv of many containers stepped together, each container
+        is one sub environment of the rllib VectorEnv interface
+
+        Args:
+            config (Dict[str, List]): one list entry per container
+            for each of the SimEnv config keys (as made by
+            build_config), the workloads of a lazy config are read
+            from its workload store
+        selfs:
+            workload (num_containers, 2, max_timesteps):
+                workloads padded to the longest one
+                ram (in megabayes) |    ...     |
+                cpu (in milicores) |    ...     |
+            requests, limits (num_containers, 2):
+                ram cpu
+                [  |   ]
+        """
+        self.config = config
+        self.num_envs = len(config['container_name'])
+        self.container_name: List[str] = list(config['container_name'])
+        self.seed(int(np.ravel(config['seed'])[0]))
+
+        # workloads and time arrays of all the containers
+        workloads, times = load_workloads(config)
+        self.total_timesteps = np.array(
+            [workload.shape[1] for workload in workloads])
+        max_timesteps = self.total_timesteps.max()
+        self.workload = np.zeros(
+            (self.num_envs, 2, max_timesteps),
+            dtype=np.result_type(*workloads))
+        self.time = np.zeros(
+            (self.num_envs, max_timesteps),
+            dtype=np.result_type(*times))
+        for i, (workload, time) in enumerate(zip(workloads, times)):
+            self.workload[i, :, :workload.shape[1]] = workload
+            self.time[i, :len(time)] = time
+
+        # initail resource requests and limits
+        self.initial_requests = np.array([
+            [requests['memory'], requests['cpu']]
+            for requests in config['requests']], dtype=float)
+        self.initial_limits = np.array([
+            [limits['memory'], limits['cpu']]
+            for limits in config['limits']], dtype=float)
+        self.requests = self.initial_requests.copy()
+        self.limits = self.initial_limits.copy()
+
+        # limit ranges
+        self.limit_range_min = np.array([
+            LIMIT_RANGE['min']['memory'], LIMIT_RANGE['min']['cpu']],
+            dtype=float)
+        self.limit_range_max = np.array([
+            LIMIT_RANGE['max']['memory'], LIMIT_RANGE['max']['cpu']],
+            dtype=float)
+        self.max_limit_request_ratio = np.array([
+            LIMIT_RANGE['max_limit_request_ratio']['memory'],
+            LIMIT_RANGE['max_limit_request_ratio']['cpu']], dtype=float)
+
+        # whether we want to end at the end of the workload
+        # or start over from the begining
+        self.round_robin = np.broadcast_to(
+            np.array(config['round-robin'], dtype=bool), (self.num_envs,))
+
+        # ratio of the request to limit
+        # (constant and stays the same during the experimetns)
+        self.limit_request_ratio =\
+            self.initial_limits/self.initial_requests
+
+        # reward of the slack, overrun and recreations of the steps
+        reward_weights = config.get('reward')
+        if isinstance(reward_weights, list):
+            reward_weights = reward_weights[0]
+        self.reward = None if reward_weights is None else Reward(
+            reward_weights)
+
+        # the observation and action space of one container
+        self.observation_space, self.action_space = make_spaces(
+            self.limit_range_min, self.limit_range_max)
+        if VectorEnv is not object:
+            super().__init__(
+                observation_space=self.observation_space,
+                action_space=self.action_space,
+                num_envs=self.num_envs)
+
+        # kubernetes value checks
+        self._kubernetes_checks()
+
+        self.timestep = np.zeros(self.num_envs, dtype=int)
+        self.global_timestep = np.zeros(self.num_envs, dtype=int)
+        self.recreation_flag = np.zeros(self.num_envs, dtype=bool)
+        self._rows = np.arange(self.num_envs)
+        _ = self.vector_reset()
+        logger.info(f"{self.num_envs} containers initialised!")
+
+    def seed(self, seed):
+        np.random.seed(seed)
+        self.np_random, seed = seeding.np_random(seed)
+        self._env_seed = seed
+        self.base_env_seed = seed
+        return [seed]
+
+    def vector_reset(self) -> np.array:
+        """Resets all the containers to their initial state
+
+        Returns:
+            np.array: observation of each container
+            (num_containers, 4)
+        """
+        self.timestep[:] = 0
+        self.global_timestep[:] = 0
+        self.recreation_flag[:] = False
+        self.requests = self.initial_requests.copy()
+        self.limits = self.initial_limits.copy()
+        return self.observation
+
+    def reset_at(self, index: int) -> np.array:
+        """Resets a single container
+
+        Returns:
+            np.array: observation of the container
+        """
+        self.timestep[index] = 0
+        self.global_timestep[index] = 0
+        self.recreation_flag[index] = False
+        self.requests[index] = self.initial_requests[index]
+        self.limits[index] = self.initial_limits[index]
+        return self.observation[index]
+
+    def vector_step(self, actions):
+        """SimEnv.step of all the containers with one action per
+        container, a container that is not round robin is done at the
+        end of its workload and should be reset with reset_at
+
+        Args:
+            actions: recommendations (num_containers, 6)
+
+        Returns:
+            Tuple[np.array, List, List, List]: observations, rewards,
+            dones and infos of the containers
+        """
+        self.action = np.asarray(actions)
+        # recreate the pods if needed
+        recreation_needed = self._recreation_needed
+        rewards = self._calc_reward(recreation_needed)
+        self.recreation_flag = recreation_needed
+        self._recreate(np.flatnonzero(recreation_needed))
+        self.global_timestep += 1
+        self.timestep = np.where(
+            self.round_robin,
+            self.global_timestep % self.total_timesteps,
+            np.minimum(self.global_timestep, self.total_timesteps-1))
+        dones = ~self.round_robin &\
+            (self.global_timestep >= self.total_timesteps-1)
+        infos = [{'recreated': recreated}
+                 for recreated in recreation_needed.tolist()]
+        return self.observation, rewards.tolist(), dones.tolist(), infos
+
+    def get_sub_environments(self) -> List:
+        """the containers are rows of the arrays and not separate
+        environment objects
+        """
+        return []
+
+    def _kubernetes_checks(self):
+        """SimEnv._kubernetes_checks of all the containers
+        """
+        # limits should not be greater than requests
+        assert np.alltrue(self.initial_requests <= self.initial_limits), \
+            (f"limits values <{self.initial_limits}> must be smaller than"
+             f" requests values <{self.initial_requests}>")
+
+        # check limit ranges logic
+        assert np.alltrue(self.limit_range_min <= self.limit_range_max), \
+            (f"min limit range values {self.limit_range_min} must be smaller"
+             f" than max limit range values {self.limit_range_max}")
+        assert np.alltrue(self.max_limit_request_ratio >= 1), \
+            (f"max_limit_request_ratio <{self.max_limit_request_ratio}>"
+             " must be greater than one")
+
+        # check initial request and limits against the limit ranges
+        assert np.alltrue(self.initial_requests >= self.limit_range_min), \
+            (f"initial requests  <{self.initial_requests}> must be "
+             f" greater than the min limit range <{self.limit_range_min}>")
+        assert np.alltrue(self.initial_requests <= self.limit_range_max), \
+            (f"initial requests <{self.initial_requests}> must be smaller"
+             f" than the max limit range values {self.limit_range_max}")
+
+        # check the limit to range ratio
+        assert np.alltrue(
+            self.limit_request_ratio <= self.max_limit_request_ratio), \
+            ("initial request to limit request ratio "
+             f"<{self.limit_request_ratio}>"
+             f"greater than max request to limit ratio "
+             f"<{self.max_limit_request_ratio}>")
+
+    def _calc_reward(self, recreated: np.array) -> np.array:
+        """SimEnv._calc_reward of all the containers
+        """
+        if self.reward is None:
+            return np.ones(self.num_envs)
+        return self.reward.compute(
+            self.resource_usage_current.T, self.requests.T,
+            recreated)['rewards']
+
+    def _recreate(self, indices: np.array):
+        """recreate the pods based-on new criteria
+        recreation means changing the requests and the limits
+        """
+        target = self.target[indices]
+        self.requests[indices] = target
+        self.limits[indices] = (
+            target * self.limit_request_ratio[indices]).astype(int)
+
+    @property
+    def observation(self) -> np.array:
+        """observation of each container (num_containers, 4)
+         ram_usage cpu_usage ram_request cpu_request
+        [         |         |           |           ]
+        """
+        return np.concatenate((
+            self.resource_usage_current,
+            self.requests), axis=1)
+
+    @property
+    def resource_usage_current(self) -> np.array:
+        """Containers' resource usage at their current timestep
+        (num_containers, 2)
+        """
+        return np.round(self.workload[self._rows, :, self.timestep])
+
+    @property
+    def wall_time(self) -> np.array:
+        return self.time[self._rows, self.timestep]
+
+    @property
+    def lower_bound(self) -> np.array:
+        return self.action[:, 0:2]
+
+    @property
+    def target(self) -> np.array:
+        return self.action[:, 2:4]
+
+    @property
+    def upper_bound(self) -> np.array:
+        return self.action[:, 4:6]
+
+    @property
+    def _recreation_needed(self) -> np.array:
+        """check the recreation conditions of all the containers
+        """
+        usage = self.resource_usage_current
+        return ~(np.all(self.lower_bound < usage, axis=1) &
+                 np.all(usage < self.upper_bound, axis=1) &
+                 np.all(usage < self.limits, axis=1))
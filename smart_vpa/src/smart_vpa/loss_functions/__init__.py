@@ -15,3 +15,6 @@ class Loss(ABC):
         """compute the loss function result
         """
         pass
+
+
+from .reward import Reward, DEFAULT_WEIGHTS # noqa
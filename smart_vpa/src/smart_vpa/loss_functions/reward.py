@@ -0,0 +1,137 @@
+from typing import Dict, Any
+
+import numpy as np
+
+from . import Loss
+
+# weights of the reward terms, slack and overrun are per resource
+#  ram cpu
+# [   |   ]
+DEFAULT_WEIGHTS = {
+    'slack': [1.0, 1.0],
+    'overrun': [10.0, 10.0],
+    'recreation': 100.0
+}
+
+
+class Reward(Loss):
+    def __init__(self, weights: Dict[str, Any] = None):
+        """negative weighted cost of the slack area, the overrun
+        (oom and throttling) area and the pod recreations, each step
+        holds its usage and requests for one timestep
+
+            reward = - slack . slack_weights
+                     - overrun . overrun_weights
+                     - recreation_weight * recreated
+
+        update adds one step and keeps running sums, compute scores a
+        whole trace of steps at once with the same rewards
+
+        Args:
+            weights (Dict[str, Any], optional): 'slack' and 'overrun'
+            [ram, cpu] weights and the 'recreation' weight, missing
+            ones are taken from DEFAULT_WEIGHTS. Defaults to None.
+        """
+        weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self.slack_weights = np.array(weights['slack'], dtype=float)
+        self.overrun_weights = np.array(weights['overrun'], dtype=float)
+        self.recreation_weight = float(weights['recreation'])
+        self.reset()
+
+    def reset(self):
+        """reset the running sums"""
+        self.slack = np.zeros(2)
+        self.overrun = np.zeros(2)
+        self.recreations = 0
+        self.steps = 0
+        self.total_reward = 0.0
+
+    def update(self, usage: np.array, requests: np.array,
+               recreated: bool) -> float:
+        """reward of one step and add it to the running sums
+
+        Args:
+            usage (np.array): ram and cpu usage of the step
+            requests (np.array): ram and cpu requests of the step
+            (before the recreation of the step)
+            recreated (bool): whether the pod is recreated in the step
+
+        Returns:
+            float: the reward of the step
+        """
+        slack = np.subtract(requests, usage, dtype=float)
+        overrun = np.maximum(-slack, 0)
+        np.maximum(slack, 0, out=slack)
+        reward = - slack.dot(self.slack_weights)\
+            - overrun.dot(self.overrun_weights)\
+            - self.recreation_weight * recreated
+        self.slack += slack
+        self.overrun += overrun
+        self.recreations += int(recreated)
+        self.steps += 1
+        self.total_reward += reward
+        return reward
+
+    def update_batch(self, usage: np.array, requests: np.array,
+                     recreated: np.array) -> np.array:
+        """same as calling update on each of the steps in order
+
+        Args:
+            usage (np.array): (2, steps)
+            requests (np.array): (2, steps) or (2,) if the requests
+            are the same in all the steps
+            recreated (np.array): (steps,)
+
+        Returns:
+            np.array: reward of each step (steps,)
+        """
+        usage = np.asarray(usage, dtype=float)
+        requests = np.asarray(requests, dtype=float)
+        if requests.ndim == 1:
+            requests = requests[:, np.newaxis]
+        rewards, slack, overrun = self._rewards(usage, requests, recreated)
+        self.slack += slack.sum(axis=1)
+        self.overrun += overrun.sum(axis=1)
+        self.recreations += int(np.count_nonzero(recreated))
+        self.steps += rewards.size
+        self.total_reward += rewards.sum()
+        return rewards
+
+    def compute(self, usage: np.array, requests: np.array,
+                recreated: np.array) -> Dict[str, Any]:
+        """score a whole recommendation trace at once without changing
+        the running sums
+
+        Args:
+            usage (np.array): ram and cpu usage (2, steps)
+            requests (np.array): ram and cpu requests of each step
+            before its recreation (2, steps)
+            recreated (np.array): whether the pod is recreated in each
+            step (steps,)
+
+        Returns:
+            Dict[str, Any]: 'rewards' of each step, the summed 'slack'
+            and 'overrun' (ram, cpu), the number of 'recreations' and
+            the 'total_reward'
+        """
+        rewards, slack, overrun = self._rewards(
+            np.asarray(usage, dtype=float),
+            np.asarray(requests, dtype=float), recreated)
+        return {
+            'rewards': rewards,
+            'slack': slack.sum(axis=1),
+            'overrun': overrun.sum(axis=1),
+            'recreations': int(np.count_nonzero(recreated)),
+            'total_reward': rewards.sum()
+        }
+
+    def _rewards(self, usage: np.array, requests: np.array,
+                 recreated: np.array):
+        """rewards, slacks and overruns of the steps"""
+        slack = requests - usage
+        overrun = np.maximum(-slack, 0)
+        np.maximum(slack, 0, out=slack)
+        rewards = - self.slack_weights.dot(slack)\
+            - self.overrun_weights.dot(overrun)\
+            - self.recreation_weight * np.asarray(recreated, dtype=float)
+        return rewards, slack, overrun
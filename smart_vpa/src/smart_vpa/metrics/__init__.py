@@ -0,0 +1,5 @@
+from .slack import ( # noqa
+    segment_trapz,
+    pod_metrics,
+    cluster_metrics
+)
@@ -0,0 +1,134 @@
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+RESOURCES = ['memory', 'cpu']
+
+
+def _half_steps(time: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """half of the time step between neighbour samples, zero between
+    the last sample of a segment and the first sample of the next
+    """
+    half_steps = np.diff(np.asarray(time, dtype=float)) / 2.0
+    boundaries = np.asarray(offsets[1:-1]) - 1
+    half_steps[boundaries[
+        (boundaries >= 0) & (boundaries < half_steps.size)]] = 0
+    return half_steps
+
+
+def _segment_areas(values: np.ndarray, half_steps: np.ndarray,
+                   offsets: np.ndarray) -> np.ndarray:
+    """segment_trapz with the half steps of the time"""
+    lengths = np.diff(offsets)
+    trapezoids = values[..., 1:] + values[..., :-1]
+    trapezoids *= half_steps
+    results = np.zeros(values.shape[:-1] + (lengths.size,))
+    # segments with less than two samples have no area and between
+    # two non empty starts there are only the trapezoids of the first
+    non_empty = np.flatnonzero(lengths > 1)
+    if non_empty.size:
+        results[..., non_empty] = np.add.reduceat(
+            trapezoids, offsets[non_empty], axis=-1)
+    return results
+
+
+def segment_trapz(values: np.ndarray, time: np.ndarray,
+                  offsets: np.ndarray) -> np.ndarray:
+    """np.trapz of every segment of ragged concatenated arrays,
+    segment i is values[..., offsets[i]:offsets[i+1]]
+
+    Args:
+        values (np.ndarray): concatenated values (..., total_timesteps)
+        time (np.ndarray): concatenated time (total_timesteps,)
+        offsets (np.ndarray): start of each segment and the end of
+        the last one (num_segments+1,)
+
+    Returns:
+        np.ndarray: area under the curve of each segment
+        (..., num_segments)
+    """
+    offsets = np.asarray(offsets)
+    return _segment_areas(
+        np.asarray(values, dtype=float), _half_steps(time, offsets),
+        offsets)
+
+
+def pod_metrics(usage: np.ndarray, time: np.ndarray, offsets: np.ndarray,
+                requests: np.ndarray,
+                predictions: Dict[str, np.ndarray] = None
+                ) -> Dict[str, np.ndarray]:
+    """usage, slack and overrun statistics of many pods at once, the
+    slack (overrun) of a request is the area between the request and
+    the usage over time where the request is above (below) the usage
+
+    Args:
+        usage (np.ndarray): memory and cpu usage of all the pods
+        concatenated (2, total_timesteps)
+        time (np.ndarray): time of the samples (total_timesteps,)
+        offsets (np.ndarray): pod i is usage[:, offsets[i]:offsets[i+1]]
+        requests (np.ndarray): memory and cpu real requests of the
+        pods (2, num_pods)
+        predictions (Dict[str, np.ndarray], optional): other memory and
+        cpu requests per pod e.g. {'max': (2, num_pods)}. Defaults to None.
+
+    Returns:
+        Dict[str, np.ndarray]: one (num_pods,) array per statistic, the
+        slacks and overruns of the real requests are named 'usage'
+        like in the analysis scripts e.g. slack_usage_density_memory
+    """
+    usage = np.asarray(usage, dtype=float)
+    offsets = np.asarray(offsets)
+    lengths = np.diff(offsets)
+    requests = {'usage': requests}
+    if predictions is not None:
+        requests.update(predictions)
+    half_steps = _half_steps(time, offsets)
+    usage_sum = np.zeros((2, lengths.size))
+    usage_sum[:, lengths > 0] = np.add.reduceat(
+        usage, offsets[:-1][lengths > 0], axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        average_usage = np.trunc(usage_sum / lengths)
+    usage_density = _segment_areas(usage, half_steps, offsets)
+    request_density = _segment_areas(
+        np.repeat(np.asarray(requests['usage'], dtype=float),
+                  lengths, axis=1), half_steps, offsets)
+    metrics = {}
+    for i, resource in enumerate(RESOURCES):
+        metrics[f'avg_usage_{resource}'] = average_usage[i]
+        metrics[f'usage_density_{resource}'] = usage_density[i]
+        metrics[f'request_density_{resource}'] = request_density[i]
+    for name, request in requests.items():
+        difference = np.repeat(
+            np.asarray(request, dtype=float), lengths, axis=1)
+        difference -= usage
+        slack = _segment_areas(
+            np.maximum(difference, 0), half_steps, offsets)
+        # the overrun reuses the buffer of the difference
+        overrun = _segment_areas(
+            np.maximum(np.negative(difference, out=difference), 0,
+                       out=difference), half_steps, offsets)
+        for i, resource in enumerate(RESOURCES):
+            metrics[f'slack_{name}_density_{resource}'] = slack[i]
+            metrics[f'overrun_{name}_density_{resource}'] = overrun[i]
+    return metrics
+
+
+def cluster_metrics(usage: np.ndarray, time: np.ndarray,
+                    offsets: np.ndarray, requests: np.ndarray,
+                    predictions: Dict[str, np.ndarray] = None,
+                    index: pd.Index = None) -> pd.DataFrame:
+    """pod_metrics of a whole cluster as a table with one row per pod
+
+    Args:
+        index (pd.Index, optional): row labels e.g. (namespace, pod).
+        Defaults to None.
+
+        rest of the arguments are the same as pod_metrics
+    """
+    table = pd.DataFrame(pod_metrics(
+        usage=usage, time=time, offsets=offsets,
+        requests=requests, predictions=predictions), index=index)
+    for i, resource in enumerate(RESOURCES):
+        table[f'request_{resource}'] = np.asarray(requests[i])
+    return table
@@ -5,5 +5,7 @@ Module of the recommender used in the simulations
 from .rl import RL # noqa
 from .lstm import LSTM # noqa
 from .threshold import Threshold # noqa
+from .builtin_core import BuiltinCore # noqa
 from .builtin import Builtin # noqa
+from .builtin_fleet import BuiltinFleet # noqa
 from .random import Random # noqa
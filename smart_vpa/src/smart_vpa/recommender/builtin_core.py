@@ -0,0 +1,356 @@
+from smart_vpa.util.types import bytes_to_megabytes
+from typing import Dict, Any
+import numpy as np
+
+from smart_vpa.util import (
+    Histogram,
+    millicores_to_cores,
+    megabytes_to_bytes
+)
+
+# lower bound, target and upper bound percentiles of both resources
+PERCENTILES = [0.5, 0.9, 0.95]
+MARGIN_FRACTION = 0.15
+POD_MIN_CPU_MILLICORE = 25
+POD_MIN_MEMORY_BYTES = 250 * 10e6
+
+
+def estimate_recommendations(
+        memory: np.ndarray, cpu: np.ndarray,
+        first_sample_start_time: np.ndarray,
+        last_sample_start_time: np.ndarray,
+        total_sample_count: np.ndarray, margin: bool, confidence: bool,
+        min_resource: bool, action_space=None) -> np.ndarray:
+    """the margin, confidence and min resource estimations of the
+    Builtin recommender on many rows of percentiles at once
+
+    From:
+        CreatePodResourceRecommender in
+        https://github.com/kubernetes/autoscaler/blob/
+        master/vertical-pod-autoscaler/pkg/recommender/
+        logic/recommender.go
+
+    Args:
+        memory (np.ndarray): (rows, 3) PERCENTILES of the memory
+        histograms in bytes
+        cpu (np.ndarray): (rows, 3) PERCENTILES of the cpu
+        histograms in cores
+        first_sample_start_time (np.ndarray): per row or one for all
+        last_sample_start_time (np.ndarray): per row or one for all
+        total_sample_count (np.ndarray): per row or one for all
+        margin (bool): add the safety margin
+        confidence (bool): scale the bounds with the confidence
+        min_resource (bool): raise to the pod minimum resources
+        action_space (optional): cap to the action space of the
+        simulator. Defaults to no capping.
+
+    Returns:
+        np.ndarray: (rows, 6) recommendations in the simulator format
+        memory: Megabytes (int), cpu: Millicores (int)
+    """
+    # units in histgrams -> memory: bytes (float), cpu: cores (float)
+    # units of returned values -> memory: bytes (int),
+    #                             cpu: milicores (int)
+    cpu = np.trunc(np.asarray(cpu, dtype=float) * 1000)
+    memory = np.trunc(np.asarray(memory, dtype=float))
+
+    if margin:
+        # adding margin estimations
+        # same as Estimator.margin_estimator
+        cpu = cpu + cpu * MARGIN_FRACTION
+        memory = np.trunc(memory + memory * MARGIN_FRACTION)
+
+    if confidence:
+        # with upper and lower bound confidence
+        # same as Estimator.confidence_multiplier_estimator
+        day_length = 3600 * 24
+        life_span_in_days = (
+            np.asarray(last_sample_start_time, dtype=float) -
+            first_sample_start_time) / day_length
+        sample_amount = np.asarray(total_sample_count) / (3600*24)
+        confidence = np.minimum(life_span_in_days, sample_amount)
+        with np.errstate(divide='ignore'):
+            lower_multiplier = np.power(1+0.001/confidence, -2.0)
+            upper_multiplier = np.power(1+1.0/confidence, 2.0)
+        no_history = (np.asarray(first_sample_start_time) == 0) &\
+            (np.asarray(last_sample_start_time) == 0)
+        lower_multiplier = np.where(no_history, 1, lower_multiplier)
+        upper_multiplier = np.where(no_history, 1, upper_multiplier)
+        cpu[:, 0] *= lower_multiplier
+        cpu[:, 2] *= upper_multiplier
+        memory[:, 0] *= lower_multiplier
+        memory[:, 2] *= upper_multiplier
+
+        if action_space is not None:
+            # handle inf in upper bound
+            memory[np.isinf(memory[:, 2]), 2] = np.trunc(
+                megabytes_to_bytes(action_space.high[0]))
+            cpu[np.isinf(cpu[:, 2]), 2] = action_space.high[1]
+
+    if min_resource:
+        # with min resource check
+        cpu = np.maximum(cpu, POD_MIN_CPU_MILLICORE)
+        memory = np.maximum(memory, POD_MIN_MEMORY_BYTES)
+
+    # units of returned values -> memory: Megabytes (float),
+    #                             cpu: milicores (float)
+    memory = bytes_to_megabytes(memory)
+    recommendation = np.stack([
+        memory[:, 0], cpu[:, 0],
+        memory[:, 1], cpu[:, 1],
+        memory[:, 2], cpu[:, 2]
+        ], axis=1)
+
+    if action_space is not None:
+        # capping
+        recommendation = np.clip(
+            recommendation,
+            a_min=action_space.low,
+            a_max=action_space.high)
+
+    # make it granular as millicores for cpu
+    # and megabytes for memory
+    recommendation = recommendation.astype(int)
+
+    return recommendation
+
+
+class BuiltinCore:
+    def __init__(self,
+                 cpu_first_bucket_size, cpu_max_value,
+                 memory_first_bucket_size, memory_max_value,
+                 margin: bool, confidence: bool, min_resource: bool,
+                 time_decay: bool = True, action_space=None):
+        """The Builtin recommender of one container on whole usage
+        arrays, the per step Builtin of the simulator and the one of
+        the analysis scripts (recommender_initial) are adapters of it
+
+        Usages are in the simulator units (memory: Megabytes,
+        cpu: Millicores), the histograms are in bytes and cores
+
+        Args:
+            cpu_first_bucket_size (float): in cores
+            cpu_max_value (float): in cores
+            memory_first_bucket_size (float): in bytes
+            memory_max_value (float): in bytes
+            margin (bool): add the safety margin
+            confidence (bool): scale the bounds with the confidence
+            min_resource (bool): raise to the pod minimum resources
+            time_decay (bool, optional): decaying histograms.
+            Defaults to True.
+            action_space (optional): cap the recommendations to the
+            action space of the simulator. Defaults to no capping.
+        """
+        # cpu values in histogram in cores
+        self.cpu_first_bucket_size = cpu_first_bucket_size
+        self.cpu_max_value = cpu_max_value
+        # memory values in histogram in bytes
+        self.memory_first_bucket_size = memory_first_bucket_size
+        self.memory_max_value = memory_max_value
+        self.margin = margin
+        self.confidence = confidence
+        self.min_resource = min_resource
+        self.time_decay = time_decay
+        self.action_space = action_space
+        self.reset()
+
+    def reset(self):
+        self.cpu_histogram = Histogram(
+            max_value=self.cpu_max_value,
+            first_bucket_size=self.cpu_first_bucket_size,
+            time_decay=self.time_decay
+        )
+        self.memory_histogram = Histogram(
+            max_value=self.memory_max_value,
+            first_bucket_size=self.memory_first_bucket_size,
+            time_decay=self.time_decay
+        )
+        # first and last sample times and the number of samples like
+        # AggregateContainerState, instead of keeping every timestamp
+        self.first_sample_start_time = np.inf
+        self.last_sample_start_time = -np.inf
+        self.total_sample_count = 0
+        # last recommendation and the percentiles versions
+        # of the histograms it was made from
+        self._recommendation = None
+        self._recommendation_versions = None
+
+    def add_sample(self, memory_usage: float, cpu_usage: float,
+                   timestamp: float):
+        """add one usage sample
+
+        Args:
+            memory_usage (float): in Megabytes
+            cpu_usage (float): in Millicores
+            timestamp (float): timestamp of the sample
+        """
+        self.memory_histogram.add_sample(
+            value=megabytes_to_bytes(memory_usage),
+            # TODO check definitive guide: based on the current
+            # Container’s CPU request value.
+            # TODO check autopilot paper
+            weight=1.0,
+            timestamp=timestamp)
+        self.cpu_histogram.add_sample(
+            value=millicores_to_cores(cpu_usage),
+            weight=1.0,
+            timestamp=timestamp)
+        self.first_sample_start_time = min(
+            self.first_sample_start_time, timestamp)
+        self.last_sample_start_time = max(
+            self.last_sample_start_time, timestamp)
+        self.total_sample_count += 1
+
+    def add_samples(self, memory_usage: np.array, cpu_usage: np.array,
+                    timestamps: np.array):
+        """same as calling add_sample on each of the samples in order
+        but the histograms are updated with one add_samples call
+
+        Args:
+            memory_usage (np.array): memory usages in Megabytes
+            cpu_usage (np.array): cpu usages in Milicores
+            timestamps (np.array): timestamps of the samples
+        """
+        timestamps = np.asarray(timestamps, dtype=float)
+        self.memory_histogram.add_samples(
+            values=megabytes_to_bytes(np.asarray(memory_usage, dtype=float)),
+            weights=1.0,
+            timestamps=timestamps)
+        self.cpu_histogram.add_samples(
+            values=millicores_to_cores(np.asarray(cpu_usage, dtype=float)),
+            weights=1.0,
+            timestamps=timestamps)
+        if timestamps.size:
+            self.first_sample_start_time = min(
+                self.first_sample_start_time, float(timestamps.min()))
+            self.last_sample_start_time = max(
+                self.last_sample_start_time, float(timestamps.max()))
+        self.total_sample_count += timestamps.size
+
+    def recommendation(self) -> np.ndarray:
+        """the recommendation of the samples added so far
+
+        The last recommendation is returned as long as the percentiles
+        of both histograms provably stay in their buckets (same
+        percentiles_version), the confidence bounds depend on the
+        sample times so with confidence only the percentiles are reused
+
+        Returns:
+            np.ndarray: recommendation in the simulator format
+                 ram_lower_bound   cpu_lower_bound
+                [                |                |
+
+                 ram_target   cpu_target
+                |           |            |
+
+                 ram_higher_bound   cpu_higher_bound
+                |                 |                 ]
+        """
+        if self.action_space is not None and\
+           self.memory_histogram.total_sample_count == 0 and\
+           self.cpu_histogram.total_sample_count == 0:
+            return np.concatenate((
+               self.action_space.low[0:4],
+               self.action_space.high[0:2]
+               ))
+        if not self.confidence and self._recommendation_versions == (
+           self.memory_histogram.percentiles_version,
+           self.cpu_histogram.percentiles_version):
+            return self._recommendation.copy()
+        recommendation = estimate_recommendations(
+            memory=self.memory_histogram.percentiles(
+                PERCENTILES)[np.newaxis],
+            cpu=self.cpu_histogram.percentiles(PERCENTILES)[np.newaxis],
+            first_sample_start_time=self.first_sample_start_time,
+            last_sample_start_time=self.last_sample_start_time,
+            total_sample_count=self.total_sample_count,
+            margin=self.margin, confidence=self.confidence,
+            min_resource=self.min_resource,
+            action_space=self.action_space)[0]
+        self._recommendation = recommendation.copy()
+        self._recommendation_versions = (
+            self.memory_histogram.percentiles_version,
+            self.cpu_histogram.percentiles_version)
+        return recommendation
+
+    def recommendations(self, memory_usage: np.array, cpu_usage: np.array,
+                        timestamps: np.array) -> np.ndarray:
+        """add the samples in order and return the recommendation
+        after each of them, the same as add_sample and recommendation
+        per sample but the estimations are done on all the
+        percentiles at once
+
+        Args:
+            memory_usage (np.array): memory usages in Megabytes
+            cpu_usage (np.array): cpu usages in Milicores
+            timestamps (np.array): timestamps of the samples
+
+        Returns:
+            np.ndarray: (samples, 6) recommendations in the
+            simulator format
+        """
+        memory_usage = megabytes_to_bytes(
+            np.asarray(memory_usage, dtype=float))
+        cpu_usage = millicores_to_cores(np.asarray(cpu_usage, dtype=float))
+        timestamps = np.asarray(timestamps, dtype=float)
+        memory = np.zeros((timestamps.size, len(PERCENTILES)))
+        cpu = np.zeros((timestamps.size, len(PERCENTILES)))
+        # the histograms keep the percentiles while they stay in
+        # their buckets so most of the queries are only a lookup
+        for i in range(timestamps.size):
+            self.memory_histogram.add_sample(
+                value=memory_usage[i], weight=1.0, timestamp=timestamps[i])
+            self.cpu_histogram.add_sample(
+                value=cpu_usage[i], weight=1.0, timestamp=timestamps[i])
+            memory[i] = self.memory_histogram.percentiles(PERCENTILES)
+            cpu[i] = self.cpu_histogram.percentiles(PERCENTILES)
+        first_sample_start_time = np.minimum.accumulate(np.concatenate((
+            [self.first_sample_start_time], timestamps)))[1:]
+        last_sample_start_time = np.maximum.accumulate(np.concatenate((
+            [self.last_sample_start_time], timestamps)))[1:]
+        total_sample_count = self.total_sample_count +\
+            np.arange(1, timestamps.size + 1)
+        if timestamps.size:
+            self.first_sample_start_time = first_sample_start_time[-1]
+            self.last_sample_start_time = last_sample_start_time[-1]
+            self.total_sample_count = int(total_sample_count[-1])
+        return estimate_recommendations(
+            memory=memory, cpu=cpu,
+            first_sample_start_time=first_sample_start_time,
+            last_sample_start_time=last_sample_start_time,
+            total_sample_count=total_sample_count,
+            margin=self.margin, confidence=self.confidence,
+            min_resource=self.min_resource,
+            action_space=self.action_space)
+
+    def save_to_checkpoint(self) -> Dict[str, Any]:
+        """
+        From:
+            SaveToCheckpoint in aggregate_container_state.go
+            the histograms checkpoints with the first and last
+            sample times and the number of samples
+        """
+        checkpoint = {
+            'memory_histogram': self.memory_histogram.save_to_checkpoint(),
+            'cpu_histogram': self.cpu_histogram.save_to_checkpoint(),
+            'first_sample_start_time': self.first_sample_start_time,
+            'last_sample_start_time': self.last_sample_start_time,
+            'total_sample_count': self.total_sample_count
+        }
+        return checkpoint
+
+    def load_from_checkpoint(self, checkpoint: Dict[str, Any]):
+        """
+        From:
+            LoadFromCheckpoint in aggregate_container_state.go
+            replaces the state of the recommender with the
+            one from save_to_checkpoint
+        """
+        self.reset()
+        self.memory_histogram.load_from_checkpoint(
+            checkpoint['memory_histogram'])
+        self.cpu_histogram.load_from_checkpoint(
+            checkpoint['cpu_histogram'])
+        self.first_sample_start_time = checkpoint['first_sample_start_time']
+        self.last_sample_start_time = checkpoint['last_sample_start_time']
+        self.total_sample_count = checkpoint['total_sample_count']
@@ -0,0 +1,125 @@
+from .nonml_interface import NonMLInterface
+from .builtin_core import PERCENTILES, estimate_recommendations
+from typing import Dict, Any
+import numpy as np
+
+from smart_vpa.util import (
+    HistogramBank,
+    millicores_to_cores,
+    megabytes_to_bytes
+)
+
+
+class BuiltinFleet(NonMLInterface):
+    def __init__(self, config: Dict[str, Any]):
+        """Builtin recommender for many containers at once, the
+        histograms of all the containers are kept in two HistogramBanks
+        and recommender() returns one Builtin recommendation per
+        container
+
+        Config is the same as Builtin plus 'num_containers'
+        """
+        config_histogram = config['histogram']
+        self.num_containers = config['num_containers']
+        # cpu values in histogram in cores
+        self.cpu_first_bucket_size = config_histogram['cpu'][
+            'first_bucket_size']
+        self.cpu_max_value = config_histogram['cpu']['max_value']
+        # memory values in histogram in bytes
+        self.memory_first_bucket_size = config_histogram['memory'][
+            'first_bucket_size']
+        self.memory_max_value = config_histogram['memory']['max_value']
+        self.action_space = config['action_space']
+        self.margin = config['margin']
+        self.confidence = config['confidence']
+        self.min_resource = config['min_resource']
+        self.reset()
+
+    def update(self, observation: np.array, timestamp: np.array,
+               container_ids: np.array = None):
+        """update resource usage with the new observatins of the
+        containers
+
+        Args:
+            observation (np.array): one simulator observation per row
+            (only memory and cpu usage columns are used)
+            timestamp (np.array): timestamp of the observations, one
+            for all or one per row
+            container_ids (np.array, optional): the container of each
+            row. Defaults to all the containers in order.
+        """
+        observation = np.asarray(observation)
+        if container_ids is None:
+            container_ids = np.arange(self.num_containers)
+        container_ids, timestamp = np.broadcast_arrays(
+            np.asarray(container_ids), np.asarray(timestamp, dtype=float))
+        # units in observation -> memory: Megabytes, cpu: Milicores
+        # units in histgrams -> memory: bytes, cpu: cores
+        self.memory_histograms.add_samples(
+            container_ids=container_ids,
+            values=megabytes_to_bytes(observation[:, 0]),
+            timestamps=timestamp)
+        self.cpu_histograms.add_samples(
+            container_ids=container_ids,
+            values=millicores_to_cores(observation[:, 1]),
+            timestamps=timestamp)
+        np.minimum.at(self.first_sample_start_time, container_ids, timestamp)
+        np.maximum.at(self.last_sample_start_time, container_ids, timestamp)
+        np.add.at(self.total_sample_count, container_ids, 1)
+
+    def reset(self):
+        self.cpu_histograms = HistogramBank(
+            num_histograms=self.num_containers,
+            max_value=self.cpu_max_value,
+            first_bucket_size=self.cpu_first_bucket_size
+        )
+        self.memory_histograms = HistogramBank(
+            num_histograms=self.num_containers,
+            max_value=self.memory_max_value,
+            first_bucket_size=self.memory_first_bucket_size
+        )
+        self.first_sample_start_time = np.full(self.num_containers, np.inf)
+        self.last_sample_start_time = np.full(self.num_containers, -np.inf)
+        self.total_sample_count = np.zeros(self.num_containers, dtype=int)
+
+    def recommender(self):
+        """Builtin.recommender for every container
+
+        recommendation format (one row per container)
+                 ram_lower_bound   cpu_lower_bound
+                [                |                |
+
+                 ram_target   cpu_target
+                |           |            |
+
+                 ram_higher_bound   cpu_higher_bound
+                |                 |                 ]
+        """
+        # percentiles estimations
+        # columns -> lower bound, target, upper bound
+        # units in histgrams -> memory: bytes (float), cpu: cores (float)
+        recommendation = estimate_recommendations(
+            memory=self.memory_histograms.percentiles(PERCENTILES),
+            cpu=self.cpu_histograms.percentiles(PERCENTILES),
+            first_sample_start_time=self.first_sample_start_time,
+            last_sample_start_time=self.last_sample_start_time,
+            total_sample_count=self.total_sample_count,
+            margin=self.margin, confidence=self.confidence,
+            min_resource=self.min_resource,
+            action_space=self.action_space)
+
+        # containers without samples
+        no_samples = (self.memory_histograms.total_sample_count == 0) &\
+            (self.cpu_histograms.total_sample_count == 0)
+        recommendation[no_samples] = np.concatenate((
+            self.action_space.low[0:4],
+            self.action_space.high[0:2]
+            ))
+
+        return recommendation
+
+    def _check_config(self):
+        """check the config structure according to
+        the recommender method
+        """
+        pass
@@ -4,15 +4,29 @@ vertical pod autoscalers
 
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Union
+import numpy as np
 
 from smart_vpa.envs import SimEnv, KubeEnv
 # TODO add loss function loader here
 
 
 class MLInterface(ABC):
+    # see NonMLInterface.static_action
+    static_action = False
+
     def __init__(self, config: Dict[str, Any], env: Union[SimEnv, KubeEnv]):
         pass
 
+    def update(self, observation: np.array, timestamp: float = None):
+        """keep the latest observation for the predictions
+        """
+        self.observation = observation
+
+    def reset(self):
+        """reset the content of the object
+        """
+        pass
+
     @abstractmethod
     def recommender(self):
         """checks if the config of the worklaod is in
@@ -8,11 +8,15 @@ from typing import Dict, Any
 
 
 class NonMLInterface(ABC):
+    # the recommendation does not change with the observations,
+    # the env can fast forward to the next recreation
+    static_action = False
+
     def __init__(self, config: Dict[str, Any]):
         pass
 
     @abstractmethod
-    def update(self, observation: np.array):
+    def update(self, observation: np.array, timestamp: float = None):
         """update the resource usage
         """
         pass
@@ -9,7 +9,7 @@ class Random(NonMLInterface):
         self._check_config(config)
         self.action_space: RecommenderSpace = config['action_space']
 
-    def update(self, observation: np.array):
+    def update(self, observation: np.array, timestamp: float = None):
         pass
 
     def reset(self):
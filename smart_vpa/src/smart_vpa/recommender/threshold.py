@@ -4,6 +4,8 @@ from typing import Dict, Any
 
 
 class Threshold(NonMLInterface):
+    static_action = True
+
     def __init__(self, config: Dict[str, Any]):
         self._check_config(config)
         self.target_cpu = config['target']['cpu']
@@ -13,7 +15,7 @@ class Threshold(NonMLInterface):
         self.lower_bound_cpu = config['lower_bound']['cpu']
         self.lower_bound_memory = config['lower_bound']['memory']
 
-    def update(self, observation: np.array):
+    def update(self, observation: np.array, timestamp: float = None):
         pass
 
     def reset(self):
@@ -0,0 +1,10 @@
+from .fleet_replay import ( # noqa
+    FleetReplay,
+    load_progress,
+    replay_pod
+)
+from .evaluation import ( # noqa
+    RECOMMENDERS,
+    evaluate_container,
+    evaluate_cluster
+)
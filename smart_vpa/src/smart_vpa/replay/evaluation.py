@@ -0,0 +1,153 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List
+
+import pandas as pd
+
+from smart_vpa.envs import SimEnv
+from smart_vpa.recommender import (
+    Threshold,
+    Random,
+    Builtin
+)
+from smart_vpa.workload import WorkloadStore
+
+# the rl and lstm recommenders are not implemented yet
+RECOMMENDERS = {
+    'threshold': Threshold,
+    'random': Random,
+    'builtin': Builtin
+}
+
+
+def evaluate_container(container: Dict[str, Any], type_recommender: str,
+                       recommender_config: Dict[str, Any],
+                       seed: int = 100,
+                       reward_weights: Dict[str, Any] = None
+                       ) -> Dict[str, Any]:
+    """run a recommender over the whole workload of a container in
+    SimEnv without rendering and summarize its slack, overrun and
+    recreations, recommenders with a static action are fast forwarded
+    from recreation to recreation
+
+    Args:
+        container (Dict[str, Any]): container config with its
+        'workload' and 'time' e.g. WorkloadStore.container
+        type_recommender (str): one of RECOMMENDERS
+        recommender_config (Dict[str, Any]): config of the recommender
+        without the action space
+        seed (int, optional): seed of the env. Defaults to 100.
+        reward_weights (Dict[str, Any], optional): weights of the
+        Reward of the env. Defaults to the default weights.
+
+    Returns:
+        Dict[str, Any]: summed slack and overrun of the requests
+        (memory: Megabytes, cpu: Millicores, per timestep), number of
+        recreations, total reward, steps and wall time in seconds
+    """
+    config = dict(container, seed=seed, reward=reward_weights or {})
+    config.update({
+        'round-robin': False,
+        'formatted-info': False})
+    env = SimEnv(config)
+    recommender = RECOMMENDERS[type_recommender](
+        config=dict(recommender_config, action_space=env.action_space))
+    recommender.reset()
+    observation = env.reset()
+    # one pass over the workload
+    steps = env.total_timesteps - 1
+    start = time.perf_counter()
+    if recommender.static_action:
+        action = recommender.recommender()
+        while env.global_timestep < steps:
+            env.fast_forward(action)
+    else:
+        for _ in range(steps):
+            recommender.update(
+                observation=observation, timestamp=env.wall_time)
+            action = recommender.recommender()
+            observation, _, _, _ = env.step(action)
+    wall_time = time.perf_counter() - start
+    reward = env.reward
+    return {
+        'slack_memory': reward.slack[0],
+        'slack_cpu': reward.slack[1],
+        'overrun_memory': reward.overrun[0],
+        'overrun_cpu': reward.overrun[1],
+        'recreations': reward.recreations,
+        'total_reward': reward.total_reward,
+        'steps': reward.steps,
+        'wall_time': wall_time
+    }
+
+
+def _evaluate_shard(path: str, container_indices: List[int],
+                    type_recommender: str,
+                    recommender_config: Dict[str, Any], seed: int,
+                    reward_weights: Dict[str, Any]
+                    ) -> List[Dict[str, Any]]:
+    """worker of evaluate_cluster, evaluates a shard of the containers
+    from the memory mapped workload store
+    """
+    store = WorkloadStore(path)
+    results = []
+    for container_index in container_indices:
+        container = store.container(container_index)
+        result = {
+            'namespace': container.get('namespace'),
+            'pod': container['container_name'],
+            'recommender': type_recommender
+        }
+        result.update(evaluate_container(
+            container=container, type_recommender=type_recommender,
+            recommender_config=recommender_config, seed=seed,
+            reward_weights=reward_weights))
+        results.append(result)
+    return results
+
+
+def evaluate_cluster(path: str, recommenders: Dict[str, Dict[str, Any]],
+                     seed: int = 100, reward_weights: Dict[str, Any] = None,
+                     num_workers: int = None,
+                     shard_size: int = 16) -> pd.DataFrame:
+    """evaluate_container of every container of a workload store with
+    each of the recommenders in a pool of processes
+
+    Args:
+        path (str): folder of the workload store
+        recommenders (Dict[str, Dict[str, Any]]): recommender type to
+        its config e.g. {'builtin': builtin_config}
+        seed (int, optional): seed of the envs. Defaults to 100.
+        reward_weights (Dict[str, Any], optional): weights of the
+        Reward of the envs. Defaults to the default weights.
+        num_workers (int, optional): number of processes.
+        Defaults to the number of cpus.
+        shard_size (int, optional): number of containers sent to a
+        worker at once. Defaults to 16.
+
+    Returns:
+        pd.DataFrame: one row per container and recommender in the
+        order of the store
+
+    Raises:
+        ValueError: a recommender type that is not in RECOMMENDERS
+    """
+    unknown = [type_recommender for type_recommender in recommenders
+               if type_recommender not in RECOMMENDERS]
+    if unknown:
+        raise ValueError(
+            f"recommenders {unknown} can't be evaluated,"
+            f" choose from {list(RECOMMENDERS)}")
+    num_containers = len(WorkloadStore(path))
+    shards = [list(range(i, min(i + shard_size, num_containers)))
+              for i in range(0, num_containers, shard_size)]
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        futures = [
+            executor.submit(
+                _evaluate_shard, path, shard, type_recommender,
+                recommender_config, seed, reward_weights)
+            for type_recommender, recommender_config in recommenders.items()
+            for shard in shards]
+        results = [result for future in futures
+                   for result in future.result()]
+    return pd.DataFrame(results)
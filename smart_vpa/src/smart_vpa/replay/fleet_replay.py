@@ -0,0 +1,186 @@
+import os
+import json
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, List, Iterator
+
+import numpy as np
+
+from smart_vpa.recommender_initial import Builtin
+from smart_vpa.metrics import pod_metrics
+from smart_vpa.workload import WorkloadStore
+
+# completed pods of a replay, one json summary per line
+PROGRESS_FILE = 'progress.jsonl'
+
+
+def load_progress(output_path: str) -> List[Dict[str, Any]]:
+    """summaries of the pods already replayed into output_path
+    """
+    progress_path = os.path.join(output_path, PROGRESS_FILE)
+    if not os.path.exists(progress_path):
+        return []
+    summaries = []
+    with open(progress_path, 'r') as in_file:
+        for line in in_file:
+            # a partly written line of an interrupted run
+            # is replayed again
+            try:
+                summaries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return summaries
+
+
+def replay_pod(workload: np.array, time: np.array,
+               requests: Dict[str, float],
+               recommender_config: Dict[str, Any]) -> Dict[str, Any]:
+    """replay one pod through the Builtin recommender and summarize
+    its slacks and overruns against the real requests, the max usage
+    and the final Builtin target
+
+    Args:
+        workload (np.array): memory (Megabytes) and cpu (Millicores)
+        usage (2, timesteps)
+        time (np.array): time of the samples in seconds
+        requests (Dict[str, float]): real requests of the pod
+        recommender_config (Dict[str, Any]): arguments of
+        recommender_initial.Builtin
+
+    Returns:
+        Dict[str, Any]: the same statistics as the analysis script
+        in memory: Megabytes, cpu: Millicores, time: seconds
+    """
+    request_memory = requests['memory']
+    request_cpu = requests['cpu']
+    if recommender_config['margin']:
+        margin_fraction = 0.15
+    else:
+        margin_fraction = 0
+    recommender = Builtin(**recommender_config)
+    recommender.reset()
+    recommender.update_batch(
+        memory_usage=workload[0], cpu_usage=workload[1], timestamps=time)
+    recommendation = recommender.recommender()
+    request_builtin_final_memory = recommendation[[0, 2, 4]]
+    request_builtin_final_cpu = recommendation[[1, 3, 5]]
+    request_max_usage_memory = int(
+        np.max(workload[0]) * (1 + margin_fraction))
+    request_max_usage_cpu = int(
+        np.max(workload[1]) * (1 + margin_fraction))
+
+    metrics = pod_metrics(
+        usage=workload, time=time, offsets=[0, len(time)],
+        requests=[[request_memory], [request_cpu]],
+        predictions={
+            'max': [[request_max_usage_memory], [request_max_usage_cpu]],
+            'builtin': [[request_builtin_final_memory[1]],
+                        [request_builtin_final_cpu[1]]]
+        })
+    summary = {
+        'request_memory': request_memory,
+        'request_cpu': request_cpu,
+        'request_max_usage_memory': request_max_usage_memory,
+        'request_max_usage_cpu': request_max_usage_cpu,
+        'request_builtin_final_memory':
+            request_builtin_final_memory.tolist(),
+        'request_builtin_final_cpu': request_builtin_final_cpu.tolist(),
+    }
+    summary.update({key: value.item() for key, value in metrics.items()})
+    summary['avg_usage_memory'] = int(summary['avg_usage_memory'])
+    summary['avg_usage_cpu'] = int(summary['avg_usage_cpu'])
+    return summary
+
+
+def _replay_shard(path: str, pod_indices: List[int],
+                  recommender_config: Dict[str, Any]
+                  ) -> List[Dict[str, Any]]:
+    """worker of FleetReplay, replays a shard of the pods from the
+    memory mapped workload store
+    """
+    store = WorkloadStore(path)
+    summaries = []
+    for pod_index in pod_indices:
+        pod = store.containers[pod_index]
+        summary = {
+            'namespace': pod.get('namespace'),
+            'pod': pod['container_name'],
+        }
+        summary.update(replay_pod(
+            workload=store.workload(pod_index),
+            time=store.time(pod_index),
+            requests=pod['requests'],
+            recommender_config=recommender_config))
+        summaries.append(summary)
+    return summaries
+
+
+class FleetReplay:
+    def __init__(self, path: str, output_path: str,
+                 recommender_config: Dict[str, Any],
+                 num_workers: int = None, shard_size: int = 16):
+        """replays all the pods of a workload store through the
+        Builtin recommender in a pool of processes, the summary of
+        each pod is appended to the progress file of output_path as
+        soon as its shard is done, so an interrupted replay continues
+        from the pods that are not in there yet
+
+        Args:
+            path (str): folder of the workload store
+            output_path (str): folder of the progress file
+            recommender_config (Dict[str, Any]): arguments of
+            recommender_initial.Builtin
+            num_workers (int, optional): number of processes.
+            Defaults to the number of cpus.
+            shard_size (int, optional): number of pods sent to a worker
+            at once. Defaults to 16.
+        """
+        self.path = path
+        self.output_path = output_path
+        self.recommender_config = recommender_config
+        self.num_workers = num_workers
+        self.shard_size = shard_size
+        self.pods = WorkloadStore(path).containers
+
+    def run(self) -> Iterator[Dict[str, Any]]:
+        """replay the pods that are not in the progress file yet
+
+        Yields:
+            Dict[str, Any]: pod summaries in order of completion
+        """
+        if not os.path.exists(self.output_path):
+            os.makedirs(self.output_path)
+        done = {(summary['namespace'], summary['pod'])
+                for summary in load_progress(self.output_path)}
+        remaining = [i for i, pod in enumerate(self.pods)
+                     if (pod.get('namespace'), pod['container_name'])
+                     not in done]
+        shards = [remaining[i:i+self.shard_size]
+                  for i in range(0, len(remaining), self.shard_size)]
+        progress_path = os.path.join(self.output_path, PROGRESS_FILE)
+        with ProcessPoolExecutor(max_workers=self.num_workers) as executor, \
+                open(progress_path, 'a+') as progress_file:
+            # start on a new line after a partly written one
+            if progress_file.tell() > 0:
+                progress_file.seek(progress_file.tell() - 1)
+                if progress_file.read(1) != '\n':
+                    progress_file.write('\n')
+            futures = [
+                executor.submit(
+                    _replay_shard, self.path, shard,
+                    self.recommender_config)
+                for shard in shards]
+            for future in as_completed(futures):
+                summaries = future.result()
+                for summary in summaries:
+                    progress_file.write(json.dumps(summary) + '\n')
+                progress_file.flush()
+                for summary in summaries:
+                    yield summary
+
+    def results(self) -> List[Dict[str, Any]]:
+        """run the replay to the end and return the summaries of
+        all the pods including the ones of the previous runs
+        """
+        for _ in self.run():
+            pass
+        return load_progress(self.output_path)
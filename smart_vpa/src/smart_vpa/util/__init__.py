@@ -2,7 +2,12 @@ from .plot_workload import plot_workload # noqa
 from .plot_recommender import plot_recommender # noqa
 from .plot_slack import plot_slack # noqa
 from .plot_histogram import plot_histogram # noqa
-from .histogram import Histogram # noqa
+from .histogram import ( # noqa
+    Histogram,
+    checkpoint_to_bytes,
+    checkpoint_from_bytes
+)
+from .histogram_bank import HistogramBank # noqa
 from .estimator import Estimator # noqa
 from .types import ( # noqa
     cores_to_millicores,
@@ -1,5 +1,19 @@
 import numpy as np
-from math import log
+import struct
+from copy import deepcopy
+from math import log, floor
+from typing import Dict, Any, Tuple
+
+# MaxCheckpointWeight in histogram.go
+MAX_CHECKPOINT_WEIGHT = 10000
+# maxDecayExponent in decaying_histogram.go
+MAX_DECAY_EXPONENT = 100
+# (first_bucket_size, max_value, ratio) -> bins boundries
+_BIN_BOUNDARIES_CACHE: Dict[Tuple[float, float, float], np.ndarray] = {}
+CHECKPOINT_HEADER = struct.Struct('<ddQI')
+# relative distance of the percentile thresholds from the partial
+# sums of the buckets that cached percentiles are trusted within
+PERCENTILE_TOLERANCE = 1e-9
 
 
 # look TestPercentileEstimator in the estimator_test.go for every option
@@ -72,11 +86,25 @@ class Histogram:
         self.time_decay = time_decay
         self.total_timesteps = 0
         self.bin_boundaries = self.gen_bin_boundaries()
+        if self.ratio != 1:
+            self._log_ratio = log(self.ratio)
         self.bucket_weight = np.zeros(self.num_buckets)
         self.min_bucket = self.num_buckets
         self.max_bucket = 0
         self.reference_time = reference_timestamp
         self.total_sample_count = 0
+        self._total_weight = 0.0
+        # cumulative weights of [min_bucket, max_bucket) buckets
+        # rebuilt lazily on the first percentile query after a change
+        self._cumulative_weight = None
+        # mutation counter, bumped on every change of the weights
+        self.version = 0
+        # the last percentiles query and the partial sums around each
+        # of its buckets, add_sample keeps it while no quantile moves
+        self._percentiles_cache = None
+        # bumped whenever the cached percentiles are recomputed or
+        # dropped, same value means the same percentiles values
+        self.percentiles_version = 0
 
     def add_sample(self, value: float, weight: float, timestamp: float = 1.0):
         """add a new sample to the histogram
@@ -101,6 +129,9 @@ class Histogram:
             weight *= self.decay_factor(timestamp)
         bucket = self.find_bucket(value)
         self.bucket_weight[bucket] += weight
+        self._total_weight += weight
+        self._cumulative_weight = None
+        self.version += 1
         if bucket < self.min_bucket\
            and self.bucket_weight[bucket] >= self.epsilon:
             self.min_bucket = bucket
@@ -108,23 +139,99 @@ class Histogram:
            and self.bucket_weight[bucket] >= self.epsilon:
             self.max_bucket = bucket
         self.total_sample_count += 1
+        if self._percentiles_cache is not None:
+            self._track_percentiles(bucket, weight)
 
-    def gen_bin_boundaries(self) -> list:
-        """make growing bins according to the vpa algroithm
+    def add_samples(self, values: np.ndarray, weights: np.ndarray,
+                    timestamps: np.ndarray = 1.0):
+        """vectorized version of add_sample for adding a batch of
+        samples at once, the resulting histogram is the same as
+        calling add_sample on each sample in order
+
+        Args:
+            values (np.ndarray): the values of the resource usage
+            weights (np.ndarray): the weights of the resource usage
+            (might be decayed based on timestamps)
+            timestamps (np.ndarray, optional): timestamps for the decaying
+            histograams. Defaults to 1.0.
+
+        Raises:
+            ValueError: weights should not be negative
+        """
+        values, weights, timestamps = np.broadcast_arrays(
+            np.asarray(values, dtype=float),
+            np.asarray(weights, dtype=float),
+            np.asarray(timestamps, dtype=float))
+        values = values.ravel()
+        weights = weights.ravel()
+        timestamps = timestamps.ravel()
+        if values.size == 0:
+            return
+        if np.any(weights < 0):
+            raise ValueError("sample weight must be non-negative")
+        buckets = self.find_buckets(values)
+        if not self.time_decay:
+            self._accumulate(buckets, weights)
+            return
+        # split the batch where add_sample would have shifted the
+        # reference timestamp so the renormalization happens at
+        # the same samples as in the one by one additions
+        start = 0
+        while start < values.size:
+            max_allowed_timestamp = self.reference_time +\
+                self.half_life * MAX_DECAY_EXPONENT
+            too_late = np.flatnonzero(
+                timestamps[start:] > max_allowed_timestamp)
+            if too_late.size == 0:
+                end = values.size
+            elif too_late[0] == 0:
+                self.shift_reference_timestamp(timestamps[start])
+                continue
+            else:
+                end = start + too_late[0]
+            self._accumulate(
+                buckets[start:end],
+                weights[start:end] * self.decay_factors(
+                    timestamps[start:end]))
+            start = end
+
+    def _accumulate(self, buckets: np.ndarray, weights: np.ndarray):
+        """add already decayed weights to their buckets in order,
+        used by add_samples
+        """
+        # unlike bincount add.at accumulates in the samples order
+        # so the weights are the same as the one by one additions
+        np.add.at(self.bucket_weight, buckets, weights)
+        # cumsum adds sequentially like the running total in add_sample
+        self._total_weight = float(np.cumsum(
+            np.concatenate(([self._total_weight], weights)))[-1])
+        self._weights_changed()
+        # weights are non-negative so a bucket passes the epsilon
+        # check iff its final weight passes it
+        touched = np.unique(buckets)
+        touched = touched[self.bucket_weight[touched] >= self.epsilon]
+        if touched.size:
+            self.min_bucket = min(self.min_bucket, int(touched[0]))
+            self.max_bucket = max(self.max_bucket, int(touched[-1]))
+        self.total_sample_count += buckets.size
+
+    def gen_bin_boundaries(self) -> np.ndarray:
+        """make growing bins according to the vpa algroithm, the
+        bins are made once per (first_bucket_size, max_value, ratio)
+        and shared read-only between the histograms
 
         From:
             histrogram_options.go
 
         Returns:
-            list: bins boundries
+            np.ndarray: bins boundries
         """
-        bins = [0, self.first_bucket_size]
-        next_bucket = self.first_bucket_size
-        while next_bucket <= self.max_value:
-            bucket_length = bins[-1] - bins[-2]
-            bucket_length *= self.ratio
-            next_bucket += bucket_length
-            bins.append(next_bucket)
+        key = (self.first_bucket_size, self.max_value, self.ratio)
+        bins = _BIN_BOUNDARIES_CACHE.get(key)
+        if bins is None:
+            bins = make_bin_boundaries(*key)
+            bins.flags.writeable = False
+            _BIN_BOUNDARIES_CACHE[key] = bins
         return bins
 
     def percentile(self, percentile: float) -> float:
@@ -139,18 +246,110 @@ class Histogram:
         Returns:
             float: requetsted percentile bin value
         """
-        partial_sum = 0
-        threshold = percentile * self.total_weight
-        bucket = self.min_bucket
-        for bucket in range(self.min_bucket, self.max_bucket):
-            partial_sum += self.bucket_weight[bucket]
-            if partial_sum >= threshold:
-                break
-        else:
-            bucket += 1
-        if bucket < self.num_buckets-1:
-            return self.get_bucket_start(bucket+1)
-        return self.get_bucket_start(bucket)
+        # a scalar query, the cached list of percentiles is kept
+        return float(self.percentiles(percentile))
+
+    def percentiles(self, percentiles: list) -> np.ndarray:
+        """compute several percentiles of the usage histogram
+        in one pass over the cumulative weights
+
+        Args:
+            percentiles (list): the requested percentiles
+
+        Returns:
+            np.ndarray: requetsted percentiles bin values in the
+            same order as the input percentiles
+        """
+        percentiles = np.asarray(percentiles, dtype=float)
+        cache = self._percentiles_cache
+        if cache is not None and\
+           cache['percentiles'] == percentiles.tolist():
+            return cache['values'].copy()
+        if self.is_empty():
+            return np.zeros(percentiles.shape)
+        thresholds = percentiles * self.total_weight
+        # first bucket that its partial sum from min_bucket reaches
+        # each threshold, max_bucket if none of them does
+        offsets = np.searchsorted(
+            self.cumulative_weight, thresholds, side='left')
+        buckets = self.min_bucket + offsets
+        # end of the bucket, or start of the last bucket as
+        # the last bucket doesn't have an upper bound
+        buckets = np.where(
+            buckets < self.num_buckets-1, buckets+1, buckets)
+        values = self.bin_boundaries[buckets]
+        # only lists of percentiles are cached, a scalar query
+        # leaves the cache of the last list as it is
+        if percentiles.ndim == 1:
+            self._cache_percentiles(percentiles, offsets)
+            self._percentiles_cache['values'] = values.copy()
+        return values
+
+    def _cache_percentiles(self, percentiles: np.ndarray,
+                           offsets: np.ndarray):
+        """keep the buckets of the percentiles with the partial sums
+        around them for _track_percentiles
+
+        Args:
+            percentiles (np.ndarray): the requested percentiles
+            offsets (np.ndarray): their buckets from min_bucket
+        """
+        # partial sums before and up to each of the buckets, the
+        # percentile stays in its bucket as long as the threshold
+        # is above the first one and not above the second one
+        partial_sums = np.concatenate(
+            ([-np.inf], self.cumulative_weight, [np.inf]))
+        self._percentiles_cache = {
+            'percentiles': percentiles.tolist(),
+            'buckets': (self.min_bucket + offsets).tolist(),
+            'below': partial_sums[offsets].tolist(),
+            'through': partial_sums[offsets+1].tolist(),
+            'min_bucket': self.min_bucket,
+            'max_bucket': self.max_bucket
+        }
+        self.percentiles_version += 1
+
+    def _track_percentiles(self, bucket: int, weight: float):
+        """update the partial sums of the cached percentiles with a
+        sample added by add_sample and drop the cache once a
+        percentile might have left its bucket, O(1) per percentile
+
+        Args:
+            bucket (int): bucket of the added sample
+            weight (float): the (decayed) weight of the sample
+        """
+        cache = self._percentiles_cache
+        if self.min_bucket != cache['min_bucket'] or\
+           self.max_bucket != cache['max_bucket'] or\
+           bucket < self.min_bucket or bucket > self.max_bucket:
+            self._drop_percentiles()
+            return
+        below = cache['below']
+        through = cache['through']
+        # the running sums might differ from a new cumsum in the last
+        # digits, keep the thresholds a bit away from the partial sums
+        tolerance = PERCENTILE_TOLERANCE * self._total_weight
+        for i, cached_bucket in enumerate(cache['buckets']):
+            if bucket < cached_bucket:
+                below[i] += weight
+            if bucket <= cached_bucket:
+                through[i] += weight
+            threshold = cache['percentiles'][i] * self._total_weight
+            if not below[i] < threshold - tolerance or\
+               not threshold + tolerance <= through[i]:
+                self._drop_percentiles()
+                return
+
+    def _drop_percentiles(self):
+        self._percentiles_cache = None
+        self.percentiles_version += 1
+
+    def _weights_changed(self):
+        """forget everything computed from the previous weights"""
+        self._cumulative_weight = None
+        self.version += 1
+        if self._percentiles_cache is not None:
+            self._drop_percentiles()
 
     def decay_factor(self, timestamp: float) -> float:
         """ USed in A histogram that gives newer samples a higher weight than
@@ -166,14 +365,40 @@ class Histogram:
         Args:
             timestamp : timestamp of the adding sample
 
+        The exponent is kept below MAX_DECAY_EXPONENT by shifting
+        the reference timestamp (and rescaling the weights) whenever
+        a sample is too far ahead of it, so the weights stay bounded
+        on unbounded-length traces.
+
         Returns:
             float: the multiplier decaying facotr
         """
-        # TODO add other stuff in the decay_factor code
+        # max timestamp before the exponent grows too large
+        max_allowed_timestamp = self.reference_time +\
+            self.half_life * MAX_DECAY_EXPONENT
+        if timestamp > max_allowed_timestamp:
+            # the exponent has grown too large, renormalize the histogram
+            # by shifting the reference_time to the current timestamp
+            # and rescaling the weights accordingly
+            self.shift_reference_timestamp(timestamp)
         time_elapsed = float(timestamp - self.reference_time)
         decay_factor = np.exp2(time_elapsed / self.half_life)
         return decay_factor
 
+    def decay_factors(self, timestamps: np.ndarray) -> np.ndarray:
+        """vectorized version of decay_factor, it does not shift
+        the reference timestamp (add_samples takes care of that)
+
+        Args:
+            timestamps (np.ndarray): timestamps of the adding samples
+
+        Returns:
+            np.ndarray: the multiplier decaying factors
+        """
+        time_elapsed = np.asarray(timestamps, dtype=float) -\
+            self.reference_time
+        return np.exp2(time_elapsed / self.half_life)
+
     def find_bucket(self, value: float) -> int:
         """Returns the index of the bucket for given value.
         This is the inverse function to
@@ -201,18 +426,63 @@ class Histogram:
             if value < self.first_bucket_size:
                 return 0
             bucket = int(log(
-                value*(self.ratio-1)/self.first_bucket_size+1, self.ratio))
+                value*(self.ratio-1)/self.first_bucket_size+1) /
+                self._log_ratio)
             if bucket >= self.num_buckets:
                 return self.num_buckets - 1
             return bucket
 
+    def find_buckets(self, values: np.ndarray) -> np.ndarray:
+        """vectorized version of find_bucket, returns the
+        same indices as calling find_bucket on each value
+
+        Args:
+            values (np.ndarray): the values to find the buckets of
+
+        Returns:
+            np.ndarray: the bucket index of each value
+        """
+        values = np.asarray(values, dtype=float)
+        # linear histogram
+        if self.ratio == 1:
+            buckets = np.clip(
+                values/self.first_bucket_size, 0, self.num_buckets)
+            buckets = buckets.astype(np.int64)
+        # exponential histogram
+        else:
+            scaled = np.maximum(
+                values*(self.ratio-1)/self.first_bucket_size+1, 1)
+            exponents = np.log(scaled) / self._log_ratio
+            # np.log and math.log might differ in the last digit, redo
+            # the values right on the bucket boundaries with math.log
+            # so they land in the same bucket as in find_bucket
+            close = np.flatnonzero(
+                np.abs(exponents - np.rint(exponents)) < 1e-9)
+            for i in close:
+                exponents[i] = log(scaled[i]) / self._log_ratio
+            buckets = np.minimum(exponents, self.num_buckets)
+            buckets = buckets.astype(np.int64)
+            buckets[values < self.first_bucket_size] = 0
+        return np.minimum(buckets, self.num_buckets - 1)
+
     @property
     def num_buckets(self):
         return len(self.bin_boundaries)
 
     @property
     def total_weight(self):
-        return sum(self.bucket_weight)
+        return self._total_weight
+
+    @property
+    def cumulative_weight(self) -> np.ndarray:
+        """partial sums of the bucket weights from min_bucket
+        up to (not including) max_bucket, only recomputed after
+        the histogram has changed
+        """
+        if self._cumulative_weight is None:
+            self._cumulative_weight = np.cumsum(
+                self.bucket_weight[self.min_bucket:self.max_bucket])
+        return self._cumulative_weight
 
     def get_bucket_start(self, bucket):
         """
@@ -227,67 +497,258 @@ class Histogram:
     def get_bucket_end(self, bucket):
         return self.bin_boundaries[bucket+1]
 
-# TODO remaining fucntionalities for later (if needed)
-# -------- from decaying_histogram_options.go --------
-    def shift_reference_timestamp(self, other):
-        """
+# -------- from decaying_histogram.go --------
+    def shift_reference_timestamp(self, new_reference_timestamp: float):
+        """shift the reference timestamp of the decaying histogram
+        and rescale all the weights accordingly
+
         From:
-            decaying_histogram_options.go
+            decaying_histogram.go
+
+        Args:
+            new_reference_timestamp (float): the new reference timestamp,
+            rounded to an integer multiple of half_life
         """
-        raise NotImplementedError
+        # make sure the decay start is an integer multiple of half_life
+        new_reference_timestamp = floor(
+            new_reference_timestamp / self.half_life + 0.5) * self.half_life
+        exponent = floor(
+            (self.reference_time - new_reference_timestamp) /
+            self.half_life + 0.5)
+        # scale all weights by 2^exponent
+        self.scale(np.exp2(exponent))
+        self.reference_time = new_reference_timestamp
 
 # -------- from histogram.go --------
     def scale(self, factor: float):
-        """
+        """multiply all the weights of the histogram by a
+        non-negative factor
+
         From:
             histogram.go
+
+        Raises:
+            ValueError: scale factor should not be negative
         """
-        raise NotImplementedError
+        if factor < 0:
+            raise ValueError("scale factor must be non-negative")
+        self.bucket_weight[self.min_bucket:self.max_bucket+1] *= factor
+        self._total_weight *= factor
+        # some buckets might became empty (weight < epsilon),
+        # so need to update min/max buckets
+        self.update_min_and_max_bucket()
 
     def update_min_and_max_bucket(self):
-        """
+        """move min_bucket and max_bucket to the first and last
+        buckets with at least epsilon weight
+
         From:
             histogram.go
         """
-        raise NotImplementedError
-
-# -------- both histogram.go and decaying_histogram_optiones.go --------
-
-    def equals(self, other):
+        self._weights_changed()
+        non_empty = np.flatnonzero(
+            self.bucket_weight[self.min_bucket:self.max_bucket+1] >=
+            self.epsilon)
+        if non_empty.size == 0:
+            self.min_bucket = self.num_buckets
+            self.max_bucket = 0
+            return
+        self.max_bucket = self.min_bucket + int(non_empty[-1])
+        self.min_bucket = self.min_bucket + int(non_empty[0])
+
+# -------- both histogram.go and decaying_histogram.go --------
+
+    def equals(self, other) -> bool:
         """
         From:
-            histogram.go and decaying_histogram_options.go
+            histogram.go and decaying_histogram.go
         """
-        raise NotImplementedError
+        if not isinstance(other, Histogram) or\
+           self.options != other.options or\
+           self.min_bucket != other.min_bucket or\
+           self.max_bucket != other.max_bucket:
+            return False
+        if self.time_decay and (
+           self.half_life != other.half_life or
+           self.reference_time != other.reference_time):
+            return False
+        diff = self.bucket_weight[self.min_bucket:self.max_bucket+1] -\
+            other.bucket_weight[self.min_bucket:self.max_bucket+1]
+        return bool(np.all(np.abs(diff) <= 1e-15))
 
     def merge(self, other):
-        """
+        """add all the samples of the other histogram to this one
+
         From:
-            histogram.go and decaying_histogram_options.go
-        """
-        raise NotImplementedError
+            histogram.go and decaying_histogram.go
 
-    def is_empty(self, other):
+        Raises:
+            ValueError: only histograms with the same options can be merged
+        """
+        if self.options != other.options:
+            raise ValueError("can't merge histograms with different options")
+        if self.time_decay:
+            if self.half_life != other.half_life:
+                raise ValueError("can't merge decaying histograms with"
+                                 " different half life periods")
+            # align the older reference_time with the younger one
+            if self.reference_time < other.reference_time:
+                self.shift_reference_timestamp(other.reference_time)
+            elif other.reference_time < self.reference_time:
+                other = deepcopy(other)
+                other.shift_reference_timestamp(self.reference_time)
+        if not other.is_empty():
+            buckets = slice(other.min_bucket, other.max_bucket+1)
+            self.bucket_weight[buckets] += other.bucket_weight[buckets]
+            self.min_bucket = min(self.min_bucket, other.min_bucket)
+            self.max_bucket = max(self.max_bucket, other.max_bucket)
+        self._total_weight += other.total_weight
+        self._weights_changed()
+        self.total_sample_count += other.total_sample_count
+
+    def is_empty(self) -> bool:
         """
         From:
-            histogram.go and decaying_histogram_options.go
+            histogram.go
         """
-        raise NotImplementedError
+        if self.min_bucket >= self.num_buckets:
+            return True
+        return self.bucket_weight[self.min_bucket] < self.epsilon
 
-    def save_to_checkpoint(self, other):
+    def save_to_checkpoint(self) -> Dict[str, Any]:
         """
         From:
-            histogram.go and decaying_histogram_options.go
+            histogram.go and decaying_histogram.go
             produce a compact representation of the
-            histogram with dictionaries
+            histogram with dictionaries, only the non-empty buckets
+            are kept and their weights are quantized to integers in
+            [0, MAX_CHECKPOINT_WEIGHT] (HistogramCheckpoint in
+            vpa_types)
         """
-        raise NotImplementedError
-
-    def load_from_checkpoint(self, other):
+        buckets = np.arange(self.min_bucket, self.max_bucket+1,
+                            dtype=np.int32)
+        weights = self.bucket_weight[self.min_bucket:self.max_bucket+1]
+        if weights.size and weights.max() > 0:
+            weights = np.round(
+                weights * (MAX_CHECKPOINT_WEIGHT / weights.max()))
+        # drop near-zero weights
+        keep = weights > 0
+        checkpoint = {
+            'total_weight': self.total_weight,
+            'total_sample_count': self.total_sample_count,
+            'reference_timestamp': self.reference_time,
+            'buckets': buckets[keep],
+            'bucket_weights': weights[keep].astype(np.uint32)
+        }
+        return checkpoint
+
+    def load_from_checkpoint(self, checkpoint: Dict[str, Any]):
         """
         From:
-            histogram.go and decaying_histogram_options.go
+            histogram.go and decaying_histogram.go
             returns back the histogram from the compact
-            representation
+            representation, the checkpoint weights are added
+            to the current weights
+
+        Raises:
+            ValueError: checkpoint does not fit in the histogram
+        """
+        if checkpoint['total_weight'] < 0:
+            raise ValueError("cannot load checkpoint with negative"
+                             f" weight {checkpoint['total_weight']}")
+        buckets = np.asarray(checkpoint['buckets'], dtype=np.int64)
+        weights = np.asarray(checkpoint['bucket_weights'], dtype=float)
+        if buckets.size and buckets.max() >= self.num_buckets:
+            raise ValueError(f"checkpoint has bucket {buckets.max()} that"
+                             " is exceeding histogram buckets"
+                             f" {self.num_buckets}")
+        if buckets.size and buckets.min() < 0:
+            raise ValueError(
+                f"checkpoint has a negative bucket {buckets.min()}")
+        if self.time_decay:
+            self.reference_time = checkpoint['reference_timestamp']
+        weights_sum = weights.sum()
+        if weights_sum == 0:
+            return
+        ratio = checkpoint['total_weight'] / weights_sum
+        self.bucket_weight[buckets] += weights * ratio
+        self.min_bucket = min(self.min_bucket, int(buckets.min()))
+        self.max_bucket = max(self.max_bucket, int(buckets.max()))
+        self._total_weight += checkpoint['total_weight']
+        self._weights_changed()
+        self.total_sample_count += checkpoint['total_sample_count']
+
+    @property
+    def options(self) -> Tuple[float, float, float, float]:
+        """the bucketing options, histograms can only be merged
+        and compared if they have the same options
+
+        From:
+            histogram_options.go
         """
-        raise NotImplementedError
+        return (self.max_value, self.first_bucket_size,
+                self.ratio, self.epsilon)
+
+
+def checkpoint_to_bytes(checkpoint: Dict[str, Any]) -> bytes:
+    """pack a histogram checkpoint into a compact binary format
+
+    header: total_weight, reference_timestamp (float64),
+            total_sample_count (uint64), number of buckets (uint32)
+    body:   bucket indices (int32), bucket weights (uint32)
+    """
+    buckets = np.asarray(checkpoint['buckets'], dtype='<i4')
+    weights = np.asarray(checkpoint['bucket_weights'], dtype='<u4')
+    header = CHECKPOINT_HEADER.pack(
+        checkpoint['total_weight'],
+        checkpoint['reference_timestamp'],
+        checkpoint['total_sample_count'],
+        buckets.size)
+    return header + buckets.tobytes() + weights.tobytes()
+
+
+def checkpoint_from_bytes(data: bytes) -> Dict[str, Any]:
+    """unpack a histogram checkpoint made by checkpoint_to_bytes
+    """
+    total_weight, reference_timestamp, total_sample_count, size =\
+        CHECKPOINT_HEADER.unpack_from(data)
+    offset = CHECKPOINT_HEADER.size
+    buckets = np.frombuffer(data, dtype='<i4', count=size, offset=offset)
+    offset += buckets.nbytes
+    weights = np.frombuffer(data, dtype='<u4', count=size, offset=offset)
+    checkpoint = {
+        'total_weight': total_weight,
+        'total_sample_count': total_sample_count,
+        'reference_timestamp': reference_timestamp,
+        'buckets': buckets,
+        'bucket_weights': weights
+    }
+    return checkpoint
+
+
+def make_bin_boundaries(first_bucket_size: float, max_value: float,
+                        ratio: float) -> np.ndarray:
+    """start of every bucket, bucket n >= 1 starts at
+        firstBucketSize * (ratio^n - 1) / (ratio - 1)
+    (or firstBucketSize * n for linear histograms) and the last
+    bucket is the first one that starts after max_value
+
+    From:
+        GetBucketStart in histrogram_options.go
+    """
+    if ratio == 1:
+        num_buckets = int(max_value / first_bucket_size) + 2
+    else:
+        num_buckets = int(log(
+            max_value*(ratio-1)/first_bucket_size+1) / log(ratio)) + 3
+    buckets = np.arange(num_buckets + 1)
+    if ratio == 1:
+        bins = first_bucket_size * buckets.astype(float)
+    else:
+        bins = first_bucket_size * (
+            np.power(ratio, buckets.astype(float)) - 1) / (ratio - 1)
+    # the first bucket always covers [0..first_bucket_size)
+    bins[1] = first_bucket_size
+    last_bucket = max(
+        int(np.searchsorted(bins, max_value, side='right')), 1)
+    return bins[:last_bucket+1]
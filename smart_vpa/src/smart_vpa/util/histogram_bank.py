@@ -0,0 +1,219 @@
+import numpy as np
+
+from .histogram import Histogram, MAX_DECAY_EXPONENT
+
+
+class HistogramBank:
+    def __init__(self,
+                 num_histograms,
+                 max_value,
+                 first_bucket_size,
+                 ratio=1.05,
+                 epsilon=0.0001,
+                 half_life=24*3600,
+                 time_interval=60,
+                 time_decay=True,
+                 reference_timestamp=0) -> None:
+        """Many histograms with the same options stored in one array,
+        each row of the arrays is the state of one container's
+        histogram and behaves like a Histogram with these options
+
+        Args:
+            num_histograms (int): number of histograms (containers)
+
+            rest of the arguments are the same as Histogram
+        """
+        # bucket layout shared by all the rows
+        self.layout = Histogram(
+            max_value=max_value,
+            first_bucket_size=first_bucket_size,
+            ratio=ratio,
+            epsilon=epsilon,
+            half_life=half_life,
+            time_interval=time_interval,
+            time_decay=time_decay,
+            reference_timestamp=reference_timestamp)
+        self.num_histograms = num_histograms
+        self.epsilon = epsilon
+        self.half_life = half_life
+        self.time_decay = time_decay
+        self.bin_boundaries = self.layout.bin_boundaries
+        self.num_buckets = self.layout.num_buckets
+        self.bucket_weight = np.zeros((num_histograms, self.num_buckets))
+        self.min_bucket = np.full(num_histograms, self.num_buckets)
+        self.max_bucket = np.zeros(num_histograms, dtype=int)
+        self.total_weight = np.zeros(num_histograms)
+        self.total_sample_count = np.zeros(num_histograms, dtype=int)
+        self.reference_time = np.full(
+            num_histograms, reference_timestamp, dtype=float)
+
+    def add_samples(self, container_ids: np.ndarray, values: np.ndarray,
+                    timestamps: np.ndarray = 1.0, weights: np.ndarray = 1.0):
+        """add a batch of samples of several containers, each row ends
+        up the same as calling Histogram.add_sample on its samples in
+        order
+
+        Args:
+            container_ids (np.ndarray): the row of each sample
+            values (np.ndarray): the values of the resource usage
+            timestamps (np.ndarray, optional): timestamps for the decaying
+            histograams. Defaults to 1.0.
+            weights (np.ndarray, optional): the weights of the resource
+            usage. Defaults to 1.0.
+
+        Raises:
+            ValueError: weights should not be negative
+        """
+        container_ids, values, timestamps, weights = np.broadcast_arrays(
+            np.asarray(container_ids, dtype=int),
+            np.asarray(values, dtype=float),
+            np.asarray(timestamps, dtype=float),
+            np.asarray(weights, dtype=float))
+        container_ids = container_ids.ravel()
+        timestamps = timestamps.ravel()
+        weights = weights.ravel()
+        if np.any(weights < 0):
+            raise ValueError("sample weight must be non-negative")
+        buckets = self.layout.find_buckets(values.ravel())
+        if not self.time_decay:
+            self._accumulate(container_ids, buckets, weights)
+            return
+        # add the samples of each row up to the first one that needs
+        # a reference timestamp shift, shift those rows and repeat
+        # with the rest of the samples
+        remaining = np.arange(container_ids.size)
+        while remaining.size:
+            ids = container_ids[remaining]
+            max_allowed_timestamp = self.reference_time[ids] +\
+                self.half_life * MAX_DECAY_EXPONENT
+            too_late = np.flatnonzero(
+                timestamps[remaining] > max_allowed_timestamp)
+            first_too_late = np.full(self.num_histograms, remaining.size)
+            np.minimum.at(first_too_late, ids[too_late], too_late)
+            on_time = np.arange(remaining.size) < first_too_late[ids]
+            samples = remaining[on_time]
+            self._accumulate(
+                container_ids[samples], buckets[samples],
+                weights[samples] * self.decay_factors(
+                    container_ids[samples], timestamps[samples]))
+            rows = np.flatnonzero(first_too_late < remaining.size)
+            if rows.size:
+                self.shift_reference_timestamp(
+                    rows, timestamps[remaining[first_too_late[rows]]])
+            remaining = remaining[~on_time]
+
+    def _accumulate(self, container_ids: np.ndarray, buckets: np.ndarray,
+                    weights: np.ndarray):
+        """add already decayed weights to their rows and buckets in
+        order, used by add_samples
+        """
+        np.add.at(self.bucket_weight, (container_ids, buckets), weights)
+        np.add.at(self.total_weight, container_ids, weights)
+        np.add.at(self.total_sample_count, container_ids, 1)
+        non_empty = self.bucket_weight[container_ids, buckets] >=\
+            self.epsilon
+        np.minimum.at(self.min_bucket, container_ids[non_empty],
+                      buckets[non_empty])
+        np.maximum.at(self.max_bucket, container_ids[non_empty],
+                      buckets[non_empty])
+
+    def decay_factors(self, container_ids: np.ndarray,
+                      timestamps: np.ndarray) -> np.ndarray:
+        """Histogram.decay_factors with each row's reference timestamp
+        """
+        time_elapsed = timestamps - self.reference_time[container_ids]
+        return np.exp2(time_elapsed / self.half_life)
+
+    def shift_reference_timestamp(self, container_ids: np.ndarray,
+                                  new_reference_timestamps: np.ndarray):
+        """Histogram.shift_reference_timestamp for the given rows
+        """
+        new_reference_timestamps = np.floor(
+            new_reference_timestamps / self.half_life + 0.5) *\
+            self.half_life
+        exponents = np.floor(
+            (self.reference_time[container_ids] -
+             new_reference_timestamps) / self.half_life + 0.5)
+        factors = np.exp2(exponents)
+        # like Histogram.scale only [min_bucket, max_bucket] is scaled
+        buckets = np.arange(self.num_buckets)
+        in_range = (
+            buckets >= self.min_bucket[container_ids, np.newaxis]) & (
+            buckets <= self.max_bucket[container_ids, np.newaxis])
+        weights = self.bucket_weight[container_ids]
+        self.bucket_weight[container_ids] = np.where(
+            in_range, weights * factors[:, np.newaxis], weights)
+        self.total_weight[container_ids] *= factors
+        self.reference_time[container_ids] = new_reference_timestamps
+        self.update_min_and_max_bucket(container_ids)
+
+    def update_min_and_max_bucket(self, container_ids: np.ndarray):
+        """Histogram.update_min_and_max_bucket for the given rows
+        """
+        non_empty = self.bucket_weight[container_ids] >= self.epsilon
+        has_samples = non_empty.any(axis=1)
+        self.min_bucket[container_ids] = np.where(
+            has_samples, non_empty.argmax(axis=1), self.num_buckets)
+        self.max_bucket[container_ids] = np.where(
+            has_samples,
+            self.num_buckets - 1 - non_empty[:, ::-1].argmax(axis=1), 0)
+
+    def is_empty(self) -> np.ndarray:
+        """Histogram.is_empty of every row
+        """
+        min_bucket = np.minimum(self.min_bucket, self.num_buckets - 1)
+        return (self.min_bucket >= self.num_buckets) |\
+            (self.bucket_weight[np.arange(self.num_histograms),
+                                min_bucket] < self.epsilon)
+
+    def percentiles(self, percentiles: list) -> np.ndarray:
+        """Histogram.percentiles of every row
+
+        Args:
+            percentiles (list): the requested percentiles
+
+        Returns:
+            np.ndarray: requetsted percentiles bin values
+            (containers x percentiles)
+        """
+        buckets = np.arange(self.num_buckets)
+        in_range = (buckets >= self.min_bucket[:, np.newaxis]) &\
+            (buckets < self.max_bucket[:, np.newaxis])
+        # the leading zeros keep the partial sums from min_bucket
+        # the same as in Histogram.cumulative_weight
+        cumulative_weight = np.cumsum(
+            np.where(in_range, self.bucket_weight, 0), axis=1)
+        results = np.zeros((self.num_histograms, len(percentiles)))
+        for i, percentile in enumerate(percentiles):
+            thresholds = percentile * self.total_weight
+            # first bucket that its partial sum from min_bucket reaches
+            # the threshold, max_bucket if none of them does
+            bucket = self.min_bucket + np.count_nonzero(
+                in_range &
+                (cumulative_weight < thresholds[:, np.newaxis]), axis=1)
+            bucket = np.where(bucket < self.num_buckets-1, bucket+1, bucket)
+            bucket = np.minimum(bucket, self.num_buckets-1)
+            results[:, i] = self.bin_boundaries[bucket]
+        results[self.is_empty()] = 0.0
+        return results
+
+    def histogram(self, container_id: int) -> Histogram:
+        """copy of one row as a standalone Histogram
+        e.g. for checkpointing or plotting
+        """
+        histogram = Histogram(
+            max_value=self.layout.max_value,
+            first_bucket_size=self.layout.first_bucket_size,
+            ratio=self.layout.ratio,
+            epsilon=self.epsilon,
+            half_life=self.half_life,
+            time_interval=self.layout.time_interval,
+            time_decay=self.time_decay,
+            reference_timestamp=self.reference_time[container_id])
+        histogram.bucket_weight[:] = self.bucket_weight[container_id]
+        histogram.min_bucket = int(self.min_bucket[container_id])
+        histogram.max_bucket = int(self.max_bucket[container_id])
+        histogram._total_weight = float(self.total_weight[container_id])
+        histogram.total_sample_count = int(
+            self.total_sample_count[container_id])
+        return histogram
@@ -1 +1,7 @@
 from .workload_generator import SyntheticWorkloadGenerator # noqa
+from .store import ( # noqa
+    WorkloadStore,
+    write_store,
+    merge_stores,
+    load_workloads
+)
@@ -0,0 +1,174 @@
+import os
+import json
+from typing import Dict, Any, List, Tuple
+
+import numpy as np
+
+# files of a workload store
+USAGE_FILE = 'usage.npy'
+TIME_FILE = 'time.npy'
+OFFSETS_FILE = 'offsets.npy'
+CONTAINERS_FILE = 'containers.json'
+# keys of a lazy config, the workloads are read from the store
+STORE_PATH_KEY = 'workload-store'
+STORE_INDEX_KEY = 'store-index'
+
+
+def write_store(path: str, containers: List[Dict[str, Any]]):
+    """write the workloads of many containers as one workload store,
+    the usages of all the containers are concatenated in one usage
+    array and container i is usage[:, offsets[i]:offsets[i+1]]
+
+    Args:
+        path (str): folder of the store
+        containers (List[Dict[str, Any]]): one dict per container
+        with the container.json entries ('container_name', 'requests',
+        'limits', optionally 'namespace') plus its 'workload'
+        (2, timesteps) and 'time' (timesteps,) arrays
+    """
+    if not os.path.exists(path):
+        os.makedirs(path)
+    lengths = [len(container['time']) for container in containers]
+    offsets = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+    # an empty store (e.g. a namespace without pods) has int arrays
+    usage_dtype = np.result_type(
+        *[np.asarray(container['workload']) for container in containers]
+    ) if containers else np.int64
+    time_dtype = np.result_type(
+        *[np.asarray(container['time']) for container in containers]
+    ) if containers else np.int64
+    # fill the files through memmaps to not hold two copies of the
+    # workloads in memory
+    usage = np.lib.format.open_memmap(
+        os.path.join(path, USAGE_FILE), mode='w+',
+        dtype=usage_dtype, shape=(2, offsets[-1]))
+    time = np.lib.format.open_memmap(
+        os.path.join(path, TIME_FILE), mode='w+',
+        dtype=time_dtype, shape=(offsets[-1],))
+    for i, container in enumerate(containers):
+        usage[:, offsets[i]:offsets[i+1]] = container['workload']
+        time[offsets[i]:offsets[i+1]] = container['time']
+    usage.flush()
+    time.flush()
+    del usage, time
+    np.save(os.path.join(path, OFFSETS_FILE), offsets)
+    metadata = [
+        {key: value for key, value in container.items()
+         if key not in ['workload', 'time']}
+        for container in containers]
+    with open(os.path.join(path, CONTAINERS_FILE), 'w') as out_file:
+        json.dump(metadata, out_file, indent=4)
+
+
+def merge_stores(paths: List[str], path: str):
+    """write one workload store of the containers of many stores
+    (e.g. day partitions) with the workloads of the same container
+    (namespace and container_name) concatenated in the order of the
+    paths, requests and limits are the max over the stores
+
+    Args:
+        paths (List[str]): folders of the stores to merge
+        path (str): folder of the merged store
+    """
+    merged = {}
+    for store_path in paths:
+        store = WorkloadStore(store_path)
+        for i, container in enumerate(store.containers):
+            key = (container.get('namespace'), container['container_name'])
+            if key not in merged:
+                merged[key] = dict(container, workload=[], time=[])
+            entry = merged[key]
+            for resources in ['requests', 'limits']:
+                entry[resources] = {
+                    resource: max(value, container[resources][resource])
+                    for resource, value in entry[resources].items()}
+            entry['workload'].append(store.workload(i))
+            entry['time'].append(store.time(i))
+    containers = []
+    for container in merged.values():
+        # the views of a container in one store are written as they
+        # are, without reading them all in memory first
+        if len(container['time']) == 1:
+            container['workload'] = container['workload'][0]
+            container['time'] = container['time'][0]
+        else:
+            container['workload'] = np.concatenate(
+                container['workload'], axis=1)
+            container['time'] = np.concatenate(container['time'])
+        containers.append(container)
+    write_store(path, containers)
+
+
+def load_workloads(
+        config: Dict[str, Any]) -> Tuple[List[np.array], List[np.array]]:
+    """workload and time arrays of the containers of a config in the
+    build_config format, either its 'workload' and 'time' lists or,
+    for a lazy config with the STORE_PATH_KEY of a store and the
+    STORE_INDEX_KEY of each container in it, views of the memory
+    mapped store that are only read from disk when they are used
+
+    Args:
+        config (Dict[str, Any]): one list entry per container
+    """
+    if STORE_PATH_KEY not in config:
+        return list(config['workload']), list(config['time'])
+    path = config[STORE_PATH_KEY]
+    if isinstance(path, list):
+        path = path[0]
+    store = WorkloadStore(path)
+    indices = np.ravel(config[STORE_INDEX_KEY])
+    return ([store.workload(index) for index in indices],
+            [store.time(index) for index in indices])
+
+
+class WorkloadStore:
+    def __init__(self, path: str):
+        """read only view of a workload store written by write_store,
+        the usage and time files are memory mapped and the workloads
+        of the containers are views into them (nothing is copied
+        until it is read)
+
+        Args:
+            path (str): folder of the store
+        """
+        self.path = path
+        self.usage = np.load(os.path.join(path, USAGE_FILE), mmap_mode='r')
+        self.timestamps = np.load(
+            os.path.join(path, TIME_FILE), mmap_mode='r')
+        self.offsets = np.load(os.path.join(path, OFFSETS_FILE))
+        with open(os.path.join(path, CONTAINERS_FILE), 'r') as in_file:
+            self.containers = json.load(in_file)
+
+    def __len__(self) -> int:
+        return len(self.containers)
+
+    def find(self, namespace: str = None,
+             container_name: str = None) -> List[int]:
+        """indices of the containers in a namespace and/or with a name
+        """
+        return [i for i, container in enumerate(self.containers)
+                if (namespace is None or
+                    container.get('namespace') == namespace) and
+                (container_name is None or
+                 container['container_name'] == container_name)]
+
+    def workload(self, index: int) -> np.array:
+        """memory and cpu usage of a container (2, timesteps)"""
+        return self.usage[:, self.offsets[index]:self.offsets[index+1]]
+
+    def time(self, index: int) -> np.array:
+        """time array of a container (timesteps,)"""
+        return self.timestamps[self.offsets[index]:self.offsets[index+1]]
+
+    def container(self, index: int) -> Dict[str, Any]:
+        """the container.json entries of a container with its
+        'workload' and 'time' views, same as loading the
+        container.json, workload.pickle and time.pickle of the
+        container folder
+        """
+        container = dict(self.containers[index])
+        container.update({
+            'workload': self.workload(index),
+            'time': self.time(index)
+        })
+        return container